@@ -0,0 +1,125 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# asyncio <-> Tk bridge.
+#
+# The asyncio loop runs in a helper thread, so root.mainloop() keeps owning
+# the main thread and nobody spins on update(). Coroutines are handed to the
+# loop with run_coroutine_threadsafe; anything that must touch Tk is queued
+# back and run on the Tk thread. On POSIX the Tk thread is woken through a
+# socket pair registered with createfilehandler, so it only runs when there
+# is work; elsewhere the queue is polled with after().
+
+import asyncio
+import queue
+import socket
+import threading
+
+
+class AsyncBridge:
+    """asyncio event loop running alongside the Tk main loop."""
+
+    def __init__(self, root, poll=20):
+        self.root = root
+        self.poll = poll
+        self.loop = asyncio.new_event_loop()
+        self._calls = queue.SimpleQueue()  # (func, args) for the Tk thread
+        self._thread = None
+        self._wake_r = self._wake_w = None
+        self._poll_id = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run_loop, name='asyncio',
+                                        daemon=True)
+        self._thread.start()
+        if hasattr(self.root.tk, 'createfilehandler'):
+            import tkinter
+            self._wake_r, self._wake_w = socket.socketpair()
+            self._wake_r.setblocking(False)
+            self._wake_w.setblocking(False)
+            self.root.tk.createfilehandler(self._wake_r.fileno(), tkinter.READABLE,
+                                           self._on_wake)
+        else:
+            self._poll_id = self.root.after(self.poll, self._on_poll)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=2)
+        self._thread = None
+        if self._wake_r is not None:
+            self.root.tk.deletefilehandler(self._wake_r.fileno())
+            self._wake_r.close()
+            self._wake_w.close()
+            self._wake_r = self._wake_w = None
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def submit(self, coro, on_done=None, on_error=None):
+        """Schedule coro on the asyncio loop from any thread.
+
+        on_done(result) / on_error(exception) run on the Tk thread. Returns a
+        concurrent.futures.Future; cancelling it cancels the coroutine.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if on_done is not None or on_error is not None:
+            future.add_done_callback(lambda f: self._deliver(f, on_done, on_error))
+        return future
+
+    def call_in_tk(self, func, *args):
+        """Run func(*args) on the Tk thread; safe from any thread."""
+        self._calls.put((func, args))
+        if self._wake_w is not None:
+            try:
+                self._wake_w.send(b'\0')
+            except BlockingIOError:
+                pass  # the pipe is full, so a wake-up is already pending
+
+    # Internals
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            self.loop.run_until_complete(asyncio.sleep(0))
+            self.loop.close()
+
+    def _deliver(self, future, on_done, on_error):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            if on_done is not None:
+                self.call_in_tk(on_done, future.result())
+        elif on_error is not None:
+            self.call_in_tk(on_error, error)
+        else:
+            self.call_in_tk(self.root.report_callback_exception,
+                            type(error), error, error.__traceback__)
+
+    def _drain(self):
+        while True:
+            try:
+                func, args = self._calls.get_nowait()
+            except queue.Empty:
+                return
+            func(*args)
+
+    def _on_wake(self, fd, mask):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        self._drain()
+
+    def _on_poll(self):
+        self._drain()
+        self._poll_id = self.root.after(self.poll, self._on_poll)
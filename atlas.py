@@ -0,0 +1,103 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+"""Icon atlas - all icons packed into a single PNG.
+
+The index (icon name -> x, y, width, height) is stored inside the PNG as a
+text chunk, so loading the whole icon set costs one file read and one decode.
+
+Build (re-run whenever assets/ changes):
+    python atlas.py [assets_dir] [output.png]
+"""
+import io
+import json
+import math
+import os
+import sys
+
+ATLAS_NAME = 'icons.atlas.png'
+INDEX_KEY = 'atlas-index'
+PADDING = 1
+
+
+def pack(sizes, padding=PADDING):
+    """Shelf-pack {name: (w, h)} into a square-ish sheet.
+
+    Returns ((sheet_w, sheet_h), {name: (x, y, w, h)}).
+    """
+    area = sum((w + padding) * (h + padding) for w, h in sizes.values())
+    widest = max((w for w, h in sizes.values()), default=0)
+    width = max(widest + padding, math.ceil(math.sqrt(area)))
+
+    rects = {}
+    x = y = shelf_h = 0
+    # Tallest first keeps the shelves tight
+    for name, (w, h) in sorted(sizes.items(), key=lambda i: (-i[1][1], i[0])):
+        if x + w > width:
+            x = 0
+            y += shelf_h + padding
+            shelf_h = 0
+        rects[name] = (x, y, w, h)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+    return (width, y + shelf_h), rects
+
+
+def build(assets_dir, output=None):
+    """Pack every *.png in assets_dir into one atlas image. Returns its path."""
+    from PIL import Image
+    from PIL.PngImagePlugin import PngInfo
+
+    output = output or os.path.join(assets_dir, ATLAS_NAME)
+    images = {}
+    for file_name in sorted(os.listdir(assets_dir)):
+        stem, ext = os.path.splitext(file_name)
+        if ext.lower() != '.png' or file_name == os.path.basename(output):
+            continue
+        with Image.open(os.path.join(assets_dir, file_name)) as image:
+            images[stem] = image.convert('RGBA')
+
+    size, rects = pack({name: image.size for name, image in images.items()})
+    sheet = Image.new('RGBA', size, (0, 0, 0, 0))
+    for name, (x, y, w, h) in rects.items():
+        sheet.paste(images[name], (x, y))
+
+    info = PngInfo()
+    info.add_text(INDEX_KEY, json.dumps(rects, separators=(',', ':'),
+                                        sort_keys=True))
+    sheet.save(output, pnginfo=info, optimize=True)
+    return output
+
+
+class Atlas:
+    """Decoded atlas image with indexed sub-image extraction."""
+
+    def __init__(self, image, rects):
+        self.image = image
+        self.rects = rects
+
+    @classmethod
+    def load(cls, path):
+        """One read, one decode."""
+        from PIL import Image
+        with open(path, 'rb') as f:
+            data = f.read()
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        rects = {name: tuple(rect)
+                 for name, rect in json.loads(image.info[INDEX_KEY]).items()}
+        return cls(image, rects)
+
+    def __contains__(self, name):
+        return name in self.rects
+
+    def crop(self, name):
+        """Return the PIL sub-image for name (a file stem such as 'close')."""
+        x, y, w, h = self.rects[name]
+        return self.image.crop((x, y, x + w, y + h))
+
+
+if __name__ == '__main__':
+    assets = sys.argv[1] if len(sys.argv) > 1 else 'assets'
+    out = sys.argv[2] if len(sys.argv) > 2 else None
+    print(build(assets, out))
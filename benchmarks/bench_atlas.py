@@ -0,0 +1,101 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+"""Startup icon I/O: loose PNG files versus the packed atlas.
+
+Decodes the full icon set through IconRegistry both ways and reports file
+opens, bytes read and wall time. --open-latency adds a fixed delay to every
+file open to model a network-mounted home directory.
+
+    python benchmarks/bench_atlas.py [--repeat N] [--open-latency MS]
+"""
+import argparse
+import builtins
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atlas import ATLAS_NAME  # noqa: E402
+from icons import ASSETS_DIR, IconRegistry  # noqa: E402
+
+
+def icon_keys(assets_dir):
+    """(name, variant) of both variants of every master shipped in assets_dir."""
+    keys = []
+    for file_name in sorted(os.listdir(assets_dir)):
+        stem, ext = os.path.splitext(file_name)
+        if ext != '.png' or file_name == ATLAS_NAME:
+            continue
+        keys += [(stem, 'normal'), (stem, 'hover')]
+    return keys
+
+
+class OpenCounter:
+    """Counts (and optionally delays) every file opened for reading."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.opens = 0
+        self.bytes = 0
+        self._open = builtins.open
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        def counting_open(file, mode='r', *args, **kwargs):
+            if 'r' in mode and isinstance(file, str) and file.endswith('.png'):
+                size = os.path.getsize(file)
+                with self._lock:
+                    self.opens += 1
+                    self.bytes += size
+                if self.latency:
+                    time.sleep(self.latency)
+            return self._open(file, mode, *args, **kwargs)
+        builtins.open = counting_open
+        return self
+
+    def __exit__(self, *exc):
+        builtins.open = self._open
+
+
+def run(keys, use_atlas, latency):
+    registry = IconRegistry(use_atlas=use_atlas)
+    with OpenCounter(latency) as counter:
+        start = time.perf_counter()
+        registry.prefetch(keys)
+        for key in keys:
+            registry._derived_future(registry._key(*key)).result()
+        elapsed = time.perf_counter() - start
+    registry.close()
+    return elapsed, counter.opens, counter.bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--open-latency', type=float, default=0.0,
+                        help='milliseconds added to every file open')
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(ASSETS_DIR, ATLAS_NAME)):
+        sys.exit('atlas missing - run: python atlas.py')
+
+    keys = icon_keys(ASSETS_DIR)
+    latency = args.open_latency / 1000
+    print(f'{len(keys)} icons, {args.repeat} runs, '
+          f'{args.open_latency:g} ms per open')
+    for label, use_atlas in (('loose files', False), ('atlas', True)):
+        times = []
+        for _ in range(args.repeat):
+            elapsed, opens, read = run(keys, use_atlas, latency)
+            times.append(elapsed * 1000)
+        print(f'{label:12} opens={opens:3d} bytes={read:6d} '
+              f'median={statistics.median(times):7.2f} ms '
+              f'min={min(times):7.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
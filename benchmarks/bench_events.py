@@ -0,0 +1,208 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+"""Headless event storm benchmark for the interactive paths.
+
+Every run starts the app in a fresh interpreter under Xvfb, adds --buttons
+toolbar buttons (hover style and tooltip each) and injects events with
+event generate:
+
+    hover   <Enter>/<Leave> sweeping across the buttons (hover + tooltips)
+    drag    <B1-Motion> on the title bar (window dragging)
+    resize  <B1-Motion> on the bottom right grip (window resizing)
+
+For each scenario it records the dispatch time of single events (handlers
+run synchronously in event generate), the time of the update that follows
+each --burst of events (idle flushes and due timers, i.e. one frame), Tcl
+commands issued from Python per event, the deepest after/idle queue seen
+and the visual updates applied per event. Results can be compared against
+a stored baseline.
+
+    python benchmarks/bench_events.py --buttons 200 --events 4000
+    python benchmarks/bench_events.py --save-baseline events_baseline.json
+    python benchmarks/bench_events.py --baseline events_baseline.json
+
+Exits with status 1 when a metric regressed by more than --tolerance.
+"""
+import json
+import sys
+import time
+
+import runner
+
+BUTTON1 = 1 << 8  # Button1Mask in the event state
+
+
+class CallCounter:
+    """Stands in for a widget's tkapp and counts the Tcl commands run."""
+
+    def __init__(self, tk):
+        self._tk = tk
+        self.calls = 0
+
+    def call(self, *args):
+        self.calls += 1
+        return self._tk.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._tk, name)
+
+
+def walk(widget):
+    yield widget
+    for child in widget.winfo_children():
+        yield from walk(child)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Storm:
+    """Injects events into one running app and measures them."""
+
+    def __init__(self, app, burst, rate):
+        self.app = app
+        self.burst = burst
+        self.interval = 1 / rate if rate else 0
+        self.raw = app.root.tk  # generating and probing is not counted
+        self.counter = CallCounter(self.raw)
+        for widget in walk(app.root):
+            widget.tk = self.counter
+
+    def generate(self, widget, sequence, **options):
+        args = ['event', 'generate', str(widget), sequence]
+        for name, value in options.items():
+            args += [f'-{name}', value]
+        start = time.perf_counter()
+        self.raw.call(*args)
+        return time.perf_counter() - start
+
+    def depth(self):
+        return len(self.raw.splitlist(self.raw.call('after', 'info')))
+
+    def run(self, events):
+        """events yields (widget, sequence, options); returns the metrics."""
+        self.raw.call('update')
+        calls = self.counter.calls
+        dispatch, frames, depth, count = [], [], 0, 0
+        next_event = time.perf_counter()
+        for widget, sequence, options in events:
+            dispatch.append(self.generate(widget, sequence, **options))
+            depth = max(depth, self.depth())
+            count += 1
+            if count % self.burst == 0:
+                start = time.perf_counter()
+                self.raw.call('update')
+                frames.append(time.perf_counter() - start)
+            next_event += self.interval
+            wait = next_event - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+        self.raw.call('update')
+        return {'dispatch_p50': percentile(dispatch, 0.5),
+                'dispatch_p95': percentile(dispatch, 0.95),
+                'dispatch_p99': percentile(dispatch, 0.99),
+                'dispatch_max': max(dispatch),
+                'frame_p50': percentile(frames, 0.5) if frames else 0,
+                'frame_p95': percentile(frames, 0.95) if frames else 0,
+                'frame_max': max(frames) if frames else 0,
+                'tcl_calls': (self.counter.calls - calls) / count,
+                'idle_depth': depth}
+
+
+def hover_events(buttons, count):
+    previous = None
+    for index in range(count // 2):
+        button = buttons[index % len(buttons)]
+        if previous is not None:
+            yield previous, '<Leave>', {'x': 0, 'y': 0}
+        yield button, '<Enter>', {'x': 1, 'y': 1}
+        previous = button
+
+
+def motion_events(handle, count, dx, dy):
+    x, y = handle.winfo_rootx() + 2, handle.winfo_rooty() + 2
+    yield handle, '<ButtonPress-1>', {'x': 2, 'y': 2, 'rootx': x, 'rooty': y}
+    for step in range(1, count + 1):
+        # Back and forth, so the window stays on the screen
+        offset = step % 100 if (step // 100) % 2 == 0 else 100 - step % 100
+        yield handle, '<Motion>', {'x': 2, 'y': 2, 'rootx': x + offset * dx,
+                                   'rooty': y + offset * dy, 'state': BUTTON1}
+    yield handle, '<ButtonRelease-1>', {'x': 2, 'y': 2, 'rootx': x, 'rooty': y,
+                                        'state': BUTTON1}
+
+
+def child(buttons, events, burst, rate):
+    """One measured storm; prints a flat JSON dict of metrics."""
+    import drag
+    import main
+
+    app = main.create_app()
+    window = app.window
+    specs = [{'name': f'bench_button_{index}', 'style': 'working_menu',
+              'text': f'Tool {index}', 'tooltip': f'Tool {index}'}
+             for index in range(buttons)]
+    widgets = window.add_widgets('working_top_menu', specs)
+    toolbar = [widgets[spec['name']] for spec in specs]
+    app.root.update()
+
+    storm = Storm(app, burst, rate)
+    result = {'buttons': buttons}
+
+    window.hover.reset_stats()
+    metrics = storm.run(hover_events(toolbar, events))
+    metrics['applied'] = window.hover.stats['configured'] / events
+    result.update({f'hover.{name}': value for name, value in metrics.items()})
+
+    engine = drag.shared(app.root)
+    engine.reset_stats()
+    metrics = storm.run(motion_events(window.widgets['title_label'], events, 1, 1))
+    metrics['applied'] = engine.stats['geometry'] / events
+    result.update({f'drag.{name}': value for name, value in metrics.items()})
+
+    window.resizer.reset_stats()
+    metrics = storm.run(motion_events(window.resizer.grips['se'], events, 1, 1))
+    metrics['applied'] = window.resizer.stats['geometry'] / events
+    result.update({f'resize.{name}': value for name, value in metrics.items()})
+
+    window.tasks.shutdown()
+    app.root.destroy()
+    print(json.dumps(result))
+
+
+def format_value(name, value):
+    if value is None:
+        return '-'
+    metric = name.rsplit('.', 1)[-1]
+    if metric.startswith(('dispatch_', 'frame_')):
+        return f'{value * 1e6:.0f} us'
+    return f'{value:.3g}'
+
+
+def main():
+    parser = runner.parser(__doc__.splitlines()[0], runs=5)
+    parser.add_argument('--buttons', type=int, default=100,
+                        help='toolbar buttons added for the hover storm')
+    parser.add_argument('--events', type=int, default=2000,
+                        help='events injected per scenario')
+    parser.add_argument('--burst', type=int, default=8,
+                        help='events delivered between two updates (one frame)')
+    parser.add_argument('--rate', type=float, default=1000,
+                        help='events per second, 0 for as fast as possible')
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, runner.ROOT)
+        child(args.buttons, args.events, args.burst, args.rate)
+        return
+    runner.run(args, __file__, format_value,
+               child_args=['--buttons', str(args.buttons), '--events', str(args.events),
+                           '--burst', str(args.burst), '--rate', str(args.rate)],
+               settings={'events': args.events, 'burst': args.burst, 'rate': args.rate},
+               fixed=('buttons',))
+
+
+if __name__ == '__main__':
+    main()
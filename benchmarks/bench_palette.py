@@ -0,0 +1,67 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+"""Command palette lookup time against the number of commands.
+
+Synthetic titles ('Category: Verb Noun Noun n') are indexed with
+commands.CommandIndex, then every prefix of a few typed queries is looked
+up as one keystroke would be. Prints indexing time and the median and worst
+lookup per keystroke; a frame at 60 Hz is 16.7 ms.
+
+    python benchmarks/bench_palette.py [--counts 1000 5000 20000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from commands import CommandIndex  # noqa: E402
+
+CATEGORIES = ('File', 'Edit', 'View', 'Library', 'Plot', 'Window', 'Debug', 'Help')
+VERBS = ('Open', 'Close', 'Toggle', 'Show', 'Hide', 'Export', 'Import', 'Run',
+         'Sort', 'Filter', 'Select', 'Copy', 'Find', 'Replace', 'Zoom', 'Reset')
+NOUNS = ('File', 'Library', 'Profile', 'Material', 'Plot', 'Result', 'Analysis',
+         'Console', 'Theme', 'Font', 'Window', 'Panel', 'Search', 'Table',
+         'Column', 'Series', 'Grid', 'Icon', 'Layout', 'Task', 'Server', 'Cache')
+QUERIES = ('open file', 'sort column', 'view: zoom', 'ofl', 'tgl thme', 'console')
+
+
+def titles(count, seed=1):
+    rng = random.Random(seed)
+    return [f'{rng.choice(CATEGORIES)}: {rng.choice(VERBS)} {rng.choice(NOUNS)} '
+            f'{rng.choice(NOUNS)} {n}' for n in range(count)]
+
+
+def bench(counts, repeat):
+    print(f'{"commands":>9} {"index ms":>9} {"median ms":>10} {"worst ms":>9}')
+    for count in counts:
+        index = CommandIndex()
+        start = time.perf_counter()
+        for title in titles(count):
+            index.add(title)
+        indexing = (time.perf_counter() - start) * 1000
+        times = []
+        for _ in range(repeat):
+            for query in QUERIES:
+                for end in range(1, len(query) + 1):
+                    start = time.perf_counter()
+                    index.matches(query[:end])
+                    times.append(time.perf_counter() - start)
+        print(f'{count:>9} {indexing:>9.1f} {statistics.median(times) * 1000:>10.3f} '
+              f'{max(times) * 1000:>9.3f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    bench(args.counts, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
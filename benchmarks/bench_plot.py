@@ -0,0 +1,96 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+"""Plot redraw time against series length.
+
+For every length the series is reduced to the plot width (min / max per
+pixel column) for the full view and for a 10% zoom window, with NumPy and,
+for the shorter series, with the plain Python fallback. --redraw also times
+Plot.redraw() on a real canvas, under Xvfb unless --no-xvfb is given.
+
+    python benchmarks/bench_plot.py [--lengths 1e4 1e5 1e6 1e7] [--redraw]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import plot  # noqa: E402
+
+WIDTH = 1200
+
+
+def timed(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def bench_decimation(lengths, repeat):
+    print(f'{"points":>10} {"full ms":>9} {"zoom ms":>9} {"python ms":>10} {"out":>6}')
+    for length in lengths:
+        y = plot.sample_series(length)
+        x = plot.numpy.arange(length)
+        full = timed(lambda: plot.minmax(x, y, 0, length - 1, WIDTH), repeat)
+        zoom = timed(lambda: plot.minmax(x, y, length * 0.45, length * 0.55, WIDTH), repeat)
+        out = len(plot.minmax(x, y, 0, length - 1, WIDTH)[0])
+        python = '-'
+        if length <= 10 ** 6:
+            xl, yl = range(length), y.tolist()
+            python = f'{timed(lambda: plot.minmax(xl, yl, 0, length - 1, WIDTH), 1):.1f}'
+        print(f'{length:>10} {full:>9.2f} {zoom:>9.2f} {python:>10} {out:>6}')
+
+
+def bench_redraw(lengths, repeat):
+    import tkinter as tk
+    root = tk.Tk()
+    root.geometry(f'{WIDTH + 80}x600')
+    view = plot.Plot(root)
+    view.pack(fill='both', expand=True)
+    root.update()
+    print(f'{"points":>10} {"redraw ms":>10} {"zoom ms":>9} {"items":>6}')
+    for length in lengths:
+        view.clear()
+        view.plot(plot.sample_series(length))
+        root.update()
+        full = timed(lambda: (view.redraw(), root.update_idletasks()), repeat)
+        view.set_view(length * 0.45, length * 0.55)
+        zoom = timed(lambda: (view.redraw(), root.update_idletasks()), repeat)
+        items = len(view.canvas.find_all())
+        print(f'{length:>10} {full:>10.2f} {zoom:>9.2f} {items:>6}')
+    root.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lengths', type=float, nargs='+',
+                        default=[1e4, 1e5, 1e6, 1e7])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--redraw', action='store_true',
+                        help='also time Plot.redraw() on a canvas')
+    parser.add_argument('--no-xvfb', action='store_true',
+                        help='use the current DISPLAY instead of Xvfb')
+    args = parser.parse_args()
+    if plot.numpy is None:
+        sys.exit('NumPy is required for this benchmark')
+    lengths = [int(length) for length in args.lengths]
+
+    bench_decimation(lengths, args.repeat)
+    if args.redraw:
+        from xvfb import virtual_display
+        try:
+            with virtual_display(use_xvfb=not args.no_xvfb):
+                print()
+                bench_redraw(lengths, args.repeat)
+        except RuntimeError as error:
+            sys.exit(str(error))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+"""Headless startup benchmark.
+
+Every run starts the app in a fresh interpreter under Xvfb and records:
+import time, Tk init, per section build time, time to the first <Map> and
+to the first idle after it, peak RSS and PhotoImage memory. Results are
+written as JSON and can be compared against a stored baseline.
+
+    python benchmarks/bench_startup.py --runs 10 --output startup.json
+    python benchmarks/bench_startup.py --save-baseline benchmarks/startup_baseline.json
+    python benchmarks/bench_startup.py --baseline benchmarks/startup_baseline.json
+
+Exits with status 1 when a metric regressed by more than --tolerance.
+"""
+import json
+import sys
+import time
+
+import runner
+
+TIMEOUT_MS = 10000
+
+# Metrics measured in seconds (reported in ms); builder sections are added as build.<section>
+TIME_METRICS = ('import', 'toolkit_import', 'tk_init', 'build', 'first_map',
+                'first_idle')
+
+
+def child():
+    """One measured startup; prints a flat JSON dict of metrics."""
+    import resource
+
+    start = time.perf_counter()
+    import main
+    result = {'import': time.perf_counter() - start}
+
+    start = time.perf_counter()
+    app = main.create_app()
+    result.update(app.timings)
+    for section, seconds in app.window.builder.timings.items():
+        result[f'build.{section}'] = seconds
+
+    marks = {}
+
+    def on_idle():
+        marks['first_idle'] = time.perf_counter()
+        app.root.quit()
+
+    def on_map(event):
+        if 'first_map' not in marks:
+            marks['first_map'] = time.perf_counter()
+            app.root.after_idle(on_idle)
+
+    app.root.bind('<Map>', on_map, add='+')
+    app.root.after(TIMEOUT_MS, app.root.quit)
+    app.run()
+    if 'first_idle' not in marks:
+        sys.exit('window was never mapped')
+    for name, mark in marks.items():
+        result[name] = mark - start
+
+    icon_stats = app.icons.stats()
+    result['photos'] = icon_stats['photos']
+    result['photo_bytes'] = icon_stats['bytes']
+    result['peak_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    app.root.destroy()
+    print(json.dumps(result))
+
+
+def format_value(name, value):
+    if value is None:
+        return '-'
+    if name in TIME_METRICS or name.startswith('build.'):
+        return f'{value * 1000:.2f} ms'
+    if name.endswith('bytes') or name.endswith('rss'):
+        return f'{value / 1024:.0f} KiB'
+    return f'{value:g}'
+
+
+def main():
+    parser = runner.parser(__doc__.splitlines()[0])
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, runner.ROOT)
+        child()
+        return
+    runner.run(args, __file__, format_value)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+"""Shared driver of the app benchmarks (bench_startup.py, bench_events.py).
+
+A benchmark script prints one flat JSON dict of metrics from its --child
+mode. run() starts --runs children in fresh interpreters under Xvfb, takes
+the median, min and max of every metric, prints them next to a baseline
+and writes the results; it exits with status 1 when a metric regressed by
+more than --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+from xvfb import virtual_display
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parser(description, runs=10):
+    """ArgumentParser with the options every benchmark shares."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--runs', type=int, default=runs)
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--baseline', help='compare against this results JSON')
+    parser.add_argument('--save-baseline', help='write results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative slowdown before failing (0.25 = 25%%)')
+    parser.add_argument('--no-xvfb', action='store_true',
+                        help='use the current DISPLAY instead of Xvfb')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    return parser
+
+
+def measure(script, runs, child_args=(), settings=None):
+    """Run script --child runs times; results with per metric statistics."""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, os.path.abspath(script), '--child',
+                                 *child_args],
+                                cwd=ROOT, check=True, capture_output=True, text=True)
+        samples.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    metrics = {}
+    for name in samples[0]:
+        values = [sample[name] for sample in samples]
+        metrics[name] = {'median': statistics.median(values),
+                         'min': min(values),
+                         'max': max(values)}
+    return {'runs': runs,
+            **(settings or {}),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'metrics': metrics}
+
+
+def compare(results, baseline, tolerance, format_value, fixed=()):
+    """Print results next to baseline; return names of regressed metrics.
+
+    Metrics in fixed are settings echoed by the child, never regressions.
+    """
+    regressions = []
+    print(f'{"metric":24} {"median":>12} {"baseline":>12} {"change":>8}')
+    for name, values in results['metrics'].items():
+        current = values['median']
+        base = baseline['metrics'].get(name, {}).get('median') if baseline else None
+        change = ''
+        if base:
+            ratio = current / base
+            change = f'{(ratio - 1) * 100:+.1f}%'
+            if ratio > 1 + tolerance and name not in fixed:
+                regressions.append(name)
+                change += ' !'
+        print(f'{name:24} {format_value(name, current):>12} '
+              f'{format_value(name, base):>12} {change:>8}')
+    return regressions
+
+
+def run(args, script, format_value, child_args=(), settings=None, fixed=()):
+    """Measure, compare and write results as the parsed args ask."""
+    try:
+        with virtual_display(use_xvfb=not args.no_xvfb):
+            results = measure(script, args.runs, child_args, settings)
+    except RuntimeError as error:
+        sys.exit(str(error))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, format_value, fixed)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+    if regressions:
+        print('regressed:', ', '.join(regressions))
+        sys.exit(1)
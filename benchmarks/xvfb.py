@@ -0,0 +1,50 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+"""Virtual X server for headless benchmark runs."""
+import os
+import shutil
+import subprocess
+from contextlib import contextmanager
+
+
+@contextmanager
+def virtual_display(screen='1920x1080x24', use_xvfb=True):
+    """Run the block with DISPLAY pointing at a fresh Xvfb server.
+
+    With use_xvfb False the current DISPLAY is used as is.
+    """
+    if not use_xvfb:
+        if not os.environ.get('DISPLAY'):
+            raise RuntimeError('DISPLAY is not set and Xvfb is disabled')
+        yield os.environ['DISPLAY']
+        return
+    if shutil.which('Xvfb') is None:
+        raise RuntimeError('Xvfb not found - install it (e.g. apt install xvfb) '
+                           'or run with --no-xvfb on a desktop session')
+
+    # Xvfb picks a free display and reports its number on the given fd
+    read_fd, write_fd = os.pipe()
+    proc = subprocess.Popen(['Xvfb', '-displayfd', str(write_fd),
+                             '-screen', '0', screen, '-nolisten', 'tcp'],
+                            pass_fds=(write_fd,),
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()
+    if not number:
+        proc.kill()
+        raise RuntimeError('Xvfb failed to start')
+
+    previous = os.environ.get('DISPLAY')
+    os.environ['DISPLAY'] = f':{number}'
+    try:
+        yield os.environ['DISPLAY']
+    finally:
+        if previous is None:
+            del os.environ['DISPLAY']
+        else:
+            os.environ['DISPLAY'] = previous
+        proc.terminate()
+        proc.wait(timeout=5)
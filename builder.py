@@ -0,0 +1,233 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+"""Declarative UI builder.
+
+A spec describes frames and, per parent frame, the widgets inside it:
+
+    spec = {
+        'styles': {style name: {'type': 'Button', 'pack': {...}, option: value}},
+        'hover': {hover style name: [bg, hover_bg]},
+        'frames': [{'name': ..., 'parent': ..., 'pack': {...}, option: value}],
+        'widgets': {parent frame name: [widget spec, ...]}
+    }
+
+Widget spec keys: style, type, name, text, command, icon (normal/hoover icon
+pair), image (single icon), tooltip, hover, drag, menu, pack and any other
+Tk option. Colour options name a palette key and font options a fonts key;
+anything else is passed to Tk as is. text is formatted with the builder
+variables, e.g. '{version}'.
+
+Specs are plain data, so they can also live in JSON or TOML files (load_spec).
+"""
+import os
+import time
+
+COLOR_OPTIONS = {'bg', 'fg', 'activebackground', 'activeforeground',
+                 'highlightbackground', 'highlightcolor', 'selectcolor',
+                 'insertbackground'}
+FONT_OPTIONS = {'font'}
+# Keys handled by the builder itself rather than passed to Tk
+SPEC_KEYS = {'style', 'type', 'name', 'parent', 'text', 'command', 'icon',
+             'image', 'tooltip', 'hover', 'drag', 'menu', 'items', 'pack'}
+
+
+def load_spec(path):
+    """Read a spec from a .json or .toml file."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.json':
+        import json
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    if ext == '.toml':
+        import tomllib
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    raise ValueError(f'unsupported spec format: {path}')
+
+
+def icon_keys(spec):
+    """(name, variant) of every icon the spec uses, for IconRegistry.prefetch."""
+    keys = []
+    for widget_specs in spec.get('widgets', {}).values():
+        for widget_spec in widget_specs:
+            if 'icon' in widget_spec:
+                keys.append((widget_spec['icon'], 'normal'))
+                keys.append((widget_spec['icon'], 'hover'))
+            elif 'image' in widget_spec:
+                keys.append((widget_spec['image'], None))
+    return keys
+
+
+class Builder:
+    """Materialises a spec in one pass.
+
+    Styles are resolved once per style class. Every pack call is deferred and
+    the outermost frames are packed last, so Tk lays the tree out once.
+    timings holds the seconds spent on frames, each section and packing
+    during the last build.
+    """
+
+    def __init__(self, root, colors, fonts, icons=None, hover=None,
+                 tooltips=None, commands=None, variables=None, drag=None,
+                 theme=None):
+        self.root = root
+        self.colors = colors
+        self.fonts = fonts
+        self.icons = icons
+        self.hover = hover
+        self.tooltips = tooltips
+        self.commands = commands or {}
+        self.variables = variables or {}
+        self.drag = drag
+        self.theme = theme
+        self.widgets = {}
+        self.timings = {}
+        self._styles = {}
+        self._resolved = {}
+        self._packing = []
+
+    def build(self, spec, sections=None):
+        """Build spec and return {name: widget} of all named widgets.
+
+        sections limits the widget sections built (all by default); frames
+        are always built.
+        """
+        import tkinter as tk
+
+        self._styles = spec.get('styles', {})
+        self._resolved = {}
+        self._packing = []
+        self.timings = {}
+        start = time.perf_counter()
+        if self.hover is not None:
+            for name, (bg, hover_bg) in spec.get('hover', {}).items():
+                if self.theme is not None:
+                    self.theme.bind_hover(name, bg, hover_bg)
+                self.hover.define(name,
+                                  self.colors.get(bg, bg) if bg else None,
+                                  self.colors.get(hover_bg, hover_bg) if hover_bg else None)
+
+        outer = []
+        for frame_spec in spec.get('frames', []):
+            parent_name = frame_spec.get('parent')
+            parent = self.widgets[parent_name] if parent_name else self.root
+            frame = self._create(tk, parent, frame_spec, 'Frame')
+            pack = frame_spec.get('pack')
+            if pack is not None:
+                (self._packing if parent_name else outer).append((frame, pack))
+        self.timings['frames'] = time.perf_counter() - start
+
+        for section, widget_specs in spec.get('widgets', {}).items():
+            if sections is not None and section not in sections:
+                continue
+            start = time.perf_counter()
+            self.build_section(section, widget_specs)
+            self.timings[section] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.flush()
+        for frame, pack in outer:
+            frame.pack(**pack)
+        self.timings['pack'] = time.perf_counter() - start
+        return self.widgets
+
+    def build_section(self, parent_name, widget_specs):
+        """Create the widgets of one parent frame. Packing waits for flush()."""
+        import tkinter as tk
+        parent = self.widgets[parent_name]
+        for widget_spec in widget_specs:
+            style = self._style(widget_spec.get('style'))
+            widget = self._create(tk, parent, widget_spec, style['type'])
+            pack = dict(style['pack'], **widget_spec.get('pack', {}))
+            self._packing.append((widget, pack))
+
+    def flush(self):
+        """Pack everything created so far, in spec order."""
+        for widget, pack in self._packing:
+            widget.pack(**pack)
+        self._packing = []
+
+    # Internals
+
+    def _resolve(self, options):
+        resolved = {}
+        for key, value in options.items():
+            if key in SPEC_KEYS:
+                continue
+            if key in COLOR_OPTIONS:
+                value = self.colors.get(value, value)
+            elif key in FONT_OPTIONS:
+                value = self.fonts.get(value, value)
+            resolved[key] = value
+        return resolved
+
+    def _roles(self, options):
+        """{option: palette key} of the colour options naming a palette key."""
+        return {key: value for key, value in options.items()
+                if key in COLOR_OPTIONS and value in self.colors}
+
+    def _style(self, name):
+        """Resolved style class, computed once per build."""
+        style = self._resolved.get(name)
+        if style is None:
+            raw = self._styles.get(name, {}) if name else {}
+            style = {'type': raw.get('type', 'Button'),
+                     'pack': raw.get('pack', {}),
+                     'hover': raw.get('hover'),
+                     'options': self._resolve(raw),
+                     'roles': self._roles(raw)}
+            self._resolved[name] = style
+        return style
+
+    def _create(self, tk, parent, spec, default_type):
+        style = self._style(spec.get('style'))
+        options = dict(style['options'], **self._resolve(spec))
+        if 'text' in spec:
+            options['text'] = spec['text'].format_map(self.variables)
+        if 'command' in spec:
+            options['command'] = self.commands[spec['command']]
+        image = hover_image = None
+        if 'icon' in spec:
+            image = self.icons.image(spec['icon'])
+            hover_image = self.icons.image(spec['icon'], 'hover')
+            options['image'] = image
+        elif 'image' in spec:
+            options['image'] = self.icons.image(spec['image'], None)
+
+        widget_type = spec.get('type', default_type)
+        widget = getattr(tk, widget_type)(parent, **options)
+        if 'icon' in spec or 'image' in spec:
+            self.icons.claim(widget, options['image'], hover_image)
+        if self.theme is not None:
+            self.theme.bind(widget, dict(style['roles'], **self._roles(spec)))
+
+        if 'menu' in spec:
+            self._menu(tk, widget, spec['menu'])
+        hover_style = spec.get('hover', style['hover'])
+        if hover_style and self.hover is not None:
+            self.hover.attach(widget, hover_style, image, hover_image)
+        if 'tooltip' in spec and self.tooltips is not None:
+            self.tooltips.register(widget, spec['tooltip'].format_map(self.variables))
+        if spec.get('drag') and self.drag is not None:
+            self.drag(self.root, widget)
+        if 'name' in spec:
+            self.widgets[spec['name']] = widget
+        return widget
+
+    def _menu(self, tk, menubutton, menu_spec):
+        style = self._style(menu_spec.get('style'))
+        menu = tk.Menu(menubutton, **dict(style['options'], **self._resolve(menu_spec)))
+        if self.theme is not None:
+            self.theme.bind(menu, dict(style['roles'], **self._roles(menu_spec)))
+        for item in menu_spec.get('items', []):
+            if item == '-':
+                menu.add_separator()
+                continue
+            menu.add_command(label=item['label'],
+                             compound=item.get('compound', tk.LEFT),
+                             command=self.commands[item['command']],
+                             accelerator=item.get('accelerator'),
+                             underline=item.get('underline', 0))
+        menubutton.menu = menu
+        menubutton['menu'] = menu
@@ -0,0 +1,443 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Command registry, key chords and the command palette.
+#
+# Every action is registered once by name, with the title shown in the
+# palette and optional key chords: 'Ctrl+O', or sequences such as
+# 'Ctrl+K Ctrl+D'. A single <KeyPress> binding on a bindtag put first on
+# every widget that takes the focus walks a trie of chords, so any number
+# of shortcuts costs one Tcl binding and one dict lookup per key, and a
+# chord is handled before Entry / Text class bindings (Ctrl+K, Ctrl+D and
+# Ctrl+H edit text there) can act on it. The palette ranks titles through a SearchIndex
+# (search.py) that grows as commands are added, plus a table of title
+# initials, so a keystroke looks up posting lists instead of scanning every
+# title.
+
+import bisect
+import heapq
+import re
+
+from search import SearchIndex
+from table import ListSource
+
+SHIFT = 0x1
+CONTROL = 0x4
+ALT = 0x8  # Mod1 on X11 and macOS; Windows Tk reports Alt as 0x20000
+
+# Spelling in chord specs -> Tk keysym
+KEY_NAMES = {'esc': 'Escape', 'enter': 'Return', 'del': 'Delete', 'ins': 'Insert',
+             'space': 'space', 'tab': 'Tab', 'plus': 'plus', 'minus': 'minus',
+             'pgup': 'Prior', 'pgdn': 'Next', 'backspace': 'BackSpace'}
+MODIFIER_KEYS = {'Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Alt_L', 'Alt_R',
+                 'Meta_L', 'Meta_R', 'Super_L', 'Super_R', 'Caps_Lock', 'Num_Lock',
+                 'ISO_Level3_Shift'}
+# Where bare keys (no Ctrl / Alt) are typing, not commands
+TEXT_CLASSES = {'Entry', 'TEntry', 'Text', 'Spinbox', 'TSpinbox', 'TCombobox'}
+
+# Bindtag of the chord dispatcher, first in the bindtags of focused widgets
+KEYS_TAG = 'CommandKeys'
+
+_words = re.compile(r'\w+')
+
+
+def parse_chord(spec):
+    """'Ctrl+Shift+P' -> (modifier mask, keysym)."""
+    spec = spec.strip()
+    if spec.endswith('+'):
+        modifiers, key = spec[:-1].split('+')[:-1], 'plus'
+    else:
+        *modifiers, key = spec.split('+')
+    mask = 0
+    for modifier in modifiers:
+        modifier = modifier.strip().lower()
+        if modifier in ('ctrl', 'control'):
+            mask |= CONTROL
+        elif modifier == 'alt':
+            mask |= ALT
+        elif modifier == 'shift':
+            mask |= SHIFT
+        else:
+            raise ValueError(f'unknown modifier {modifier!r} in {spec!r}')
+    key = key.strip()
+    key = KEY_NAMES.get(key.lower(), key.lower() if len(key) == 1 else key)
+    return mask, key
+
+
+def parse_keys(spec):
+    """'Ctrl+K Ctrl+D' -> tuple of chords."""
+    return tuple(parse_chord(chord) for chord in spec.split())
+
+
+class Command:
+    """A named action with its palette title and key sequences."""
+
+    def __init__(self, name, title, func, keys=()):
+        self.name = name
+        self.title = title
+        self.func = func
+        self.keys = keys  # chord specs, e.g. ('Ctrl+O',)
+
+    @property
+    def accelerator(self):
+        return ', '.join(self.keys)
+
+
+class CommandIndex:
+    """Ranked fuzzy lookup of command titles, kept up to date incrementally.
+
+    Ranking: title starts with the query, initials start with it ('vdt' for
+    View: Dark theme, 'dt' without the category), a word starts with it, it
+    occurs inside a word, then titles where every query word occurs or is
+    one typo (a missing, extra, wrong or swapped letter) away from the start
+    of a title word ('thme', 'opn fil'); shorter titles first within a rank.
+    Once limit rows rank as a word start or better the rest is not looked
+    at, so a one letter query costs about limit rows, not thousands.
+    """
+
+    def __init__(self):
+        self.source = ListSource(('Title',), [])
+        self.index = SearchIndex(self.source)
+        self.titles = []    # row -> lower case title
+        self.initials = {}  # prefix of title initials -> rows
+        self.ordered = []   # (title, row) sorted, for title prefixes
+        self.words = {}     # title word -> rows
+        self.variants = {}  # word prefix, also with one letter deleted -> words
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, title):
+        """Index title; returns its row."""
+        row = len(self.titles)
+        title = title.lower()
+        self.source.rows.append((title,))
+        self.titles.append(title)
+        bisect.insort(self.ordered, (title, row))
+        self.index.add_rows(row + 1)
+        # With and without the 'Category:' part of the title
+        for text in {title, title.rpartition(':')[2]}:
+            initials = ''.join(word[0] for word in text.replace(':', ' ').split())
+            for end in range(2, len(initials) + 1):
+                rows = self.initials.setdefault(initials[:end], [])
+                if not rows or rows[-1] != row:
+                    rows.append(row)
+        for word in set(_words.findall(title)):
+            rows = self.words.get(word)
+            if rows is None:
+                rows = self.words[word] = []
+                self._add_variants(word)
+            rows.append(row)
+        return row
+
+    def matches(self, query, limit=12):
+        """Best rows for query, best first."""
+        query = query.strip().lower()
+        if not query:
+            return list(range(min(limit, len(self.titles))))
+        titles = self.titles
+        ranks = {}
+        start = bisect.bisect_left(self.ordered, (query,))
+        for title, row in self.ordered[start:start + limit]:
+            if not title.startswith(query):
+                break
+            ranks[row] = (0, 0, len(title))
+        for row in self.initials.get(query.replace(' ', ''), ()):
+            ranks.setdefault(row, (1, 0, len(titles[row])))
+        good = len(ranks)
+        for batch in self.index.search(query, fuzzy_min=0):
+            for row in batch:
+                if row in ranks:
+                    continue
+                title = titles[row]
+                position = title.find(query)
+                if position > 0 and not title[position - 1].isalnum():
+                    rank = 2
+                    good += 1
+                elif position > 0:
+                    rank = 3
+                else:
+                    rank = 4  # the words occur apart
+                ranks[row] = (rank, max(0, position), len(title))
+            if good >= limit:
+                break
+        if len(ranks) < limit:
+            for row in self._typo_rows(query):
+                ranks.setdefault(row, (5, 0, len(titles[row])))
+        return heapq.nsmallest(limit, ranks, key=ranks.__getitem__)
+
+    # Internals
+
+    def _add_variants(self, word):
+        if len(word) < 3 or not word.isalpha():
+            return
+        for end in range(3, len(word) + 1):
+            prefix = word[:end]
+            for variant in {prefix, *_deletions(prefix)}:
+                self.variants.setdefault(variant, set()).add(word)
+
+    def _near(self, word):
+        """Title words that start with word give or take one typo."""
+        if len(word) < 3:
+            return set()
+        near = set()
+        for variant in {word, *_deletions(word)}:
+            near.update(self.variants.get(variant, ()))
+        # Variants sharing a deletion can be two edits apart
+        return {candidate for candidate in near
+                if any(_one_typo(word, candidate[:end])
+                       for end in (len(word) - 1, len(word), len(word) + 1))}
+
+    def _typo_rows(self, query):
+        rows = None
+        for word in _words.findall(query):
+            found = set()
+            for batch in self.index.search(word, fuzzy_min=0):
+                found.update(batch)
+            for near in self._near(word):
+                found.update(self.words[near])
+            rows = found if rows is None else rows & found
+            if not rows:
+                return []
+        return sorted(rows or ())
+
+
+def _deletions(word):
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _one_typo(a, b):
+    """Whether a and b are equal or one missing, extra, wrong or swapped letter apart."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    start = 0
+    while start < min(len(a), len(b)) and a[start] == b[start]:
+        start += 1
+    if len(a) == len(b):
+        if a[start + 1:] == b[start + 1:]:
+            return True  # wrong letter
+        return (a[start + 2:] == b[start + 2:] and start + 1 < len(a)
+                and a[start] == b[start + 1] and a[start + 1] == b[start])
+    if len(a) > len(b):
+        return a[start + 1:] == b[start:]
+    return a[start:] == b[start + 1:]
+
+
+class CommandRegistry:
+    """Commands of one app, their key chords and the palette index."""
+
+    def __init__(self, root, timeout=1500):
+        self.root = root
+        self.timeout = timeout  # ms to wait for the next chord of a sequence
+        self.commands = {}      # name -> Command
+        self.names = []         # palette index row -> name
+        self.index = CommandIndex()
+        self.trie = [{}, None]  # node: [chord -> node, command name]
+        self.pending = ()       # chords of an unfinished sequence
+        self._node = None
+        self._after_id = None
+        self._alt = 0x20000 if root._windowingsystem == 'win32' else ALT
+        root.bind_class(KEYS_TAG, '<KeyPress>', self._on_key)
+        root.bind_all('<FocusIn>', self._on_focus, add='+')
+        self._tag(root)
+
+    def add(self, name, title, func, keys=()):
+        """Register func as command name. keys is a spec or a tuple of specs."""
+        if name in self.commands:
+            raise ValueError(f'command {name!r} is already registered')
+        keys = (keys,) if isinstance(keys, str) else tuple(keys)
+        for spec in keys:
+            node = self.trie
+            for chord in parse_keys(spec):
+                node = node[0].setdefault(chord, [{}, None])
+            if node[1] is not None:
+                raise ValueError(f'{spec} is already bound to {node[1]!r}')
+            node[1] = name
+        command = self.commands[name] = Command(name, title, func, keys)
+        self.names.append(name)
+        self.index.add(title)
+        return command
+
+    def run(self, name):
+        return self.commands[name].func()
+
+    def callables(self):
+        """{name: func} for Builder commands."""
+        return {name: command.func for name, command in self.commands.items()}
+
+    def matches(self, query, limit=12):
+        """Commands for a palette query, best first."""
+        return [self.commands[self.names[row]]
+                for row in self.index.matches(query, limit)]
+
+    # Internals
+
+    def _chord(self, event):
+        if event.keysym in MODIFIER_KEYS:
+            return None
+        mask = SHIFT if event.state & SHIFT else 0
+        if event.state & CONTROL:
+            mask |= CONTROL
+        if event.state & self._alt:
+            mask |= ALT
+        key = event.keysym
+        return mask, key.lower() if len(key) == 1 else key
+
+    def _on_focus(self, event):
+        if not isinstance(event.widget, str):
+            self._tag(event.widget)
+
+    @staticmethod
+    def _tag(widget):
+        # Keys go to the focus widget, so tagging it on focus is enough
+        tags = widget.bindtags()
+        if tags[0] != KEYS_TAG:
+            widget.bindtags((KEYS_TAG,) + tuple(tag for tag in tags if tag != KEYS_TAG))
+
+    def _on_key(self, event):
+        chord = self._chord(event)
+        if chord is None:
+            return None
+        node = self._node
+        child = node[0].get(chord) if node is not None else None
+        if child is None:
+            self._reset()
+            child = self.trie[0].get(chord)
+            if child is None:
+                return None
+            if not chord[0] & (CONTROL | ALT) and self._typing(event.widget):
+                return None
+        if child[0]:
+            # Wait for the next chord; a command on this prefix runs on timeout
+            pending = (self.pending if self._node is not None else ()) + (chord,)
+            self._reset()
+            self._node = child
+            self.pending = pending
+            self._after_id = self.root.after(self.timeout, self._on_timeout)
+            return 'break'
+        self._reset()
+        self.run(child[1])
+        return 'break'
+
+    def _on_timeout(self):
+        self._after_id = None
+        node = self._node
+        self._node = None
+        self.pending = ()
+        if node is not None and node[1] is not None:
+            self.run(node[1])
+
+    def _reset(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._node = None
+        self.pending = ()
+
+    @staticmethod
+    def _typing(widget):
+        if isinstance(widget, str):
+            return False
+        return widget.winfo_class() in TEXT_CLASSES
+
+
+class CommandPalette:
+    """Popup listing the commands that match what is typed, best first."""
+
+    def __init__(self, root, registry, bg=None, fg=None, select_bg=None,
+                 font=None, limit=12, width=60):
+        self.root = root
+        self.registry = registry
+        self.limit = limit
+        self.style = {'bg': bg, 'fg': fg, 'select_bg': select_bg, 'font': font}
+        self.width = width
+        self.shown = []  # Commands in the list
+        self.window = None
+
+    def show(self):
+        if self.window is None:
+            self._build()
+        self.entry.delete(0, 'end')
+        self._update()
+        self.root.update_idletasks()
+        width = self.window.winfo_reqwidth()
+        x = self.root.winfo_rootx() + (self.root.winfo_width() - width) // 2
+        y = self.root.winfo_rooty() + 40
+        self.window.geometry(f'+{x}+{y}')
+        self.window.deiconify()
+        self.window.lift()
+        self.entry.focus_force()
+
+    def hide(self):
+        if self.window is not None:
+            self.window.withdraw()
+
+    def configure(self, **style):
+        """Restyle (bg, fg, select_bg, font), e.g. from a theme listener."""
+        self.style.update(style)
+        if self.window is not None:
+            self._apply_style()
+
+    # Internals
+
+    def _build(self):
+        import tkinter as tk
+        self.window = tk.Toplevel(self.root)
+        self.window.withdraw()
+        self.window.overrideredirect(True)
+        self.entry = tk.Entry(self.window, bd=0, relief='flat', width=self.width)
+        self.entry.pack(side='top', fill='x', padx=6, pady=6)
+        self.listbox = tk.Listbox(self.window, bd=0, highlightthickness=0,
+                                  activestyle='none', height=self.limit,
+                                  width=self.width)
+        self.listbox.pack(side='top', fill='both', padx=6, pady=(0, 6))
+        self._apply_style()
+        self.entry.bind('<KeyRelease>', self._on_key)
+        self.entry.bind('<Return>', lambda event: self._run())
+        self.entry.bind('<Escape>', lambda event: self.hide())
+        self.entry.bind('<Down>', lambda event: self._move(1))
+        self.entry.bind('<Up>', lambda event: self._move(-1))
+        self.entry.bind('<FocusOut>', lambda event: self.hide())
+        self.listbox.bind('<ButtonRelease-1>', lambda event: self._run())
+
+    def _apply_style(self):
+        bg, fg = self.style['bg'], self.style['fg']
+        select_bg, font = self.style['select_bg'], self.style['font']
+        self.window.config(bg=bg)
+        self.entry.config(bg=select_bg, fg=fg, insertbackground=fg, font=font)
+        self.listbox.config(bg=bg, fg=fg, selectbackground=select_bg,
+                            selectforeground=fg, font=font)
+
+    def _update(self):
+        self.shown = self.registry.matches(self.entry.get(), self.limit)
+        lines = [f'{command.title}    {command.accelerator}'.rstrip()
+                 for command in self.shown]
+        self.listbox.delete(0, 'end')
+        if lines:
+            self.listbox.insert('end', *lines)
+            self.listbox.selection_set(0)
+
+    def _move(self, step):
+        if not self.shown:
+            return 'break'
+        selection = self.listbox.curselection()
+        current = selection[0] if selection else 0
+        new = max(0, min(len(self.shown) - 1, current + step))
+        self.listbox.selection_clear(0, 'end')
+        self.listbox.selection_set(new)
+        self.listbox.see(new)
+        return 'break'
+
+    def _on_key(self, event):
+        if event.keysym not in ('Up', 'Down', 'Return', 'Escape'):
+            self._update()
+
+    def _run(self):
+        selection = self.listbox.curselection()
+        if not self.shown:
+            return
+        command = self.shown[selection[0] if selection else 0]
+        self.hide()
+        self.registry.run(command.name)
@@ -0,0 +1,306 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# In-app console for log records and captured stdout / stderr.
+#
+# Lines written from any thread go into a bounded ring buffer, so memory
+# stays fixed however much the app logs. While the Console panel is shown
+# it polls the buffer once per frame and adds everything new with a single
+# Text insert; the oldest lines are trimmed with a single delete once the
+# widget holds a tenth more than max_lines. The level filter works on the
+# buffer, so changing it re-renders the retained lines in one insert.
+
+import logging
+import sys
+import threading
+from collections import deque
+
+# Filter choices shown in the panel toolbar
+LEVELS = (('Debug', logging.DEBUG), ('Info', logging.INFO),
+          ('Warning', logging.WARNING), ('Error', logging.ERROR))
+
+LOG_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+LOG_DATE_FORMAT = '%H:%M:%S'
+
+
+class ConsoleBuffer:
+    """Ring buffer of (level, line), safe to write from any thread.
+
+    Every line gets a sequence number; written is the number of the last
+    one, so readers ask for what came after the last line they saw.
+    """
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.written = 0
+        self._lines = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lines)
+
+    def write(self, level, text):
+        """Add text (one or more lines) at level."""
+        lines = text.splitlines() or ['']
+        with self._lock:
+            self._lines.extend((level, line) for line in lines)
+            self.written += len(lines)
+
+    def since(self, written, level=logging.NOTSET, limit=None):
+        """(written, lines): the lines after sequence number written at level
+        or above, oldest first; with limit only the newest limit of them."""
+        with self._lock:
+            count = min(self.written - written, len(self._lines))
+            lines = []
+            # From the newest end, so only the new lines are visited
+            for entry in reversed(self._lines):
+                if len(lines) == count:
+                    break
+                lines.append(entry)
+            written = self.written
+        lines = [entry for entry in reversed(lines) if entry[0] >= level]
+        if limit is not None and len(lines) > limit:
+            lines = lines[-limit:]
+        return written, lines
+
+    def clear(self):
+        with self._lock:
+            self._lines.clear()
+
+
+class ConsoleHandler(logging.Handler):
+    """logging handler writing formatted records to a ConsoleBuffer."""
+
+    def __init__(self, buffer, level=logging.NOTSET):
+        super().__init__(level)
+        self.buffer = buffer
+        self.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+
+    def emit(self, record):
+        try:
+            self.buffer.write(record.levelno, self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class StreamCapture:
+    """Stand-in for sys.stdout / sys.stderr: whole lines go to the buffer,
+    everything is still passed on to the original stream (if any)."""
+
+    def __init__(self, buffer, level, stream=None):
+        self.buffer = buffer
+        self.level = level
+        self.stream = stream
+        self._partial = ''
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        if self.stream is not None:
+            self.stream.write(text)
+        with self._lock:
+            lines, newline, self._partial = (self._partial + text).rpartition('\n')
+        if newline:
+            self.buffer.write(self.level, lines)
+        return len(text)
+
+    def flush(self):
+        if self.stream is not None:
+            self.stream.flush()
+
+    def isatty(self):
+        return False
+
+    def __getattr__(self, name):
+        # encoding, fileno, ... of the original stream
+        return getattr(self.stream, name)
+
+
+class ConsoleCapture:
+    """Sends logging (from logger, the root logger by default) and
+    stdout / stderr to buffer between start() and stop()."""
+
+    def __init__(self, buffer, logger=None, level=logging.INFO, streams=True):
+        self.buffer = buffer
+        self.logger = logger or logging.getLogger()
+        self.level = level
+        self.streams = streams
+        self.handler = ConsoleHandler(buffer, level)
+        self._saved = None
+
+    def start(self):
+        if self._saved is not None:
+            return
+        self._saved = (self.logger.level, sys.stdout, sys.stderr)
+        self.logger.addHandler(self.handler)
+        if self.logger.getEffectiveLevel() > self.level:
+            self.logger.setLevel(self.level)
+        if self.streams:
+            sys.stdout = StreamCapture(self.buffer, logging.INFO, sys.stdout)
+            sys.stderr = StreamCapture(self.buffer, logging.ERROR, sys.stderr)
+
+    def stop(self):
+        if self._saved is None:
+            return
+        level, stdout, stderr = self._saved
+        self._saved = None
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(level)
+        if self.streams:
+            sys.stdout, sys.stderr = stdout, stderr
+
+
+def level_tag(level):
+    """Text tag for lines at level."""
+    if level >= logging.ERROR:
+        return 'error'
+    if level >= logging.WARNING:
+        return 'warning'
+    if level < logging.INFO:
+        return 'debug'
+    return 'info'
+
+
+class Console:
+    """Working frame panel showing a ConsoleBuffer (see views.py for the hooks).
+
+    stats counts the Text inserts, the lines they added and the trims.
+    """
+
+    def __init__(self, parent, buffer, bg=None, fg=None, bar_bg=None, dim=None,
+                 warning='#F5AB35', error='#F22613', font=None, max_lines=2000,
+                 level=logging.DEBUG, fps=30):
+        import tkinter as tk
+
+        self.buffer = buffer
+        self.max_lines = max_lines
+        self.level = level
+        self.interval = max(1, int(1000 / fps))
+        self.stats = {'inserts': 0, 'lines': 0, 'trims': 0}
+        self._written = 0  # buffer sequence number shown up to
+        self._count = 0    # lines in the Text widget
+        self._poll_id = None
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.bar = tk.Frame(self.frame, bg=bar_bg)
+        self.bar.pack(side='top', fill='x')
+        self.level_var = tk.IntVar(self.frame, level)
+        self.buttons = []
+        for label, value in LEVELS:
+            button = tk.Radiobutton(self.bar, text=label, value=value,
+                                    variable=self.level_var, indicatoron=False,
+                                    command=lambda: self.set_level(self.level_var.get()),
+                                    bd=0, relief='flat', padx=8, font=font)
+            button.pack(side='left', padx=2, pady=2)
+            self.buttons.append(button)
+        self.clear_button = tk.Button(self.bar, text='Clear', command=self.clear,
+                                      bd=0, relief='flat', padx=8, font=font)
+        self.clear_button.pack(side='right', padx=2, pady=2)
+
+        self.scrollbar = tk.Scrollbar(self.frame, orient='vertical')
+        self.scrollbar.pack(side='right', fill='y')
+        self.text = tk.Text(self.frame, wrap='none', undo=False, bd=0,
+                            highlightthickness=0, padx=6, pady=4, font=font,
+                            state='disabled', yscrollcommand=self.scrollbar.set)
+        self.text.pack(side='left', fill='both', expand=True)
+        self.scrollbar.config(command=self.text.yview)
+        self.set_colors(bg=bg, fg=fg, bar_bg=bar_bg, dim=dim, warning=warning,
+                        error=error)
+
+    def flush(self):
+        """Add the lines written since the last flush to the Text widget."""
+        written, lines = self.buffer.since(self._written, self.level, self.max_lines)
+        self._written = written
+        if not lines:
+            return
+        text = self.text
+        follow = text.yview()[1] >= 1.0
+        text.config(state='normal')
+        if len(lines) >= self.max_lines:
+            text.delete('1.0', 'end')
+            self._count = 0
+        text.insert('end', *self._chunks(lines))
+        self._count += len(lines)
+        self.stats['inserts'] += 1
+        self.stats['lines'] += len(lines)
+        if self._count > self.max_lines + self.max_lines // 10:
+            excess = self._count - self.max_lines
+            text.delete('1.0', f'{excess + 1}.0')
+            self._count -= excess
+            self.stats['trims'] += 1
+        text.config(state='disabled')
+        if follow:
+            text.yview_moveto(1.0)
+
+    def set_level(self, level):
+        """Show only lines at level or above; re-renders the buffered lines."""
+        self.level = level
+        self.level_var.set(level)
+        self.text.config(state='normal')
+        self.text.delete('1.0', 'end')
+        self.text.config(state='disabled')
+        self._written = self._count = 0
+        self.flush()
+
+    def clear(self):
+        """Empty the buffer and the panel."""
+        self.buffer.clear()
+        self.set_level(self.level)
+
+    def set_colors(self, bg=None, fg=None, bar_bg=None, dim=None, warning=None,
+                   error=None):
+        """Restyle the panel, e.g. from a theme listener."""
+        if bg is not None:
+            self.frame.config(bg=bg)
+            self.text.config(bg=bg, insertbackground=fg or bg)
+        if fg is not None:
+            self.text.config(fg=fg)
+            self.text.tag_configure('info', foreground=fg)
+        if bar_bg is not None:
+            self.bar.config(bg=bar_bg)
+            for button in (*self.buttons, self.clear_button):
+                button.config(bg=bar_bg, activebackground=bar_bg,
+                              selectcolor=bg or bar_bg)
+                if fg is not None:
+                    button.config(fg=fg, activeforeground=fg)
+        if dim is not None:
+            self.text.tag_configure('debug', foreground=dim)
+        if warning is not None:
+            self.text.tag_configure('warning', foreground=warning)
+        if error is not None:
+            self.text.tag_configure('error', foreground=error)
+
+    # View manager hooks
+
+    def activate(self):
+        if self._poll_id is None:
+            self._poll()
+
+    def deactivate(self):
+        if self._poll_id is not None:
+            self.frame.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def destroy(self):
+        self.deactivate()
+
+    # Internals
+
+    def _poll(self):
+        self._poll_id = self.frame.after(self.interval, self._poll)
+        self.flush()
+
+    @staticmethod
+    def _chunks(lines):
+        # Text insert takes (chars, tags) pairs; runs of one level are joined
+        args = []
+        run, tag = [], None
+        for level, line in lines:
+            line_tag = level_tag(level)
+            if line_tag != tag and run:
+                args += ['\n'.join(run) + '\n', tag]
+                run = []
+            tag = line_tag
+            run.append(line)
+        if run:
+            args += ['\n'.join(run) + '\n', tag]
+        return args
@@ -0,0 +1,104 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Window dragging with motion coalesced to the display frame rate.
+# Pointer positions are taken in root (screen) coordinates and the window
+# origin is cached when the drag starts, so a motion event costs no Tcl
+# queries and at most one geometry call per frame is issued.
+
+import time
+import weakref
+
+_engines = weakref.WeakKeyDictionary()  # window -> DragEngine
+
+
+class FrameThrottle:
+    """Calls callback at most once per frame with the latest submitted args."""
+
+    def __init__(self, widget, callback, fps=60):
+        self.widget = widget
+        self.callback = callback
+        self.interval = 1 / fps
+        self._args = None
+        self._after_id = None
+        self._last = 0.0
+
+    def submit(self, *args):
+        self._args = args
+        if self._after_id is None:
+            wait = self._last + self.interval - time.perf_counter()
+            self._after_id = self.widget.after(max(0, int(wait * 1000)), self._run)
+
+    def flush(self):
+        """Run a pending call now."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._run()
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._args = None
+
+    def _run(self):
+        self._after_id = None
+        args, self._args = self._args, None
+        if args is not None:
+            self._last = time.perf_counter()
+            self.callback(*args)
+
+
+class DragEngine:
+    """Moves window (a toplevel, or a placed panel) by dragging its handles."""
+
+    def __init__(self, window, fps=60):
+        self.window = window
+        self.toplevel = window.winfo_toplevel() is window
+        self.stats = {'events': 0, 'geometry': 0}
+        self._origin = None  # (window x, window y, pointer x, pointer y)
+        self._throttle = FrameThrottle(window, self._move, fps)
+
+    def attach(self, handle):
+        """Make handle (any widget) drag the window."""
+        handle.bind('<ButtonPress-1>', self._on_press, add='+')
+        handle.bind('<B1-Motion>', self._on_motion, add='+')
+        handle.bind('<ButtonRelease-1>', self._on_release, add='+')
+
+    def reset_stats(self):
+        self.stats = {'events': 0, 'geometry': 0}
+
+    # Internals
+
+    def _on_press(self, event):
+        self._origin = (self.window.winfo_x(), self.window.winfo_y(),
+                        event.x_root, event.y_root)
+
+    def _on_motion(self, event):
+        if self._origin is None:
+            return
+        self.stats['events'] += 1
+        self._throttle.submit(event.x_root, event.y_root)
+
+    def _on_release(self, event):
+        self._throttle.flush()
+        self._origin = None
+
+    def _move(self, x_root, y_root):
+        if self._origin is None:
+            return
+        x0, y0, px, py = self._origin
+        x, y = x0 + x_root - px, y0 + y_root - py
+        if self.toplevel:
+            self.window.geometry(f'+{x}+{y}')
+        else:
+            self.window.place_configure(x=x, y=y)
+        self.stats['geometry'] += 1
+
+
+def shared(window, fps=60):
+    """Return the DragEngine moving window, creating it once."""
+    engine = _engines.get(window)
+    if engine is None:
+        engine = _engines[window] = DragEngine(window, fps)
+    return engine
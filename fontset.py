@@ -0,0 +1,147 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Named fonts per role.
+#
+# Every role (menu_normal, infobox_normal, ...) becomes one tkinter.font.Font
+# created once per interpreter; widgets get the font object, so Tk resolves
+# each font once and resizing reconfigures only the named fonts - every
+# widget using them follows. Text measurements are cached per role until
+# the next resize.
+
+import os
+import sys
+import weakref
+
+# Tried in order when a role's family is not installed
+FALLBACK_FAMILIES = ('Roboto', 'Segoe UI', 'Helvetica Neue', 'DejaVu Sans',
+                     'Liberation Sans', 'Helvetica', 'Arial')
+
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'fonts')
+
+_sets = weakref.WeakKeyDictionary()  # Tk root -> FontSet
+
+
+def load_private_fonts(directory=FONTS_DIR):
+    """Make the .ttf/.otf files in directory available to this process only.
+
+    Uses AddFontResourceEx on Windows and fontconfig elsewhere (X11 Tk
+    resolves fonts through it). Returns False when nothing could be loaded.
+    """
+    if not os.path.isdir(directory):
+        return False
+    import ctypes
+    import ctypes.util
+    if sys.platform == 'win32':
+        private = 0x10  # FR_PRIVATE
+        loaded = 0
+        for file_name in os.listdir(directory):
+            if file_name.lower().endswith(('.ttf', '.otf')):
+                path = os.path.join(directory, file_name)
+                loaded += ctypes.windll.gdi32.AddFontResourceExW(path, private, 0)
+        return loaded > 0
+    library = ctypes.util.find_library('fontconfig')
+    if library is None:
+        return False
+    fontconfig = ctypes.CDLL(library)
+    return bool(fontconfig.FcConfigAppFontAddDir(None, directory.encode()))
+
+
+class FontSet:
+    """Named Font per role with global resize and cached measurements.
+
+    roles maps a role to (family, size) or (family, size, weight). A family
+    that is not installed falls back to the first installed one of
+    FALLBACK_FAMILIES.
+    """
+
+    def __init__(self, root, roles, min_size=6, max_size=48, cache_size=4096):
+        import tkinter.font as tkfont
+
+        self.root = root
+        self.min_size = min_size
+        self.max_size = max_size
+        self.cache_size = cache_size
+        self.step = 0  # points added to every base size
+        self.listeners = []  # callables(FontSet) run after a resize
+        self._base = {}
+        self._fonts = {}
+        self._measures = {}  # (role, text) -> pixels
+        self._metrics = {}   # role -> metrics dict
+
+        load_private_fonts()
+        installed = set(tkfont.families(root))
+        for role, spec in roles.items():
+            family, size, *weight = spec
+            family = self.resolve_family(family, installed)
+            self._base[role] = size
+            self._fonts[role] = tkfont.Font(root, name=f'font_{role}', exists=False,
+                                            family=family, size=size,
+                                            weight=weight[0] if weight else 'normal')
+
+    @staticmethod
+    def resolve_family(family, installed):
+        """family, or the first installed fallback. Accepts legacy file
+        names such as 'roboto.ttf'."""
+        family = os.path.splitext(family)[0] if family.lower().endswith(('.ttf', '.otf')) else family
+        by_lower = {name.lower(): name for name in installed}
+        for candidate in (family, *FALLBACK_FAMILIES):
+            name = by_lower.get(candidate.lower())
+            if name is not None:
+                return name
+        return 'TkDefaultFont'
+
+    def __getitem__(self, role):
+        return self._fonts[role]
+
+    def get(self, role, default=None):
+        return self._fonts.get(role, default)
+
+    def __contains__(self, role):
+        return role in self._fonts
+
+    def measure(self, role, text):
+        """Width of text in pixels, cached."""
+        key = (role, text)
+        width = self._measures.get(key)
+        if width is None:
+            if len(self._measures) >= self.cache_size:
+                self._measures.clear()
+            width = self._measures[key] = self._fonts[role].measure(text)
+        return width
+
+    def metrics(self, role, option=None):
+        """Font metrics (ascent, descent, linespace, fixed), cached."""
+        metrics = self._metrics.get(role)
+        if metrics is None:
+            metrics = self._metrics[role] = self._fonts[role].metrics()
+        return metrics if option is None else metrics[option]
+
+    def resize(self, step):
+        """Add step points to every role (0 restores the base sizes)."""
+        self.step = step
+        for role, font in self._fonts.items():
+            size = max(self.min_size, min(self.max_size, self._base[role] + step))
+            if font.cget('size') != size:
+                font.configure(size=size)
+        self._measures.clear()
+        self._metrics.clear()
+        for listener in self.listeners:
+            listener(self)
+
+    def bind_keys(self, widget):
+        """Ctrl +, Ctrl - and Ctrl 0 resize the fonts application wide."""
+        for sequence in ('<Control-plus>', '<Control-equal>', '<Control-KP_Add>'):
+            widget.bind_all(sequence, lambda event: self.resize(self.step + 1), add='+')
+        for sequence in ('<Control-minus>', '<Control-KP_Subtract>'):
+            widget.bind_all(sequence, lambda event: self.resize(self.step - 1), add='+')
+        widget.bind_all('<Control-0>', lambda event: self.resize(0), add='+')
+
+
+def shared(widget, roles):
+    """Return the FontSet of widget's Tk interpreter, creating it once."""
+    root = widget._root()
+    fonts = _sets.get(root)
+    if fonts is None:
+        fonts = _sets[root] = FontSet(root, roles)
+    return fonts
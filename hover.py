@@ -0,0 +1,151 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Hover effects dispatched from class-level bindings.
+# Each hover style is a bind tag with one <Enter> and one <Leave> handler.
+# Widgets join the tag; their images live in a table keyed by widget path,
+# so attaching a widget creates no Python closures and no Tcl commands.
+#
+# Visual changes are not applied straight away. They are queued per widget
+# and flushed once per idle cycle, so an <Enter>/<Leave> pair arriving in
+# the same cycle collapses to its final state, and options a widget already
+# shows are never configured again.
+
+import weakref
+from functools import partial
+
+NORMAL = 0
+HOVER = 1
+
+_managers = weakref.WeakKeyDictionary()  # Tk root -> HoverStyles
+
+
+class HoverStyles:
+    """Hover style table and visual state cache for one Tk interpreter."""
+
+    state_tag = 'HoverState'
+
+    def __init__(self, root):
+        self.root = root
+        self.styles = {}   # style name -> (bg, hover_bg)
+        self.images = {}   # widget path -> (image, hover_image)
+        self.applied = {}  # widget path -> {option: value} the widget shows
+        self.pending = {}  # widget path -> (widget, {option: value})
+        self.stats = {'requested': 0, 'configured': 0, 'skipped': 0}
+        self._flush_id = None
+        root.bind_class(self.state_tag, '<Destroy>', self._on_destroy)
+
+    @staticmethod
+    def tag(style):
+        return f'Hover-{style}'
+
+    def define(self, style, bg=None, hover_bg=None):
+        """Create or update a hover style. bg None leaves the colour alone."""
+        if style not in self.styles:
+            tag = self.tag(style)
+            self.root.bind_class(tag, '<Enter>', partial(self._on_event, style, HOVER))
+            self.root.bind_class(tag, '<Leave>', partial(self._on_event, style, NORMAL))
+        self.styles[style] = (bg, hover_bg)
+
+    def attach(self, widget, style, image=None, hover_image=None):
+        """Give widget the hover style, optionally swapping image on hover."""
+        if style not in self.styles:
+            raise KeyError(f'hover style {style!r} is not defined')
+        tag = self.tag(style)
+        tags = widget.bindtags()
+        if tag not in tags:
+            widget.bindtags(tags + (tag,))
+        if image is not None or hover_image is not None:
+            self.set_images(widget, image, hover_image)
+
+    def set_images(self, widget, image, hover_image):
+        """Swap the images of an attached widget, e.g. for a toggled state."""
+        path = str(widget)
+        if path not in self.images:
+            self._track(widget)
+        self.images[path] = (image, hover_image)
+
+    def state(self, widget, style, state):
+        """Options widget should have in state (NORMAL or HOVER)."""
+        options = {}
+        bg = self.styles[style][state]
+        if bg is not None:
+            options['bg'] = bg
+        images = self.images.get(str(widget))
+        if images is not None and images[state] is not None:
+            options['image'] = images[state]
+        return options
+
+    def request(self, widget, **options):
+        """Queue options for widget; they are applied on the next idle flush."""
+        self.stats['requested'] += 1
+        path = str(widget)
+        entry = self.pending.get(path)
+        if entry is None:
+            self.pending[path] = (widget, options)
+        else:
+            entry[1].update(options)
+        if self._flush_id is None:
+            self._flush_id = self.root.after_idle(self._on_idle)
+
+    def flush(self):
+        """Apply queued options, skipping the ones a widget already shows."""
+        if self._flush_id is not None:
+            self.root.after_cancel(self._flush_id)
+            self._flush_id = None
+        pending, self.pending = self.pending, {}
+        for path, (widget, options) in pending.items():
+            applied = self.applied.get(path)
+            if applied is None:
+                applied = self.applied[path] = {}
+                self._track(widget)
+            changed = {key: value for key, value in options.items()
+                       if applied.get(key) != str(value)}
+            if not changed:
+                self.stats['skipped'] += 1
+                continue
+            widget.config(**changed)
+            self.stats['configured'] += 1
+            for key, value in changed.items():
+                applied[key] = str(value)
+
+    def reset_stats(self):
+        self.stats = {'requested': 0, 'configured': 0, 'skipped': 0}
+
+    def forget(self, widget):
+        """Drop the cached state of widget, e.g. after configuring it directly."""
+        path = str(widget)
+        self.applied.pop(path, None)
+        self.pending.pop(path, None)
+
+    # Internals
+
+    def _track(self, widget):
+        # The state tag's <Destroy> binding drops what is kept for widget
+        tags = widget.bindtags()
+        if self.state_tag not in tags:
+            widget.bindtags(tags + (self.state_tag,))
+
+    def _on_idle(self):
+        self._flush_id = None
+        self.flush()
+
+    def _on_event(self, style, state, event):
+        options = self.state(event.widget, style, state)
+        if options:
+            self.request(event.widget, **options)
+
+    def _on_destroy(self, event):
+        path = str(event.widget)
+        self.images.pop(path, None)
+        self.applied.pop(path, None)
+        self.pending.pop(path, None)
+
+
+def shared(widget):
+    """Return the HoverStyles of widget's Tk interpreter, creating it once."""
+    root = widget._root()
+    manager = _managers.get(root)
+    if manager is None:
+        manager = _managers[root] = HoverStyles(root)
+    return manager
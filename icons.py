@@ -0,0 +1,328 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from atlas import ATLAS_NAME, Atlas
+
+# Every icon ships as one master image, name.png, drawn at full opacity.
+# Variants are derived from it: the value is the opacity applied to the
+# master (normal icons are dimmed, hoover shows the master as is).
+VARIANTS = {
+    'normal': 0.5,
+    'hover': 1.0,
+    None: 1.0
+}
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+
+
+def display_scale(widget):
+    """Icon scale for widget's display: 1 at 96 dpi, following tk scaling."""
+    return float(widget.tk.call('tk', 'scaling')) * 72 / 96
+
+
+class ImageCache:
+    """LRU cache of PIL images bounded by their pixel bytes."""
+
+    def __init__(self, budget=8 * 1024 * 1024):
+        self.budget = budget
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()  # key -> PIL image, least recent first
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        size = image.width * image.height * len(image.getbands())
+        with self._lock:
+            if key in self._images:
+                return
+            self._images[key] = image
+            self.bytes += size
+            while self.bytes > self.budget and len(self._images) > 1:
+                key, old = self._images.popitem(last=False)
+                self.bytes -= old.width * old.height * len(old.getbands())
+
+
+class IconRegistry:
+    """Icon registry keyed by (name, variant, scale).
+
+    Masters are decoded at most once and every widget asking for the same
+    key gets the same PhotoImage. Variants and scaled copies are derived
+    from the master with Pillow and kept in an ImageCache keyed by the
+    master's content hash, plus an optional PNG cache in cache_dir.
+    Decoding may run ahead on a thread pool (see prefetch); PhotoImages
+    themselves are always created on the Tk thread.
+
+    Icons asked for without an explicit scale follow the registry scale;
+    rescale() redraws all of them in place, so widgets keep their images.
+
+    Images from get() live as long as the registry. Images from acquire()
+    or claim() are reference counted per owning widget: when the last owner
+    is destroyed the Tk image is deleted (it is created again if asked for
+    later).
+
+    When assets_dir holds a packed atlas (see atlas.py) masters are cut out
+    of it, otherwise every master is read from its own file.
+    """
+
+    owner_tag = 'IconOwner'
+
+    def __init__(self, assets_dir=ASSETS_DIR, workers=4, use_atlas=True,
+                 scale=1, cache_budget=8 * 1024 * 1024, cache_dir=None):
+        self.assets_dir = assets_dir
+        self.workers = workers
+        self.use_atlas = use_atlas
+        self.scale = self._round(scale)
+        self.cache = ImageCache(cache_budget)
+        self.cache_dir = cache_dir
+        self._executor = None
+        self._lock = threading.Lock()
+        self._atlas_lock = threading.Lock()
+        self._atlas = None
+        self._masters = {}  # name -> [lock, (master image, content hash) or None]
+        self._pending = {}  # key -> Future resolving to a derived image, until used
+        self._photos = {}   # key -> ImageTk.PhotoImage
+        self._bytes = {}    # key -> decoded pixel bytes held by Tk (RGBA)
+        self._names = {}    # Tk image name -> key
+        self._pinned = set()  # keys from get(), never freed
+        self._refs = {}     # key -> number of owning widgets
+        self._owners = {}   # widget path -> set of keys it owns
+        self._bound = set()  # Tk interpreters with the owner tag bound
+        self.freed = 0
+
+    def path(self, name):
+        return os.path.join(self.assets_dir, f'{name}.png')
+
+    def prefetch(self, keys):
+        """Start decoding keys in the background.
+
+        keys is an iterable of (name, variant) or (name, variant, scale).
+        Call it before building the widgets so the decode overlaps packing.
+        """
+        for key in keys:
+            key = self._key(*key)
+            if key not in self._photos:
+                self._derived_future(key)
+
+    def get(self, name, variant='normal', scale=None):
+        """Return the shared PhotoImage for (name, variant, scale), kept for
+        the lifetime of the registry."""
+        key = self._key(name, variant, scale)
+        self._pinned.add(key)
+        return self._photo(key)
+
+    def acquire(self, owner, name, variant='normal', scale=None):
+        """Return the shared PhotoImage for (name, variant, scale), kept while
+        owner (a widget) lives."""
+        photo = self.image(name, variant, scale)
+        self.claim(owner, photo)
+        return photo
+
+    def image(self, name, variant='normal', scale=None):
+        """Return the shared PhotoImage without keeping it alive; claim() it
+        for the widget created with it."""
+        return self._photo(self._key(name, variant, scale))
+
+    def claim(self, owner, *photos):
+        """Count owner as a user of photos until it is destroyed."""
+        path = str(owner)
+        keys = self._owners.get(path)
+        if keys is None:
+            keys = self._owners[path] = set()
+            root = owner._root()
+            if root not in self._bound:
+                root.bind_class(self.owner_tag, '<Destroy>', self._on_destroy)
+                self._bound.add(root)
+            owner.bindtags(owner.bindtags() + (self.owner_tag,))
+        for photo in photos:
+            if photo is None:
+                continue
+            key = self._names[str(photo)]
+            if key not in keys:
+                keys.add(key)
+                self._refs[key] = self._refs.get(key, 0) + 1
+
+    def release(self, owner):
+        """Drop every image owner holds; called when owner is destroyed."""
+        for key in self._owners.pop(str(owner), ()):
+            refs = self._refs[key] - 1
+            if refs:
+                self._refs[key] = refs
+            else:
+                del self._refs[key]
+                if key not in self._pinned:
+                    self._free(key)
+
+    def rescale(self, scale):
+        """Switch the registry scale and redraw the PhotoImages that follow it."""
+        scale = self._round(scale)
+        if scale == self.scale:
+            return
+        with self._lock:
+            self.scale = scale
+            # Decodes started for the old scale: drop them, start them again
+            stale = [key for key in self._pending if key[2] is None]
+            for key in stale:
+                self._pending.pop(key).cancel()
+        for key in stale:
+            self._derived_future(key)
+        for key, photo in list(self._photos.items()):
+            name, alpha, old_scale = key
+            if old_scale is not None:
+                continue
+            image = self._derive(name, alpha, scale)
+            photo.tk.call(str(photo), 'configure',
+                          '-width', image.width, '-height', image.height)
+            photo.paste(image)
+            self._bytes[key] = image.width * image.height * 4
+
+    def stats(self):
+        """Live PhotoImages, the pixel bytes they hold, owners and cache use."""
+        return {'photos': len(self._photos), 'bytes': sum(self._bytes.values()),
+                'pinned': len(self._pinned), 'owners': len(self._owners),
+                'freed': self.freed, 'cache_bytes': self.cache.bytes,
+                'cache_hits': self.cache.hits, 'cache_misses': self.cache.misses}
+
+    def close(self):
+        """Stop the decode pool. Already created PhotoImages stay valid."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    # Internals
+
+    @staticmethod
+    def _round(scale):
+        # Quarter steps, so nearby dpi settings share derived images
+        return max(0.25, round(scale * 4) / 4)
+
+    @classmethod
+    def _key(cls, name, variant='normal', scale=None):
+        # None scale follows the registry scale; hover and None share images
+        return (name, VARIANTS[variant], None if scale is None else cls._round(scale))
+
+    def _photo(self, key):
+        photo = self._photos.get(key)
+        if photo is None:
+            from PIL import ImageTk
+            image = self._derived_future(key).result()
+            self._pending.pop(key, None)
+            photo = self._photos[key] = ImageTk.PhotoImage(image)
+            self._bytes[key] = image.width * image.height * 4
+            self._names[str(photo)] = key
+        return photo
+
+    def _free(self, key):
+        photo = self._photos.pop(key, None)
+        if photo is None:
+            return
+        del self._bytes[key]
+        del self._names[str(photo)]
+        # Deleted now rather than when the last Python reference goes
+        photo.tk.call('image', 'delete', str(photo))
+        self.freed += 1
+
+    def _on_destroy(self, event):
+        self.release(event.widget)
+
+    def _submit(self, func, *args):
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix='icon-decode')
+        return self._executor.submit(func, *args)
+
+    def _derived_future(self, key):
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                name, alpha, scale = key
+                future = self._submit(self._derive, name, alpha, scale)
+                self._pending[key] = future
+            return future
+
+    def _master(self, name):
+        # Decoded in the calling worker; a pool task waiting on another pool
+        # task could starve the pool
+        with self._lock:
+            entry = self._masters.get(name)
+            if entry is None:
+                entry = self._masters[name] = [threading.Lock(), None]
+        with entry[0]:
+            if entry[1] is None:
+                entry[1] = self._decode(name)
+            return entry[1]
+
+    def _load_atlas(self):
+        with self._atlas_lock:
+            if self._atlas is None:
+                path = os.path.join(self.assets_dir, ATLAS_NAME)
+                if self.use_atlas and os.path.exists(path):
+                    self._atlas = Atlas.load(path)
+                else:
+                    self._atlas = False
+            return self._atlas
+
+    def _decode(self, name):
+        from PIL import Image
+        atlas = self._load_atlas()
+        if atlas and name in atlas:
+            image = atlas.crop(name)
+        else:
+            image = Image.open(self.path(name))
+            image.load()
+        image = image.convert('RGBA')
+        digest = hashlib.blake2b(image.tobytes(), digest_size=12)
+        digest.update(repr(image.size).encode())
+        return image, digest.hexdigest()
+
+    def _derive(self, name, alpha, scale=None):
+        """Master of name with opacity alpha at scale (None: registry scale)."""
+        from PIL import Image
+        scale = self.scale if scale is None else scale
+        master, digest = self._master(name)
+        if alpha == 1 and scale == 1:
+            return master
+        cache_key = (digest, alpha, scale)
+        image = self.cache.get(cache_key)
+        if image is not None:
+            return image
+
+        cache_file = None
+        if self.cache_dir is not None:
+            cache_file = os.path.join(self.cache_dir, f'{digest}-{alpha:g}-{scale:g}.png')
+            if os.path.exists(cache_file):
+                image = Image.open(cache_file)
+                image.load()
+        if image is None:
+            image = master
+            if scale != 1:
+                size = (max(1, round(image.width * scale)),
+                        max(1, round(image.height * scale)))
+                image = image.resize(size, Image.LANCZOS)
+            if alpha != 1:
+                image = image.copy()
+                image.putalpha(image.getchannel('A').point(lambda a: round(a * alpha)))
+            if cache_file is not None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                temp = f'{cache_file}.{threading.get_ident()}.tmp'
+                image.save(temp, format='PNG')
+                os.replace(temp, cache_file)
+        self.cache.put(cache_key, image)
+        return image
@@ -0,0 +1,221 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# MainWindow layout spec - see builder.py for the format.
+# Colour values are keys of main.colors, font values keys of main.fonts.
+
+main_window = {
+    'styles': {
+        'top_menu': {
+            'type': 'Button',
+            'bd': 0,
+            'bg': 'bg',
+            'activebackground': 'button_hoover',
+            'activeforeground': 'infobox_afb',
+            'fg': 'infobox_fb',
+            'font': 'menu_normal',
+            'relief': 'flat',
+            'hover': 'menu',
+            'pack': {'side': 'left', 'padx': 6, 'pady': 1}
+        },
+        'file_menu': {
+            'bg': 'menu_bg',
+            'bd': 0,
+            'activebackground': 'button_hoover',
+            'activeforeground': 'infobox_afb',
+            'fg': 'infobox_fb',
+            'font': 'menu_normal',
+            'relief': 'flat',
+            'tearoff': 0
+        },
+        'window_button': {
+            'type': 'Button',
+            'bd': 0,
+            'bg': 'bg',
+            'activebackground': 'button_hoover',
+            'width': 40,
+            'relief': 'flat',
+            'hover': 'window',
+            'pack': {'side': 'right', 'padx': 0, 'pady': 0}
+        },
+        'title': {
+            'type': 'Label',
+            'bg': 'bg',
+            'fg': 'infobox_fb',
+            'font': 'menu_normal',
+            'justify': 'center',
+            'pack': {'fill': 'x'}
+        },
+        'infobox': {
+            'type': 'Button',
+            'bd': 0,
+            'bg': 'bg',
+            'activebackground': 'button_hoover',
+            'activeforeground': 'infobox_afb',
+            'fg': 'infobox_fb',
+            'font': 'infobox_normal',
+            'relief': 'flat',
+            'hover': 'menu',
+            'pack': {'side': 'left', 'padx': 6, 'pady': 1}
+        },
+        'status_dot': {
+            'type': 'Label',
+            'bd': 0,
+            'bg': 'bg',
+            'activebackground': 'button_hoover',
+            'activeforeground': 'infobox_afb',
+            'fg': 'infobox_fb',
+            'font': 'infobox_normal',
+            'pack': {'side': 'left', 'padx': 1, 'pady': 1}
+        },
+        'infobox_label': {
+            'type': 'Label',
+            'bd': 0,
+            'bg': 'bg',
+            'fg': 'infobox_fb',
+            'font': 'infobox_normal',
+            'pack': {'side': 'right', 'padx': 6, 'pady': 1}
+        },
+        'left_menu': {
+            'type': 'Button',
+            'bd': 0,
+            'bg': 'menu_bg',
+            'activebackground': 'button_activebg',
+            'relief': 'flat',
+            'hover': 'left_menu',
+            'pack': {'side': 'top', 'pady': 4, 'padx': 4}
+        },
+        'working_menu': {
+            'type': 'Button',
+            'bd': 0,
+            'bg': 'working_bg',
+            'activebackground': 'button_hoover',
+            'activeforeground': 'infobox_afb',
+            'fg': 'infobox_fb',
+            'font': 'menu_normal',
+            'relief': 'flat',
+            'hover': 'working_menu',
+            'pack': {'side': 'left', 'padx': 4}
+        },
+        'search_entry': {
+            'type': 'Entry',
+            'bd': 0,
+            'bg': 'working_bg',
+            'fg': 'infobox_afb',
+            'insertbackground': 'infobox_afb',
+            'font': 'menu_normal',
+            'relief': 'flat',
+            'width': 28,
+            'pack': {'side': 'right', 'padx': 4, 'pady': 2}
+        },
+        'search_icon': {
+            'type': 'Label',
+            'bd': 0,
+            'bg': 'menu_bg',
+            'pack': {'side': 'right', 'padx': 0}
+        }
+    },
+
+    # Hoover styles: [normal bg, hoover bg], None keeps the colour
+    'hover': {
+        'menu': ['bg', 'infobox_abg'],
+        'close': ['bg', 'red'],
+        'window': ['bg', 'menu_bg'],
+        'left_menu': [None, None],
+        'working_menu': ['working_bg', 'button_hoover']
+    },
+
+    'frames': [
+        # Main Frame
+        {'name': 'main_window', 'bg': 'bg',
+         'pack': {'side': 'top', 'fill': 'both', 'expand': True}},
+        # Top Bar
+        {'name': 'top_bar', 'parent': 'main_window', 'bg': 'bg', 'height': 24,
+         'pack': {'side': 'top', 'fill': 'x', 'expand': False}},
+        # Bottom Infobox Frame
+        {'name': 'infobox', 'parent': 'main_window', 'bg': 'bg', 'height': 16,
+         'pack': {'side': 'bottom', 'fill': 'x', 'expand': False}},
+        # Left Menu Frame
+        {'name': 'left_menu', 'parent': 'main_window', 'bg': 'menu_bg', 'width': 38,
+         'pack': {'side': 'left', 'fill': 'y', 'expand': False}},
+        # Working Frame
+        {'name': 'working', 'parent': 'main_window', 'bg': 'working_bg',
+         'pack': {'side': 'top', 'fill': 'both', 'expand': True}},
+        # Working Top Menu Frame
+        {'name': 'working_top_menu', 'parent': 'working', 'bg': 'menu_bg', 'width': 38,
+         'pack': {'side': 'top', 'fill': 'x', 'expand': False}}
+    ],
+
+    'widgets': {
+        'top_bar': [
+            {'name': 'file_button', 'style': 'top_menu', 'type': 'Menubutton',
+             'text': 'File', 'hover': None,
+             'menu': {'style': 'file_menu', 'items': [
+                 {'label': 'New File', 'command': 'new_file', 'accelerator': 'Ctrl+N'},
+                 '-',
+                 {'label': 'Open File', 'command': 'open_file', 'accelerator': 'Ctrl+O'},
+                 '-',
+                 {'label': 'Exit', 'command': 'exit', 'accelerator': 'Alt+F4'}
+             ]}},
+            {'style': 'top_menu', 'text': 'Edit', 'command': 'check_button'},
+            {'style': 'top_menu', 'type': 'Menubutton', 'text': 'View', 'hover': None,
+             'menu': {'style': 'file_menu', 'items': [
+                 {'label': 'Dark theme', 'command': 'theme_dark',
+                  'accelerator': 'Ctrl+K Ctrl+D'},
+                 {'label': 'Light theme', 'command': 'theme_light',
+                  'accelerator': 'Ctrl+K Ctrl+L'},
+                 {'label': 'High contrast theme', 'command': 'theme_high_contrast',
+                  'accelerator': 'Ctrl+K Ctrl+H'},
+                 '-',
+                 {'label': 'Console', 'command': 'console'},
+                 {'label': 'Command palette', 'command': 'command_palette',
+                  'accelerator': 'Ctrl+Shift+P'}
+             ]}},
+            {'style': 'top_menu', 'text': 'Help', 'command': 'check_button'},
+            {'name': 'close_button', 'style': 'window_button', 'icon': 'close',
+             'hover': 'close', 'command': 'exit'},
+            {'name': 'maximize_button', 'style': 'window_button', 'icon': 'fullwin',
+             'command': 'maximize'},
+            {'name': 'minimize_button', 'style': 'window_button', 'icon': 'minimize',
+             'command': 'iconify'},
+            # Title / grab window
+            {'name': 'title_label', 'style': 'title', 'text': 'Modulo', 'drag': True}
+        ],
+        'infobox': [
+            {'name': 'version_button', 'style': 'infobox', 'text': '{version}',
+             'command': 'check_button',
+             'tooltip': 'Click for more information about the software.'},
+            {'name': 'status_dot', 'style': 'status_dot', 'image': 'dot_red'},
+            {'name': 'status_button', 'style': 'infobox', 'text': '{status}',
+             'command': 'check_button', 'pack': {'padx': 3},
+             'tooltip': 'Connection to the server status is: {status}. Click for action.'},
+            # Background tasks status
+            {'name': 'task_label', 'style': 'infobox_label', 'text': ''}
+        ],
+        'left_menu': [
+            {'style': 'left_menu', 'icon': 'check', 'tooltip': 'Entry data',
+             'command': 'entry_data'},
+            {'style': 'left_menu', 'icon': 'result', 'tooltip': 'Analysis',
+             'command': 'analysis'},
+            {'style': 'left_menu', 'icon': 'graph', 'tooltip': 'Result',
+             'command': 'result'},
+            {'style': 'left_menu', 'icon': 'ship', 'tooltip': 'Class methods',
+             'command': 'class_methods'},
+            # Bottom options
+            {'style': 'left_menu', 'icon': 'options', 'tooltip': 'Settings',
+             'command': 'settings', 'pack': {'side': 'bottom'}},
+            {'style': 'left_menu', 'icon': 'user', 'tooltip': 'User options',
+             'command': 'user_options', 'pack': {'side': 'bottom'}}
+        ],
+        'working_top_menu': [
+            {'style': 'working_menu', 'text': 'Profile library',
+             'command': 'profile_library'},
+            {'style': 'working_menu', 'text': 'Material library',
+             'command': 'material_library'},
+            # Library search
+            {'name': 'search_entry', 'style': 'search_entry'},
+            {'style': 'search_icon', 'icon': 'search',
+             'tooltip': 'Search the open library. Fuzzy matches follow exact ones.'}
+        ]
+    }
+}
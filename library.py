@@ -0,0 +1,66 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Profile and material catalogues for the working area.
+#
+# Until the real catalogues are wired in, rows are generated from their
+# index on demand, so a catalogue of any size costs no memory beyond the
+# sort indexes the table builds.
+
+from table import DataSource
+
+PROFILE_TYPES = ('HEA', 'HEB', 'IPE', 'UPN', 'RHS', 'SHS', 'CHS', 'L')
+MATERIAL_GRADES = ('S235', 'S275', 'S355', 'S420', 'S460', 'AH36', 'DH36', 'EH36')
+MATERIAL_NAMES = ('Steel', 'Stainless', 'Aluminium', 'Titanium', 'Bronze', 'Copper')
+
+
+def _mix(index, salt):
+    """Cheap deterministic pseudo random number in 0..2**32 for index."""
+    x = (index * 0x9E3779B1 + salt * 0x85EBCA77) & 0xFFFFFFFF
+    x ^= x >> 15
+    x = (x * 0x2C1B3C6D) & 0xFFFFFFFF
+    x ^= x >> 12
+    return x
+
+
+class ProfileLibrary(DataSource):
+    columns = ('Designation', 'Type', 'Height mm', 'Width mm', 'Weight kg/m')
+
+    def __init__(self, size=500000):
+        super().__init__()
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def row(self, index):
+        kind = PROFILE_TYPES[_mix(index, 1) % len(PROFILE_TYPES)]
+        height = 80 + _mix(index, 2) % 920
+        width = 40 + _mix(index, 3) % 460
+        weight = round(height * width * 0.00012 + _mix(index, 4) % 100 / 10, 1)
+        return (f'{kind} {height}x{width}-{index}', kind, height, width, weight)
+
+
+class MaterialLibrary(DataSource):
+    columns = ('Name', 'Grade', 'Density kg/m3', 'Yield MPa', 'E GPa')
+
+    def __init__(self, size=500000):
+        super().__init__()
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def row(self, index):
+        name = MATERIAL_NAMES[_mix(index, 5) % len(MATERIAL_NAMES)]
+        grade = MATERIAL_GRADES[_mix(index, 6) % len(MATERIAL_GRADES)]
+        density = 2700 + _mix(index, 7) % 6200
+        strength = 150 + _mix(index, 8) % 800
+        modulus = 70 + _mix(index, 9) % 140
+        return (f'{name} {grade}/{index}', grade, density, strength, modulus)
+
+
+libraries = {
+    'profiles': ProfileLibrary,
+    'materials': MaterialLibrary
+}
@@ -0,0 +1,212 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Streaming loader for delimited data files (File > Open).
+#
+# A file is never read into memory as a whole. It is memory mapped and a
+# background task scans it chunk by chunk for line starts, appending them
+# to an offset array (8 bytes per record) and reporting its progress. The
+# table shows records as they arrive: FileSource parses only the rows the
+# table asks for, straight from the map. Cancelling the task stops the scan
+# after the current chunk and keeps the records found so far.
+
+import csv
+import mmap
+import os
+import threading
+from array import array
+
+from table import DataSource
+from tasks import current_task
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DELIMITERS = (',', ';', '\t', '|')
+CHUNK = 8 * 1024 * 1024
+
+
+def sniff_delimiter(line):
+    """The most frequent of DELIMITERS in line (a comma if none occurs)."""
+    counts = [(line.count(delimiter), delimiter) for delimiter in DELIMITERS]
+    count, delimiter = max(counts)
+    return delimiter if count else ','
+
+
+class FileSource(DataSource):
+    """DataSource over a delimited text file with a header line.
+
+    len() grows while scan() runs; rows are parsed on demand. Sorting is
+    possible once a scan has ended, also a stopped or cancelled one (then
+    over the records found, see complete).
+    """
+
+    def __init__(self, path, delimiter=None, encoding='utf-8'):
+        super().__init__()
+        self.path = path
+        self.encoding = encoding
+        self.name = os.path.basename(path)
+        self.offsets = array('Q')  # start of every record line
+        self.scanned = 0           # bytes scanned so far
+        self.complete = False      # every record found
+        self.scanning = False
+        self.scanned_once = False  # a scan ended: complete, stopped or cancelled
+        self._stop = False
+        self._lock = threading.Lock()
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # Empty files cannot be mapped
+        self._map = (mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                     if self.size else b'')
+
+        end = self._line_end(0)
+        header = self._decode(0, end)
+        self.delimiter = delimiter or sniff_delimiter(header)
+        self.columns = tuple(self._split(header)) if header else ('Column 1',)
+        self.scanned = min(self.size, end + 1)
+        if self.scanned < self.size:
+            self.offsets.append(self.scanned)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def row(self, index):
+        start = self.offsets[index]
+        if index + 1 < len(self.offsets):
+            end = self.offsets[index + 1] - 1
+        else:
+            end = self._line_end(start)
+        values = self._split(self._decode(start, end))
+        # Short and long lines are fitted to the header
+        width = len(self.columns)
+        return tuple(values[:width]) + ('',) * (width - len(values))
+
+    @property
+    def sortable(self):
+        # Sort indexes only cover the rows found when they were built
+        return self.scanned_once and not self.scanning and self._map is not None
+
+    def sort_key(self, index, column):
+        if self._map is None:
+            raise ValueError(f'{self.name} is closed')
+        value = self.row(index)[column]
+        try:
+            return 0, float(value), ''
+        except ValueError:
+            return 1, 0.0, value
+
+    def sort_index(self, column):
+        """Row numbers ordered as sort_key orders them: numbers first, then
+        text. Built from one column array; a task checks for cancellation."""
+        index = self._indexes.get(column)
+        if index is not None:
+            return index
+        if numpy is None:
+            return super().sort_index(column)
+        task = current_task()
+        count = len(self)
+        numbers = numpy.zeros(count, dtype=numpy.float64)
+        text_rows = array('Q')
+        texts, chunks = [], []  # text values, packed into arrays every 65536
+        for row in range(count):
+            if task is not None and not row % 4096:
+                task.check()
+            if self._map is None:
+                raise ValueError(f'{self.name} is closed')
+            value = self.row(row)[column]
+            try:
+                numbers[row] = float(value)
+            except ValueError:
+                text_rows.append(row)
+                texts.append(value)
+                if len(texts) == 65536:
+                    chunks.append(numpy.array(texts))
+                    texts = []
+        if texts or not chunks:
+            chunks.append(numpy.array(texts, dtype=str))
+        texts = numpy.concatenate(chunks)
+        del chunks
+
+        is_text = numpy.zeros(count, dtype=bool)
+        text_rows = numpy.frombuffer(text_rows, dtype=numpy.uint64)
+        is_text[text_rows] = True
+        number_rows = numpy.flatnonzero(~is_text)
+        del is_text
+        order = numpy.concatenate((
+            number_rows[numpy.argsort(numbers[number_rows], kind='stable')],
+            text_rows[numpy.argsort(texts, kind='stable')]))
+        typecode, dtype = ('I', numpy.uint32) if count < 2 ** 32 else ('Q', numpy.uint64)
+        index = self._indexes[column] = array(typecode, order.astype(dtype).tobytes())
+        return index
+
+    def index_bytes(self):
+        return super().index_bytes() + len(self.offsets) * self.offsets.itemsize
+
+    def scan(self, chunk=CHUNK):
+        """Find all record starts; run it as a task. Reports the fraction of
+        the file scanned and the records found, and stops when cancelled.
+        Returns the number of records."""
+        task = current_task()
+        self.scanning = True
+        try:
+            while self.scanned < self.size and not self._stop:
+                with self._lock:
+                    if self._map is None:
+                        break
+                    start = self.scanned
+                    data = self._map[start:start + chunk]
+                self._add_lines(data, start)
+                self.scanned = start + len(data)
+                if task is not None:
+                    task.check()
+                    task.report(self.scanned / self.size, f'{len(self):,} records')
+        finally:
+            self.scanning = False
+            self.scanned_once = True
+            self.complete = self.scanned >= self.size
+        return len(self)
+
+    def stop(self):
+        """End a running scan after its current chunk; it returns normally
+        with the records found so far."""
+        self._stop = True
+
+    def close(self):
+        """Unmap and close the file; a running scan stops at its next chunk."""
+        with self._lock:
+            if isinstance(self._map, mmap.mmap):
+                self._map.close()
+            self._map = None
+            self._file.close()
+
+    # Internals
+
+    def _add_lines(self, data, base):
+        # A line starts after every newline that is not the last byte
+        if numpy is not None:
+            ends = numpy.flatnonzero(numpy.frombuffer(data, dtype=numpy.uint8) == 10)
+            starts = ends.astype(numpy.uint64) + (base + 1)
+            if len(starts) and starts[-1] >= self.size:
+                starts = starts[:-1]
+            self.offsets.frombytes(starts.tobytes())
+            return
+        find, append, last = data.find, self.offsets.append, self.size - 1
+        position = find(b'\n')
+        while position != -1:
+            if base + position < last:
+                append(base + position + 1)
+            position = find(b'\n', position + 1)
+
+    def _line_end(self, start):
+        end = self._map.find(b'\n', start)
+        return self.size if end == -1 else end
+
+    def _decode(self, start, end):
+        return self._map[start:end].rstrip(b'\r').decode(self.encoding, 'replace')
+
+    def _split(self, line):
+        if '"' not in line:
+            return line.split(self.delimiter)
+        return next(csv.reader([line], delimiter=self.delimiter), [])
@@ -1,15 +1,39 @@
 # Copyright (c) 2021 Arkadiusz Choruży
 # License: MIT
 
-import tkinter as tk
-import tkinter.tix as tx
-from PIL import Image, ImageTk
+import os
+import time
+from functools import partial
+
+import drag
+import fontset
+import hover
+import layout
+import theme
+import tooltip
+from builder import Builder, icon_keys
+from commands import CommandPalette, CommandRegistry
+from console import Console, ConsoleBuffer, ConsoleCapture
+from icons import ASSETS_DIR, IconRegistry, display_scale
+from library import libraries
+from search import ResultSource, SearchBox, SearchIndex
+from tasks import TaskExecutor
+from resize import ResizeEngine
+from views import Placeholder, ViewManager
 
 # tkinter apps needs to have a root window class
 # for root wm (window manager) methods may be used to setup app window appearance
 
+# GUI toolkit is imported on first use (see _load_toolkit), so this module
+# can be imported for colors, fonts or Hoover without starting Tk.
+tk = None
+
 version = '0.004'
 
+# Server status values (as in status.py, which is imported only when used)
+ONLINE = 'ONLINE'
+OFFLINE = 'OFFLINE'
+
 colors = {
     'bg': '#22313F',
     'working_bg': '#34495E',
@@ -23,26 +47,108 @@ colors = {
     'infobox_abg': '#2C3E50'
 }
 
+# Palettes for MainWindow.set_theme; colors above is the live one
+themes = {
+    'dark': dict(colors),
+    'light': {
+        'bg': '#DADFE1',
+        'working_bg': '#F2F1EF',
+        'menu_bg': '#E4E9ED',
+        'button_hoover': '#BDC3C7',
+        'button_activebg': '#F2F1EF',
+        'button_activefg': '#67809F',
+        'button_fg': '#1F3A93',
+        'infobox_fb': '#4B5A69',
+        'infobox_afb': '#22313F',
+        'infobox_abg': '#E4E9ED'
+    },
+    'high_contrast': {
+        'bg': '#000000',
+        'working_bg': '#000000',
+        'menu_bg': '#121212',
+        'button_hoover': '#3D3D3D',
+        'button_activebg': '#000000',
+        'button_activefg': '#FFFF00',
+        'button_fg': '#00FFFF',
+        'infobox_fb': '#FFFFFF',
+        'infobox_afb': '#FFFF00',
+        'infobox_abg': '#3D3D3D'
+    }
+}
+
+# Font roles: (family, size). Each becomes one named font (fontset.py)
 fonts = {
-    'menu_normal': ('roboto.ttf', 9),
-    'menu_medium': ('roboto.ttf', 10),
-    'menu_large': ('roboto.ttf', 12),
-    'infobox_normal': ('roboto.ttf', 8)
+    'menu_normal': ('Roboto', 9),
+    'menu_medium': ('Roboto', 10),
+    'menu_large': ('Roboto', 12),
+    'infobox_normal': ('Roboto', 8)
+}
+
+# App commands: name -> (palette title, key chords), see MainWindow.commands
+app_commands = {
+    'new_file': ('File: New File', 'Ctrl+N'),
+    'open_file': ('File: Open File...', 'Ctrl+O'),
+    'exit': ('File: Exit', 'Alt+F4'),
+    'profile_library': ('Library: Profiles', ()),
+    'material_library': ('Library: Materials', ()),
+    'entry_data': ('Go to: Entry data', ()),
+    'analysis': ('Go to: Analysis', ()),
+    'result': ('Go to: Result', ()),
+    'class_methods': ('Go to: Class methods', ()),
+    'settings': ('Go to: Settings', ()),
+    'user_options': ('Go to: User options', ()),
+    'console': ('View: Console', ()),
+    'theme_dark': ('View: Dark theme', 'Ctrl+K Ctrl+D'),
+    'theme_light': ('View: Light theme', 'Ctrl+K Ctrl+L'),
+    'theme_high_contrast': ('View: High contrast theme', 'Ctrl+K Ctrl+H'),
+    'command_palette': ('View: Command palette', 'Ctrl+Shift+P'),
+    'iconify': ('Window: Minimize', ()),
+    'maximize': ('Window: Maximize / restore', 'F11'),
+    'check_button': ('Debug: Check button', ()),
+}
+
+# App window setup - defaults for create_app()
+config = {
+    'title': 'inDust modulo',
+    'width': 800,
+    'height': 600,
+    'min_width': 400,
+    'min_height': 300,
+    'borderless': True,
+    'assets_dir': ASSETS_DIR,
+    # Icon size factor, None follows tk scaling; derived icons can be kept on disk
+    'icon_scale': None,
+    'icon_cache_dir': None,
+    # Working frame panels kept alive (views.py): panels, Tk widgets, bytes
+    'max_views': 4,
+    'view_widgets': None,
+    'view_memory': 256 * 1024 * 1024,
+    # Console panel (console.py): lines kept, logging and stdout captured
+    'console_lines': 10000,
+    'console_capture': True,
+    # Event loop monitor (monitor.py): lag and callback timing in the infobox
+    'monitor': False,
+    'monitor_dump': None,
+    # Server status indicator (status.py), 'host:port' or None
+    'status_server': None,
+    'status_interval': 5.0
 }
 
-# App window setup
-root = tx.Tk()
-root.wm_minsize(width=400, height=300)
-root.configure(bg=colors['bg'])
-root.title('inDust modulo')
-root.config(bd=2)
-root.overrideredirect(1)
-root.wm_resizable(True, True)
-root.iconbitmap('assets/favicon.ico')
 
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
-root.geometry(f'800x600+{int(screen_width/4)}+{int(screen_height/4)}')
+def _load_toolkit():
+    """Import tkinter into the module globals on first call."""
+    global tk
+    if tk is None:
+        import tkinter
+        tk = tkinter
+
+
+def _tooltips(widget):
+    """Shared tooltip manager of widget's Tk interpreter, in the app colors."""
+    return tooltip.shared(widget,
+                          bg=colors['bg'],
+                          fg=colors['infobox_fb'],
+                          font=fontset.shared(widget, fonts)['infobox_normal'])
 
 
 class Hoover:
@@ -51,645 +157,557 @@ class Hoover:
     @staticmethod
     def bg_on_mouse_enter(widget, hoover_color):
         """Cast the function using:
-        widget.bind("<Enter>", lambda x: bg_on_mouse_enter(widget, bg_color))"""
-        widget.config(bg=hoover_color)
+        widget.bind("<Enter>", lambda x: bg_on_mouse_enter(widget, bg_color))
+        Changes are coalesced per idle cycle, see hover.HoverStyles.request."""
+        hover.shared(widget).request(widget, bg=hoover_color)
 
     @staticmethod
     def bg_on_mouse_leave(widget, bg_color):
         """Cast the function using:
         widget.bind("<Leave>", lambda x: bg_on_mouse_leave(widget, bg_color))"""
-        widget.config(bg=bg_color)
+        hover.shared(widget).request(widget, bg=bg_color)
 
     @staticmethod
     def image_on_mouse_enter(widget, hoover_image):
         """Cast the function using:
         widget.bind("<Enter>", lambda x: image_on_mouse_enter(widget, image_color))"""
-        widget.config(image=hoover_image)
+        hover.shared(widget).request(widget, image=hoover_image)
 
     @staticmethod
     def image_on_mouse_leave(widget, image):
         """Cast the function using:
         widget.bind("<Leave>", lambda x: image_on_mouse_leave(widget, image_color))"""
-        widget.config(image=image)
+        hover.shared(widget).request(widget, image=image)
 
     @staticmethod
     def popup_on_mouse_enter(widget, text_str: str):
-        """Function adds pop-up tooltip message"""
-        tip = tx.Balloon(root)
-        tip.message.configure(fg=colors['infobox_fb'])
-        for sub in tip.subwidgets_all():
-            sub.configure(bg=colors['bg'])
-        tip.label.forget()
-        tip.bind_widget(widget, balloonmsg=text_str)
+        """Function adds pop-up tooltip message.
+        All tooltips share one toplevel, see tooltip.TooltipManager."""
+        _tooltips(widget).register(widget, text_str)
 
     @staticmethod
     def floating_window(root, widget):
-        """ Function alows to drag windows/widgets using mouse """
-
-        def start_move(event):
-            root.x = event.x
-            root.y = event.y
-
-        def stop_move(event):
-            root.x = None
-            root.y = None
-
-        def do_move(event):
-            dx = event.x - root.x
-            dy = event.y - root.y
-            x = root.winfo_x() + dx
-            y = root.winfo_y() + dy
-            root.geometry(f"+{x}+{y}")
-
-        widget.bind("<ButtonPress-1>", start_move)
-        widget.bind("<ButtonRelease-1>", stop_move)
-        widget.bind("<B1-Motion>", do_move)
+        """ Function alows to drag windows/widgets using mouse.
+        Motion is coalesced to one geometry update per frame, see drag.DragEngine """
+        drag.shared(root).attach(widget)
 
 
 # Application setup - inside app window
 class MainWindow:
-    def __init__(self, root):
-        # Main Frame
-        self.main_window = tk.Frame(root)
-        self.main_window.config(bg=colors['bg'])
-        self.main_window.pack(side='top', fill='both', expand=True)
-
-        # Top Bar
-        self.top_bar = tk.Frame(self.main_window)
-        self.top_bar.config(bg=colors['bg'],
-                            height=24)
-        self.top_bar.pack(side='top', fill='x', expand=False)
-
-        # Bottom Infobox Frame
-        self.infobox = tk.Frame(self.main_window)
-        self.infobox.config(bg=colors['bg'],
-                            height=16)
-        self.infobox.pack(side='bottom', fill='x', expand=False)
-
-        # Left Menu Frame
-        self.left_menu = tk.Frame(self.main_window)
-        self.left_menu.config(bg=colors['menu_bg'],
-                              width=38)
-        self.left_menu.pack(side='left', fill='y', expand=False)
-
-        # Working Frame
-        self.working = tk.Frame(self.main_window)
-        self.working.config(bg=colors['working_bg'])
-        self.working.pack(side='top', fill='both', expand=True)
-
-        # Working Top Menu Frame
-        self.working_top_menu = tk.Frame(self.working)
-        self.working_top_menu.config(bg=colors['menu_bg'],
-                                     width=38)
-        self.working_top_menu.pack(side='top', fill='x', expand=False)
-
-        # Widgets
-        self.main_frame_widgets()
-        self.top_bar_widgets()
-        self.infobox_widgets()
-        self.left_menu_widgets()
-        self.working_top_menu_widgets()
-
-    # Self methods
-
-    def main_frame_widgets(self):
-        pass
-
-    def top_bar_widgets(self):
-        # BUTTON 1 - FILE
-        button_1 = tk.Menubutton(self.top_bar)
-
-        button_1.config(bd=0,
-                        bg=colors['bg'],
-                        activebackground=colors['button_hoover'],
-                        activeforeground=colors['infobox_afb'],
-                        text='File',
-                        fg=colors['infobox_fb'],
-                        font=fonts['menu_normal'],
-                        relief='flat')
-
-        # Button 1 subbutons
-        button_1.menu = tk.Menu(button_1)
-        button_1["menu"] = button_1.menu
-        button_1.menu.configure(bg=colors['menu_bg'],
-                                bd=0,
-                                activebackground=colors['button_hoover'],
-                                activeforeground=colors['infobox_afb'],
-                                fg=colors['infobox_fb'],
-                                font=fonts['menu_normal'],
-                                relief='flat',
-                                tearoff=0)
-
-        button_1.menu.add_command(label='New File',
-                                  compound=tk.LEFT, command=check_button,
-                                  accelerator="Ctrl+N", underline=0)
-        button_1.menu.add_separator()
-        button_1.menu.add_command(label='Open File',
-                                  compound=tk.LEFT, command=check_button,
-                                  accelerator="Ctrl+O", underline=0)
-        button_1.menu.add_separator()
-        button_1.menu.add_command(label='Exit',
-                                  compound=tk.LEFT, command=check_button,
-                                  accelerator="Alt+F4", underline=0)
-
-        button_1.pack(side='left', padx=6, pady=1)
-
-        # BUTTON 2 - EDIT
-        button_2 = tk.Button(self.top_bar)
-
-        button_2.config(bd=0,
-                        bg=colors['bg'],
-                        activebackground=colors['button_hoover'],
-                        activeforeground=colors['infobox_afb'],
-                        text='Edit',
-                        fg=colors['infobox_fb'],
-                        font=fonts['menu_normal'],
-                        relief='flat',
-                        command=check_button)
-
-        # Booton 1 hoover actions
-        def event_enter_b2():
-            Hoover.bg_on_mouse_enter(button_2, colors['infobox_abg'])
-
-        def event_leave_b2():
-            Hoover.bg_on_mouse_leave(button_2, colors['bg'])
-
-        button_2.bind("<Enter>", lambda x: event_enter_b2())
-        button_2.bind("<Leave>", lambda x: event_leave_b2())
-
-        button_2.pack(side='left', padx=6, pady=1)
-
-        # BUTTON 3 - VIEW
-        button_3 = tk.Button(self.top_bar)
-
-        button_3.config(bd=0,
-                        bg=colors['bg'],
-                        activebackground=colors['button_hoover'],
-                        activeforeground=colors['infobox_afb'],
-                        text='View',
-                        fg=colors['infobox_fb'],
-                        font=fonts['menu_normal'],
-                        relief='flat',
-                        command=check_button)
-
-        # Booton 1 hoover actions
-        def event_enter_b3():
-            Hoover.bg_on_mouse_enter(button_3, colors['infobox_abg'])
-
-        def event_leave_b3():
-            Hoover.bg_on_mouse_leave(button_3, colors['bg'])
-
-        button_3.bind("<Enter>", lambda x: event_enter_b3())
-        button_3.bind("<Leave>", lambda x: event_leave_b3())
-
-        button_3.pack(side='left', padx=6, pady=1)
-
-        # BUTTON 4 - HELP
-        button_4 = tk.Button(self.top_bar)
-
-        button_4.config(bd=0,
-                        bg=colors['bg'],
-                        activebackground=colors['button_hoover'],
-                        activeforeground=colors['infobox_afb'],
-                        text='Help',
-                        fg=colors['infobox_fb'],
-                        font=fonts['menu_normal'],
-                        relief='flat',
-                        command=check_button)
-
-        # Booton 1 hoover actions
-        def event_enter_b4():
-            Hoover.bg_on_mouse_enter(button_4, colors['infobox_abg'])
-
-        def event_leave_b4():
-            Hoover.bg_on_mouse_leave(button_4, colors['bg'])
-
-        button_4.bind("<Enter>", lambda x: event_enter_b4())
-        button_4.bind("<Leave>", lambda x: event_leave_b4())
-
-        button_4.pack(side='left', padx=6, pady=1)
-
-        # BUTTON 0 - Exit
-        button_t0 = tk.Button(self.top_bar)
-
-        button_t0_load = Image.open('assets/close_50.png')
-        root.button_t0_img = ImageTk.PhotoImage(button_t0_load)
-
-        button_t0_hov_load = Image.open('assets/close_100.png')
-        root.button_t0_hov_img = ImageTk.PhotoImage(button_t0_hov_load)
-
-        button_t0.config(bd=0,
-                         bg=colors['bg'],
-                         activebackground=colors['button_hoover'],
-                         width=40,
-                         image=root.button_t0_img,
-                         relief='flat',
-                         command=tk._exit)
-
-        # Booton 0 hoover actions
-        def event_enter_bt0():
-            Hoover.bg_on_mouse_enter(button_t0, 'red')
-            Hoover.image_on_mouse_enter(button_t0, root.button_t0_hov_img)
-
-        def event_leave_bt0():
-            Hoover.bg_on_mouse_leave(button_t0, colors['bg'])
-            Hoover.image_on_mouse_leave(button_t0, root.button_t0_img)
-
-        button_t0.bind("<Enter>", lambda x: event_enter_bt0())
-        button_t0.bind("<Leave>", lambda x: event_leave_bt0())
-
-        button_t0.pack(side='right', padx=0, pady=0)
-
-        # BUTTON 00 - Maximize
-        button_t00 = tk.Button(self.top_bar)
-
-        button_t00_load = Image.open('assets/fullwin_50.png')
-        root.button_t00_img = ImageTk.PhotoImage(button_t00_load)
-
-        button_t00_hov_load = Image.open('assets/fullwin_100.png')
-        root.button_t00_hov_img = ImageTk.PhotoImage(button_t00_hov_load)
-
-        button_t00.config(bd=0,
-                          bg=colors['bg'],
-                          activebackground=colors['button_hoover'],
-                          width=40,
-                          image=root.button_t00_img,
-                          relief='flat'
-                          )
-
-        # Booton 00 hoover actions
-        def event_enter_bt00():
-            Hoover.bg_on_mouse_enter(button_t00, colors['menu_bg'])
-            Hoover.image_on_mouse_enter(button_t00, root.button_t00_hov_img)
-
-        def event_leave_bt00():
-            Hoover.bg_on_mouse_leave(button_t00, colors['bg'])
-            Hoover.image_on_mouse_leave(button_t00, root.button_t00_img)
-
-        button_t00.bind("<Enter>", lambda x: event_enter_bt00())
-        # button_t00.bind("<Clicked>", button_t00.config(
-        #     command=root.geometry(f'{screen_width}x{screen_height}+0+0')))
-        button_t00.bind("<Leave>", lambda x: event_leave_bt00())
-
-        button_t00.pack(side='right', padx=0, pady=0)
-
-        # BUTTON 000 - Minimize
-        button_t000 = tk.Button(self.top_bar)
-
-        button_t000_load = Image.open('assets/minimize_50.png')
-        root.button_t000_img = ImageTk.PhotoImage(button_t000_load)
-
-        button_t000_hov_load = Image.open('assets/minimize_100.png')
-        root.button_t000_hov_img = ImageTk.PhotoImage(button_t000_hov_load)
-
-        button_t000.config(bd=0,
-                           bg=colors['bg'],
-                           activebackground=colors['button_hoover'],
-                           width=40,
-                           image=root.button_t000_img,
-                           relief='flat',
-                           command=root.iconify)
-
-        # Booton 000 hoover actions
-        def event_enter_bt000():
-            Hoover.bg_on_mouse_enter(button_t000, colors['menu_bg'])
-            Hoover.image_on_mouse_enter(button_t000, root.button_t000_hov_img)
-
-        def event_leave_bt000():
-            Hoover.bg_on_mouse_leave(button_t000, colors['bg'])
-            Hoover.image_on_mouse_leave(button_t000, root.button_t000_img)
-
-        button_t000.bind("<Enter>", lambda x: event_enter_bt000())
-        button_t000.bind("<Leave>", lambda x: event_leave_bt000())
-
-        button_t000.pack(side='right', padx=0, pady=0)
-
-        # -----------------
-
-        # TITLE / GRAB WINDOW
-
-        title_label = tk.Label(self.top_bar)
-        title_label.config(bg=colors['bg'],
-                           text='Modulo',
-                           fg=colors['infobox_fb'],
-                           font=fonts['menu_normal'],
-                           justify='center')
-        title_label.pack(fill='x')
-
-        Hoover.floating_window(root, title_label)
-
-        # -----------------
-
-    def infobox_widgets(self):
-        # BUTTON 1 - VERSION
-        button_1 = tk.Button(self.infobox)
-
-        button_1.config(bd=0,
-                        bg=colors['bg'],
-                        activebackground=colors['button_hoover'],
-                        activeforeground=colors['infobox_afb'],
-                        text=version,
-                        fg=colors['infobox_fb'],
-                        font=fonts['infobox_normal'],
-                        relief='flat',
-                        command=check_button)
-
-        # Booton 1 hoover actions
-        button_1_tipmsg = 'Click for more information about the software.'
-        Hoover.popup_on_mouse_enter(button_1, button_1_tipmsg)
-
-        def event_enter_b1():
-            Hoover.bg_on_mouse_enter(button_1, colors['infobox_abg'])
-
-        def event_leave_b1():
-            Hoover.bg_on_mouse_leave(button_1, colors['bg'])
-
-        button_1.bind("<Enter>", lambda x: event_enter_b1())
-        button_1.bind("<Leave>", lambda x: event_leave_b1())
-
-        button_1.pack(side='left', padx=6, pady=1)
-
-        # STATUS DOT
-
-        dot_red = Image.open('assets/dot_red.png')
-        root.dot_red = ImageTk.PhotoImage(dot_red)
-
-        status_dot = tk.Label(self.infobox)
-        status_dot.config(bd=0,
-                          bg=colors['bg'],
-                          activebackground=colors['button_hoover'],
-                          activeforeground=colors['infobox_afb'],
-                          image=root.dot_red,
-                          fg=colors['infobox_fb'],
-                          font=fonts['infobox_normal']
-                          )
-
-        status_dot.pack(side='left', padx=1, pady=1)
-
-        # BUTTON 2 - STATUS
-        button_2 = tk.Button(self.infobox)
-
-        button_2.config(bd=0,
-                        bg=colors['bg'],
-                        activebackground=colors['button_hoover'],
-                        activeforeground=colors['infobox_afb'],
-                        text='OFFLINE',
-                        fg=colors['infobox_fb'],
-                        font=fonts['infobox_normal'],
-                        relief='flat',
-                        command=check_button)
-
-        # Booton 2 hoover actions
-        button_2_tipmsg = 'Connection to the server status is: ' + \
-            'OFFLINE'+'. Click for action.'
-        Hoover.popup_on_mouse_enter(button_2, button_2_tipmsg)
-
-        def event_enter_b2():
-            Hoover.bg_on_mouse_enter(button_2, colors['infobox_abg'])
-
-        def event_leave_b2():
-            Hoover.bg_on_mouse_leave(button_2, colors['bg'])
-
-        button_2.bind("<Enter>", lambda x: event_enter_b2())
-        button_2.bind("<Leave>", lambda x: event_leave_b2())
-
-        button_2.pack(side='left', padx=3, pady=1)
-
-    def left_menu_widgets(self):
-        # BUTTON 1 - ENTRY DATA
-        button_1 = tk.Button(self.left_menu)
+    """Main window built from layout.main_window in a single Builder pass."""
+
+    frames = ('main_window', 'top_bar', 'infobox', 'left_menu',
+              'working', 'working_top_menu')
+    # Working frame panels besides the libraries
+    plots = ('analysis', 'result')
+    placeholders = {'entry_data': 'Entry data', 'class_methods': 'Class methods',
+                    'settings': 'Settings', 'user_options': 'User options'}
+
+    def __init__(self, root, icons=None, spec=None, max_views=4, view_widgets=None,
+                 view_memory=256 * 1024 * 1024, console_lines=10000):
+        _load_toolkit()
+        self.root = root
+        self.icons = icons or IconRegistry()
+        self.spec = spec or layout.main_window
+
+        # Decode icons in the background while the frames are packed
+        self.icons.prefetch(icon_keys(self.spec))
+
+        self.hover = hover.shared(root)
+        # One named font per role; Ctrl +/- resizes them all
+        self.fonts = fontset.shared(root, fonts)
+        self.fonts.bind_keys(root)
+        self.fonts.listeners.append(self._refont)
+        self.tooltips = _tooltips(root)
+        # Widgets record their palette keys, so themes switch in place
+        self.theme = theme.shared(root, colors, self.hover)
+        self.theme.bind(root, {'bg': 'bg'})
+        self.theme.listeners.append(self._restyle)
+        # Commands run in the background, see tasks.py
+        self.tasks = TaskExecutor(root)
+        # Every command by name, with its key chords and palette entry
+        self.registry = CommandRegistry(root)
+        self.palette = None
+        self.builder = Builder(root, colors, self.fonts,
+                               icons=self.icons,
+                               hover=self.hover,
+                               tooltips=self.tooltips,
+                               commands=self.commands(),
+                               variables={'version': version,
+                                          'status': OFFLINE},
+                               drag=Hoover.floating_window,
+                               theme=self.theme)
+        self.widgets = self.builder.build(self.spec)
+
+        for name in self.frames:
+            setattr(self, name, self.widgets[name])
+
+        # Edge grips and maximize for the borderless window (resize.py)
+        self.resizer = ResizeEngine(root, content=self.main_window, bg=colors['bg'])
+        for grip in self.resizer.grips.values():
+            self.theme.bind(grip, {'bg': 'bg'})
+        self.widgets['title_label'].bind('<Double-Button-1>',
+                                         lambda event: self.toggle_maximize(), add='+')
+        # Maximize button (image, hover image) by maximized state, claimed once
+        button = self.widgets['maximize_button']
+        self._maximize_images = {
+            maximized: (self.icons.acquire(button, icon),
+                        self.icons.acquire(button, icon, 'hover'))
+            for maximized, icon in ((False, 'fullwin'), (True, 'togglefull'))}
+
+        self.tasks.busy_listeners.append(self.show_busy)
+        self.library = None       # name of the library shown
+        self.search_indexes = {}  # library name -> SearchIndex
+        self.data = None          # FileSource shown in the data panel
+        self._load = None         # (task, start time) of the file being loaded
+        self._loads = 0
+        self.load_status = ''     # infobox text once the load is over
+        # Log and stdout lines, kept while the console panel is closed
+        self.console = ConsoleBuffer(console_lines)
+        # Working frame panels, built on first use (views.py)
+        self.views = ViewManager(self.working, max_views=max_views,
+                                 max_widgets=view_widgets, max_bytes=view_memory)
+        for name in libraries:
+            self.views.register(name, partial(self._build_library, name))
+        for name in self.plots:
+            self.views.register(name, partial(self._build_plot, name))
+        for name, title in self.placeholders.items():
+            self.views.register(name, partial(self._build_placeholder, title))
+        self.views.register('console', self._build_console)
+        self.views.register('data', self._build_data)
+        self.widgets['task_label'].bind('<Button-1>', lambda event: self.cancel_load(),
+                                        add='+')
+        self.search = SearchBox(self.widgets['search_entry'], self.tasks,
+                                on_results=self.show_search_results,
+                                on_update=self.update_search_results)
+        self.widgets['search_entry'].bind('<FocusIn>', self._on_search_focus, add='+')
+
+    def add_widgets(self, section, widget_specs):
+        """Build extra widgets into a frame of the layout after startup."""
+        self.builder.build_section(section, widget_specs)
+        self.builder.flush()
+        return self.widgets
+
+    def set_status(self, state, detail=''):
+        """Show the server state in the infobox: dot, label and tooltip."""
+        dot = 'dot_green' if state == ONLINE else 'dot_red'
+        widget = self.widgets['status_dot']
+        widget.config(image=self.icons.acquire(widget, dot, None))
+        self.widgets['status_button'].config(text=state)
+        tip = f'Connection to the server status is: {state}. Click for action.'
+        if detail:
+            tip += f'\n{detail}'
+        self.tooltips.register(self.widgets['status_button'], tip)
+
+    def toggle_maximize(self):
+        """Maximize or restore the window and swap the maximize button icon."""
+        maximized = self.resizer.toggle_maximize()
+        image, hover_image = self._maximize_images[maximized]
+        button = self.widgets['maximize_button']
+        self.hover.set_images(button, image, hover_image)
+        # Clicked from the button the pointer is still over it; not so after
+        # a double click on the title
+        hovered = button.winfo_containing(*button.winfo_pointerxy()) is button
+        self.hover.request(button, image=hover_image if hovered else image)
+
+    def rescale_icons(self, scale=None):
+        """Redraw every icon for scale (default: the current tk scaling)."""
+        self.icons.rescale(scale or display_scale(self.root))
+
+    def show_busy(self, running):
+        """Reflect running background tasks in the infobox."""
+        if self._load is not None and self._load[0] in running:
+            return  # the loader shows its own progress
+        if not running:
+            text = self.load_status
+        elif len(running) == 1:
+            text = f'{running[0].name}...'
+        else:
+            text = f'{len(running)} tasks running...'
+        self.widgets['task_label'].config(text=text)
+
+    def show_view(self, name):
+        """Show a panel in the working frame; panels are built on first use."""
+        view = self.views.show(name)
+        if name not in libraries:
+            self.library = None
+            self.search.set_index(None)
+            return view
+
+        self.library = name
+        index = self.search_indexes.get(name)
+        if index is None:
+            # Indexed in the background; queries see the rows indexed so far
+            index = self.search_indexes[name] = SearchIndex(view.source)
+            self.tasks.submit(index.build, key=('index', name), name=f'Indexing {name}',
+                              on_done=lambda size: self.search.run())
+        self.search.set_index(index)
+        return view
+
+    def _build_library(self, name, parent):
+        from table import VirtualTable
+        # A rebuilt table reuses the indexed source and its sort indexes
+        index = self.search_indexes.get(name)
+        source = index.source if index is not None else libraries[name]()
+        return VirtualTable(parent, source, fonts=self.fonts, font_role='menu_normal',
+                            on_sort=lambda column: self.sort_library(name, column),
+                            **self._table_colors())
+
+    def _build_plot(self, name, parent):
+        import plot
+        view = plot.Plot(parent, font=self.fonts['infobox_normal'],
+                         tooltips=self.tooltips, **self._plot_colors())
+        length = 2000000 if plot.numpy is not None else 200000
+        for seed in range(2 if name == 'analysis' else 1):
+            def done(y, seed=seed):
+                if self.views.get(name) is view:
+                    view.plot(y, name=f'{name} {seed + 1}')
+            # Per view: a panel rebuilt while the old one computes gets its own task
+            self.tasks.submit(plot.sample_series, length, seed,
+                              key=(name, seed, id(view)),
+                              name=f'Computing {name}', on_done=done)
+        return view
+
+    def _build_placeholder(self, title, parent):
+        view = Placeholder(parent, title, bg=colors['working_bg'],
+                           fg=colors['infobox_fb'], font=self.fonts['menu_large'])
+        self.theme.bind(view.frame, {'bg': 'working_bg'})
+        self.theme.bind(view.label, {'bg': 'working_bg', 'fg': 'infobox_fb'})
+        return view
+
+    def _build_data(self, parent):
+        from table import ListSource, VirtualTable
+        source = self.data if self.data is not None else ListSource(('Column 1',), [])
+        return VirtualTable(parent, source, fonts=self.fonts, font_role='menu_normal',
+                            on_sort=lambda column: self.sort_library('data', column),
+                            **self._table_colors())
+
+    def new_file(self):
+        """Close the open data file and show an empty data panel."""
+        self._set_data(None)
+
+    def open_file(self, path=None):
+        """Load a delimited data file into the data panel in the background.
+
+        Records show up as they are found; the infobox shows progress and
+        throughput, and clicking it cancels the load.
+        """
+        if path is None:
+            from tkinter import filedialog
+            path = filedialog.askopenfilename(
+                parent=self.root, title='Open File',
+                filetypes=[('Data files', '*.csv *.tsv *.txt *.dat'), ('All files', '*')])
+            if not path:
+                return
+        from loader import FileSource
+        try:
+            source = FileSource(path)
+        except (OSError, ValueError) as error:
+            self.load_status = f'Cannot open {os.path.basename(path)}: {error}'
+            self.widgets['task_label'].config(text=self.load_status)
+            return
+        self._set_data(source)
+        self._loads += 1
+        task = self.tasks.submit(source.scan, key=('load', self._loads),
+                                 name=f'Loading {source.name}',
+                                 on_progress=partial(self._on_load_progress, source),
+                                 on_done=partial(self._on_load_done, source),
+                                 on_error=partial(self._on_load_error, source))
+        self._load = (task, time.perf_counter())
+        self.tooltips.register(self.widgets['task_label'], 'Click to cancel loading.')
+
+    def cancel_load(self):
+        """Stop the running load; the records found so far stay, and the
+        infobox says the file is shown in part once the scan has ended."""
+        if self._load is None:
+            return
+        self.data.stop()
+        self.widgets['task_label'].config(text=f'{self.data.name}: stopping...')
+
+    def _set_data(self, source):
+        if self._load is not None:
+            self._load[0].cancel()
+            self._finish_load('')
+        old, self.data = self.data, source
+        view = self.views.get('data')
+        if view is None:
+            self.show_view('data')
+        else:
+            from table import ListSource
+            view.set_source(source if source is not None else ListSource(('Column 1',), []))
+            self.show_view('data')
+        if old is not None:
+            # Sorts of the old file stop before its map goes away
+            for key in list(self.tasks.active):
+                if isinstance(key, tuple) and key[0] is old:
+                    self.tasks.cancel(key)
+            old.close()
+
+    def _on_load_progress(self, source, progress, message):
+        if source is not self.data:
+            return
+        elapsed = max(1e-6, time.perf_counter() - self._load[1])
+        speed = progress * source.size / elapsed / 2 ** 20
+        self.widgets['task_label'].config(
+            text=f'{source.name}  {progress:.0%}  {message}  {speed:.0f} MB/s')
+        view = self.views.get('data')
+        if view is not None and view.source is source:
+            view.refresh()
+
+    def _on_load_done(self, source, count):
+        if source is not self.data:
+            return
+        view = self.views.get('data')
+        if view is not None and view.source is source:
+            view.refresh()
+        elapsed = time.perf_counter() - self._load[1]
+        if source.complete:
+            self._finish_load(f'{source.name}: {count:,} records in {elapsed:.1f} s')
+        else:
+            self._finish_load(f'{source.name}: stopped, partial - {count:,} records, '
+                              f'{source.scanned / source.size:.0%} of the file')
+
+    def _on_load_error(self, source, error):
+        if source is self.data:
+            self._finish_load(f'{source.name}: {error}')
+
+    def _finish_load(self, text):
+        self._load = None
+        self.load_status = text
+        self.tooltips.unregister(self.widgets['task_label'])
+        self.widgets['task_label'].config(text=text)
+
+    def _build_console(self, parent):
+        return Console(parent, self.console, font=self.fonts['infobox_normal'],
+                       **self._console_colors())
+
+    def set_theme(self, name):
+        """Switch to one of themes without rebuilding any widget."""
+        self.theme.apply(themes[name])
 
-        button_1_load = Image.open('assets/check_50.png')
-        root.button_1_img = ImageTk.PhotoImage(button_1_load)
-
-        button_1_hov_load = Image.open('assets/check_100.png')
-        root.button_1_hov_img = ImageTk.PhotoImage(button_1_hov_load)
-
-        button_1.config(bd=0,
-                        bg=colors['menu_bg'],
-                        activebackground=colors['button_activebg'],
-                        image=root.button_1_img,
-                        relief='flat',
-                        command=check_button)
-
-        # Button 1 hoover actions
-        button_1_tipmsg = 'Entry data'
-        Hoover.popup_on_mouse_enter(button_1, button_1_tipmsg)
-
-        def event_enter_b1():
-            Hoover.image_on_mouse_enter(button_1, root.button_1_hov_img)
-
-        def event_leave_b1():
-            Hoover.image_on_mouse_leave(button_1, root.button_1_img)
-
-        button_1.bind("<Enter>", lambda x: event_enter_b1())
-        button_1.bind("<Leave>", lambda x: event_leave_b1())
-
-        button_1.pack(side='top', pady=4, padx=4)
-
-        # BUTTON 2 - ANALYSIS
-        button_2 = tk.Button(self.left_menu)
-
-        button_2_load = Image.open('assets/result_50.png')
-        root.button_2_img = ImageTk.PhotoImage(button_2_load)
-
-        button_2_hov_load = Image.open('assets/result_100.png')
-        root.button_2_hov_img = ImageTk.PhotoImage(button_2_hov_load)
-
-        button_2.config(bd=0,
-                        bg=colors['menu_bg'],
-                        activebackground=colors['button_activebg'],
-                        image=root.button_2_img,
-                        relief='flat',
-                        command=check_button)
-
-        # Button 2 hoover actions
-        button_2_tipmsg = 'Analysis'
-        Hoover.popup_on_mouse_enter(button_2, button_2_tipmsg)
-
-        def event_enter_b2():
-            Hoover.image_on_mouse_enter(button_2, root.button_2_hov_img)
-
-        def event_leave_b2():
-            Hoover.image_on_mouse_leave(button_2, root.button_2_img)
-
-        button_2.bind("<Enter>", lambda x: event_enter_b2())
-        button_2.bind("<Leave>", lambda x: event_leave_b2())
-
-        button_2.pack(side='top', pady=4, padx=4)
-
-        # BUTTON 3 - GRAPH
-        button_3 = tk.Button(self.left_menu)
-
-        button_3_load = Image.open('assets/graph_50.png')
-        root.button_3_img = ImageTk.PhotoImage(button_3_load)
-
-        button_3_hov_load = Image.open('assets/graph_100.png')
-        root.button_3_hov_img = ImageTk.PhotoImage(button_3_hov_load)
-
-        button_3.config(bd=0,
-                        bg=colors['menu_bg'],
-                        activebackground=colors['button_activebg'],
-                        image=root.button_3_img,
-                        relief='flat',
-                        command=check_button)
-
-        # Button 3 hoover actions
-        button_3_tipmsg = 'Result'
-        Hoover.popup_on_mouse_enter(button_3, button_3_tipmsg)
-
-        def event_enter_b3():
-            Hoover.image_on_mouse_enter(button_3, root.button_3_hov_img)
-
-        def event_leave_b3():
-            Hoover.image_on_mouse_leave(button_3, root.button_3_img)
-
-        button_3.bind("<Enter>", lambda x: event_enter_b3())
-        button_3.bind("<Leave>", lambda x: event_leave_b3())
-
-        button_3.pack(side='top', pady=4, padx=4)
-
-        # BUTTON 4 - SHIP
-        button_4 = tk.Button(self.left_menu)
-
-        button_4_load = Image.open('assets/ship_50.png')
-        root.button_4_img = ImageTk.PhotoImage(button_4_load)
-
-        button_4_hov_load = Image.open('assets/ship_100.png')
-        root.button_4_hov_img = ImageTk.PhotoImage(button_4_hov_load)
-
-        button_4.config(bd=0,
-                        bg=colors['menu_bg'],
-                        activebackground=colors['button_activebg'],
-                        image=root.button_4_img,
-                        relief='flat',
-                        command=check_button)
-
-        # Button 4 hoover actions
-        button_4_tipmsg = 'Class methods'
-        Hoover.popup_on_mouse_enter(button_4, button_4_tipmsg)
-
-        def event_enter_b4():
-            Hoover.image_on_mouse_enter(button_4, root.button_4_hov_img)
-
-        def event_leave_b4():
-            Hoover.image_on_mouse_leave(button_4, root.button_4_img)
-
-        button_4.bind("<Enter>", lambda x: event_enter_b4())
-        button_4.bind("<Leave>", lambda x: event_leave_b4())
-
-        button_4.pack(side='top', pady=4, padx=4)
-
-        # BUTTON 0 - BOTTOM OPTIONS
-        button_0 = tk.Button(self.left_menu)
-
-        button_0_load = Image.open('assets/options_50.png')
-        root.button_0_img = ImageTk.PhotoImage(button_0_load)
-
-        button_0_hov_load = Image.open('assets/options_100.png')
-        root.button_0_hov_img = ImageTk.PhotoImage(button_0_hov_load)
-
-        button_0.config(bd=0,
-                        bg=colors['menu_bg'],
-                        activebackground=colors['button_activebg'],
-                        image=root.button_0_img,
-                        relief='flat',
-                        command=check_button)
-
-        # Button 0 hoover actions
-        button_0_tipmsg = 'Settings'
-        Hoover.popup_on_mouse_enter(button_0, button_0_tipmsg)
-
-        def event_enter_b0():
-            Hoover.image_on_mouse_enter(button_0, root.button_0_hov_img)
-
-        def event_leave_b0():
-            Hoover.image_on_mouse_leave(button_0, root.button_0_img)
-
-        button_0.bind("<Enter>", lambda x: event_enter_b0())
-        button_0.bind("<Leave>", lambda x: event_leave_b0())
-
-        button_0.pack(side='bottom', pady=4, padx=4)
-
-        # BUTTON 0 - USER OPTIONS
-        button_00 = tk.Button(self.left_menu)
-
-        button_00_load = Image.open('assets/user_50.png')
-        root.button_00_img = ImageTk.PhotoImage(button_00_load)
-
-        button_00_hov_load = Image.open('assets/user_100.png')
-        root.button_00_hov_img = ImageTk.PhotoImage(button_00_hov_load)
-
-        button_00.config(bd=0,
-                         bg=colors['menu_bg'],
-                         activebackground=colors['button_activebg'],
-                         image=root.button_00_img,
-                         relief='flat',
-                         command=check_button)
-
-        # Button 00 hoover actions
-        button_00_tipmsg = 'User options'
-        Hoover.popup_on_mouse_enter(button_00, button_00_tipmsg)
-
-        def event_enter_b00():
-            Hoover.image_on_mouse_enter(button_00, root.button_00_hov_img)
-
-        def event_leave_b00():
-            Hoover.image_on_mouse_leave(button_00, root.button_00_img)
-
-        button_00.bind("<Enter>", lambda x: event_enter_b00())
-        button_00.bind("<Leave>", lambda x: event_leave_b00())
-
-        button_00.pack(side='bottom', pady=4, padx=4)
-
-    def working_top_menu_widgets(self):
-        # BUTTON 1
-        button_1 = tk.Button(self.working_top_menu)
-        button_1.config(bd=0,
-                        bg=colors['working_bg'],
-                        activebackground=colors['button_hoover'],
-                        activeforeground=colors['infobox_afb'],
-                        text='Profile library',
-                        fg=colors['infobox_fb'],
-                        font=fonts['menu_normal'],
-                        relief='flat',
-                        command=check_button)
-
-        # Booton 1 hoover actions
-        def event_enter_b1():
-            Hoover.bg_on_mouse_enter(button_1, colors['button_hoover'])
-
-        def event_leave_b1():
-            Hoover.bg_on_mouse_leave(button_1, colors['working_bg'])
-
-        button_1.bind("<Enter>", lambda x: event_enter_b1())
-        button_1.bind("<Leave>", lambda x: event_leave_b1())
-
-        button_1.pack(side='left', padx=4)
-
-        # BUTTON 2
-        button_2 = tk.Button(self.working_top_menu)
-        button_2.config(bd=0,
-                        bg=colors['working_bg'],
-                        activebackground=colors['button_hoover'],
-                        activeforeground=colors['infobox_afb'],
-                        text='Material library',
-                        fg=colors['infobox_fb'],
-                        font=fonts['menu_normal'],
-                        relief='flat',
-                        command=check_button)
-
-        # Booton 2 hoover actions
-        def event_enter_b2():
-            Hoover.bg_on_mouse_enter(button_2, colors['button_hoover'])
+    @staticmethod
+    def _table_colors():
+        return {'bg': colors['working_bg'], 'alt_bg': colors['menu_bg'],
+                'fg': colors['infobox_afb'], 'header_bg': colors['bg'],
+                'header_fg': colors['infobox_fb']}
 
-        def event_leave_b2():
-            Hoover.bg_on_mouse_leave(button_2, colors['working_bg'])
+    @staticmethod
+    def _plot_colors():
+        return {'bg': colors['working_bg'], 'fg': colors['infobox_fb'],
+                'grid': colors['menu_bg'],
+                'line_colors': (colors['button_fg'], colors['infobox_afb'])}
 
-        button_2.bind("<Enter>", lambda x: event_enter_b2())
-        button_2.bind("<Leave>", lambda x: event_leave_b2())
+    @staticmethod
+    def _console_colors():
+        return {'bg': colors['working_bg'], 'fg': colors['infobox_afb'],
+                'bar_bg': colors['menu_bg'], 'dim': colors['infobox_fb']}
+
+    def _restyle(self, palette):
+        """Theme listener for the parts that are not builder widgets."""
+        self.tooltips.configure(bg=palette['bg'], fg=palette['infobox_fb'])
+        if self.palette is not None:
+            self.palette.configure(**self._palette_colors())
+        from table import VirtualTable
+        for name, view in self.views.views.items():
+            if isinstance(view, VirtualTable):
+                view.set_colors(**self._table_colors())
+            elif name in self.plots:
+                view.set_colors(**self._plot_colors())
+            elif name == 'console':
+                view.set_colors(**self._console_colors())
+
+    def _refont(self, fonts):
+        """Font resize listener: tables lay their rows out again."""
+        from table import VirtualTable
+        for view in self.views.views.values():
+            if isinstance(view, VirtualTable):
+                view.remeasure()
+
+    def sort_library(self, name, column):
+        """Sort a library table; a missing sort index is built off the Tk thread.
+        A data file is not sortable while it is being loaded."""
+        view = self.views.get(name)
+        source = view.source
+        if not source.sortable:
+            return
+        if source.has_index(column):
+            view.sort(column)
+            return
+
+        def done(index):
+            if view.source is source:
+                view.sort(column)
+
+        self.tasks.submit(source.sort_index, column, key=(source, column),
+                          name=f'Sorting {name}', on_done=done)
+
+    def show_search_results(self, rows):
+        """Show search results in the library table, or the whole library for None."""
+        view = self.views.get(self.library)
+        if view is None:
+            return
+        library = self.search_indexes[self.library].source
+        if rows is not None:
+            view.set_source(ResultSource(library, rows))
+        elif view.source is not library:
+            view.set_source(library)
+
+    def update_search_results(self, count):
+        view = self.views.get(self.library)
+        if view is not None:
+            view.refresh()
+
+    def _on_search_focus(self, event):
+        if self.library is None:
+            self.show_view('profiles')
+
+    def commands(self):
+        """Register the app commands (see app_commands) and return them
+        by name for the layout spec."""
+        show = self.show_view
+        funcs = {
+            'new_file': self.new_file,
+            'open_file': lambda: self.open_file(),
+            'exit': tk._exit,
+            'profile_library': lambda: show('profiles'),
+            'material_library': lambda: show('materials'),
+            'entry_data': lambda: show('entry_data'),
+            'analysis': lambda: show('analysis'),
+            'result': lambda: show('result'),
+            'class_methods': lambda: show('class_methods'),
+            'settings': lambda: show('settings'),
+            'user_options': lambda: show('user_options'),
+            'console': lambda: show('console'),
+            'theme_dark': lambda: self.set_theme('dark'),
+            'theme_light': lambda: self.set_theme('light'),
+            'theme_high_contrast': lambda: self.set_theme('high_contrast'),
+            'command_palette': self.show_palette,
+            'iconify': self.root.iconify,
+            'maximize': lambda: self.toggle_maximize(),
+            'check_button': self.tasks.command(check_button),
+        }
+        for name, (title, keys) in app_commands.items():
+            self.registry.add(name, title, funcs[name], keys)
+        return self.registry.callables()
+
+    def show_palette(self):
+        """Open the command palette (commands.py)."""
+        if self.palette is None:
+            self.palette = CommandPalette(self.root, self.registry,
+                                          font=self.fonts['menu_normal'],
+                                          **self._palette_colors())
+        self.palette.show()
 
-        button_2.pack(side='left', padx=4)
+    @staticmethod
+    def _palette_colors():
+        return {'bg': colors['menu_bg'], 'fg': colors['infobox_afb'],
+                'select_bg': colors['button_hoover']}
+
+
+class App:
+    """Running application: the Tk root window and everything built on it.
+
+    timings holds the seconds spent in each create_app phase; per section
+    build times are in window.builder.timings.
+    """
+
+    def __init__(self, root, window, icons, timings=None, monitor=None,
+                 monitor_dump=None, bridge=None, status=None, capture=None):
+        self.root = root
+        self.window = window
+        self.icons = icons
+        self.timings = timings or {}
+        self.monitor = monitor
+        self.monitor_dump = monitor_dump
+        self.bridge = bridge
+        self.status = status
+        self.capture = capture
+
+    def run(self):
+        try:
+            self.root.mainloop()
+        finally:
+            self.window.tasks.shutdown()
+            if self.status is not None:
+                self.status.stop()
+            if self.bridge is not None:
+                self.bridge.stop()
+            if self.monitor is not None and self.monitor_dump:
+                self.monitor.dump(self.monitor_dump)
+            if self.capture is not None:
+                self.capture.stop()
+
+
+def create_app(app_config=None):
+    """Create the Tk root window, load assets and build MainWindow.
+
+    Nothing GUI related is imported or created before this is called.
+    app_config overrides keys of the module level config.
+    """
+    conf = dict(config, **(app_config or {}))
+    timings = {}
+    start = time.perf_counter()
+    _load_toolkit()
+    timings['toolkit_import'] = time.perf_counter() - start
+
+    if conf['monitor']:
+        # Before any callback is registered, so all of them can be profiled
+        import monitor
+        monitor.install()
+
+    start = time.perf_counter()
+    root = tk.Tk()
+    root.wm_minsize(width=conf['min_width'], height=conf['min_height'])
+    root.configure(bg=colors['bg'])
+    root.title(conf['title'])
+    root.config(bd=2)
+    root.overrideredirect(conf['borderless'])
+    root.wm_resizable(True, True)
+    # .ico files are only understood by the Windows window manager
+    if root._windowingsystem == 'win32':
+        root.iconbitmap(os.path.join(conf['assets_dir'], 'favicon.ico'))
+
+    screen_width = root.winfo_screenwidth()
+    screen_height = root.winfo_screenheight()
+    root.geometry(f"{conf['width']}x{conf['height']}"
+                  f"+{int(screen_width/4)}+{int(screen_height/4)}")
+    timings['tk_init'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    icons = IconRegistry(conf['assets_dir'],
+                         scale=conf['icon_scale'] or display_scale(root),
+                         cache_dir=conf['icon_cache_dir'])
+    window = MainWindow(root, icons, max_views=conf['max_views'],
+                        view_widgets=conf['view_widgets'],
+                        view_memory=conf['view_memory'],
+                        console_lines=conf['console_lines'])
+    timings['build'] = time.perf_counter() - start
+
+    capture = None
+    if conf['console_capture']:
+        capture = ConsoleCapture(window.console)
+        capture.start()
+
+    loop_monitor = None
+    if conf['monitor']:
+        loop_monitor = monitor.Monitor(root)
+        loop_monitor.start()
+        widgets = window.add_widgets('infobox', [
+            {'name': 'monitor_label', 'style': 'infobox_label'}])
+        loop_monitor.show_in(widgets['monitor_label'])
+
+    bridge = status = None
+    if conf['status_server']:
+        from aiobridge import AsyncBridge
+        from status import StatusService
+        host, port = conf['status_server'].rsplit(':', 1)
+        bridge = AsyncBridge(root)
+        bridge.start()
+        status = StatusService(bridge, host, int(port), window.set_status,
+                               interval=conf['status_interval'])
+        status.start()
+    return App(root, window, icons, timings, loop_monitor, conf['monitor_dump'],
+               bridge, status, capture)
 
 
 # Functions
@@ -699,5 +717,4 @@ def check_button():
 
 # Runtime
 if __name__ == '__main__':
-    main_frame = MainWindow(root)
-    root.mainloop()
+    create_app().run()
@@ -0,0 +1,214 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Opt-in event loop instrumentation.
+#
+# - heartbeat: an after() timer measures how late the loop runs it (loop lag)
+# - profiling: every Python callback Tk calls (bindings, commands, after
+#   jobs) goes through tkinter.CallWrapper. install() routes it through
+#   this module, so callbacks are counted and timed while a monitor runs.
+#   tkinter keeps the bound __call__ of each registered wrapper, so call
+#   install() before widgets are created; create_app does
+# - slow log: a watchdog thread grabs the main thread stack once a callback
+#   has run longer than the threshold, so the log shows where it was stuck
+
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+_original_call = None  # CallWrapper.__call__ replaced by install()
+_running = None        # the started Monitor, if any
+
+
+def unwrap(func):
+    """The user callback behind tkinter's after() helper closure."""
+    code = getattr(func, '__code__', None)
+    if code is not None and code.co_name == 'callit' and 'func' in code.co_freevars:
+        return func.__closure__[code.co_freevars.index('func')].cell_contents
+    return func
+
+
+def callback_name(func):
+    func = unwrap(func)
+    name = getattr(func, '__qualname__', None) or repr(func)
+    module = getattr(func, '__module__', None)
+    return f'{module}.{name}' if module else name
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def install():
+    """Route Tk callbacks through the running Monitor from now on.
+
+    Callbacks registered after this are profiled whenever a monitor runs,
+    including ones registered before Monitor.start(); when none runs they
+    cost one extra function call.
+    """
+    global _original_call
+    import tkinter
+    if _original_call is not None:
+        return
+    original = _original_call = tkinter.CallWrapper.__call__
+
+    def dispatch(wrapper, *args):
+        monitor = _running
+        if monitor is None or getattr(unwrap(wrapper.func), '__self__', None) is monitor:
+            return original(wrapper, *args)
+        return monitor._profile(wrapper, original, args)
+
+    tkinter.CallWrapper.__call__ = dispatch
+
+
+def uninstall():
+    """Undo install(); wrappers registered meanwhile stop being profiled."""
+    global _original_call
+    import tkinter
+    if _original_call is not None:
+        tkinter.CallWrapper.__call__ = _original_call
+        _original_call = None
+
+
+class Monitor:
+    """Event loop lag, per callback timing and slow callback log."""
+
+    def __init__(self, root, interval=100, slow_threshold=0.1,
+                 samples=1000, slow_log_size=100):
+        self.root = root
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.lag = deque(maxlen=samples)        # seconds
+        self.calls = {}                          # name -> [count, total, max]
+        self.slow = deque(maxlen=slow_log_size)  # dicts, newest last
+        self.running = False
+        self._beat_id = None
+        self._expected = 0.0
+        self._active = []        # [name, start, stack] of callbacks in progress
+        self._main_ident = threading.get_ident()
+        self._watchdog = None
+        self._label = None
+        self._label_every = 1000
+        self._label_id = None
+
+    def start(self):
+        global _running
+        if self.running:
+            return
+        if _running is not None:
+            raise RuntimeError('another Monitor is running')
+        install()
+        self.running = True
+        _running = self
+        self._main_ident = threading.get_ident()
+        self._schedule_beat()
+        self._watchdog = threading.Thread(target=self._watch, name='loop-watchdog',
+                                          daemon=True)
+        self._watchdog.start()
+        if self._label is not None:
+            self._refresh_label()
+
+    def stop(self):
+        global _running
+        if not self.running:
+            return
+        self.running = False
+        _running = None
+        uninstall()
+        if self._beat_id is not None:
+            self.root.after_cancel(self._beat_id)
+            self._beat_id = None
+        if self._label_id is not None:
+            self.root.after_cancel(self._label_id)
+            self._label_id = None
+
+    def lag_percentiles(self):
+        """Loop lag in milliseconds: p50, p90, p99 and max."""
+        values = sorted(self.lag)
+        return {'p50': percentile(values, 0.5) * 1000,
+                'p90': percentile(values, 0.9) * 1000,
+                'p99': percentile(values, 0.99) * 1000,
+                'max': (values[-1] if values else 0.0) * 1000}
+
+    def callbacks(self):
+        """Callback stats sorted by total time, most expensive first."""
+        rows = [{'name': name, 'count': count, 'total_ms': total * 1000,
+                 'max_ms': worst * 1000}
+                for name, (count, total, worst) in self.calls.items()]
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def summary(self):
+        lag = self.lag_percentiles()
+        return (f"lag p50 {lag['p50']:.1f} ms  p99 {lag['p99']:.1f} ms  "
+                f"slow {len(self.slow)}")
+
+    def show_in(self, label, every=1000):
+        """Keep label text updated with summary() every `every` ms while running."""
+        if self._label_id is not None:
+            self.root.after_cancel(self._label_id)
+            self._label_id = None
+        self._label = label
+        self._label_every = every
+        self._refresh_label()
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'lag_ms': self.lag_percentiles(),
+                       'callbacks': self.callbacks(),
+                       'slow': list(self.slow)}, f, indent=2)
+
+    # Internals
+
+    def _profile(self, wrapper, original, args):
+        entry = [callback_name(wrapper.func), time.perf_counter(), None]
+        self._active.append(entry)
+        try:
+            return original(wrapper, *args)
+        finally:
+            self._active.pop()
+            name, start, stack = entry
+            elapsed = time.perf_counter() - start
+            stats = self.calls.get(name)
+            if stats is None:
+                stats = self.calls[name] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+            if elapsed >= self.slow_threshold:
+                self.slow.append({'name': name, 'ms': elapsed * 1000,
+                                  'time': time.time(), 'stack': stack})
+
+    def _watch(self):
+        while self.running:
+            time.sleep(self.slow_threshold / 2)
+            try:
+                entry = self._active[0]
+            except IndexError:
+                continue
+            if entry[2] is None and time.perf_counter() - entry[1] >= self.slow_threshold:
+                frame = sys._current_frames().get(self._main_ident)
+                if frame is not None:
+                    entry[2] = traceback.format_stack(frame)
+
+    def _schedule_beat(self):
+        self._expected = time.perf_counter() + self.interval / 1000
+        self._beat_id = self.root.after(self.interval, self._beat)
+
+    def _beat(self):
+        self.lag.append(max(0.0, time.perf_counter() - self._expected))
+        if self.running:
+            self._schedule_beat()
+
+    def _refresh_label(self):
+        self._label_id = None
+        if self._label is None or not self._label.winfo_exists():
+            return
+        self._label.config(text=self.summary())
+        if self.running:
+            self._label_id = self.root.after(self._label_every, self._refresh_label)
@@ -0,0 +1,380 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Line plot on a tk.Canvas for very long series.
+#
+# Every redraw reduces the visible part of each series to a min / max pair
+# per pixel column, so the canvas never holds more than about two points
+# per pixel whatever the series length; the extremes (and so the look of
+# the line) are kept exactly. The reduction is vectorised with NumPy when it
+# is installed and falls back to plain Python otherwise. Canvas items - one
+# line per series, the grid and the tick labels - are created once and only
+# moved afterwards. Zoom (wheel) and pan (drag) redraw at most once a frame.
+
+import bisect
+import math
+
+from drag import FrameThrottle
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def minmax(x, y, x0, x1, width):
+    """Points of series (x, y) within [x0, x1] reduced to a min / max pair
+    per pixel column of a plot width pixels wide.
+
+    x must be ascending. Returns (xs, ys) with one point of margin on both
+    sides so the line runs to the plot edges.
+    """
+    if numpy is not None and isinstance(x, numpy.ndarray):
+        return _minmax_numpy(x, y, x0, x1, width)
+    return _minmax_python(x, y, x0, x1, width)
+
+
+def _first_at_or_after(x, values):
+    """numpy.searchsorted(x, values) without converting all of an integer x
+    to float, which would cost a pass over the whole series."""
+    values = numpy.asarray(values)
+    if x.dtype.kind in 'iu':
+        values = numpy.ceil(values).astype(x.dtype)
+    return numpy.searchsorted(x, values)
+
+
+def _minmax_numpy(x, y, x0, x1, width):
+    start = max(0, int(_first_at_or_after(x, x0)) - 1)
+    stop = min(len(x), int(_first_at_or_after(x, x1)) + 1)
+    x, y = x[start:stop], y[start:stop]
+    if len(x) <= 2 * width:
+        return x, y
+    # First point of every pixel column, found by binary search on the
+    # column edges instead of computing a column for every point
+    edges = x0 + (x1 - x0) / width * numpy.arange(width)
+    starts = _first_at_or_after(x, edges)
+    starts[0] = 0
+    starts = starts[starts < len(x)]
+    starts = starts[numpy.concatenate(([True], numpy.diff(starts) > 0))]
+    low = numpy.minimum.reduceat(y, starts)
+    high = numpy.maximum.reduceat(y, starts)
+    xs = numpy.repeat(x[starts], 2)
+    xs[-1] = x[-1]  # run the line to the last point
+    ys = numpy.empty(2 * len(starts), dtype=low.dtype)
+    ys[0::2] = low
+    ys[1::2] = high
+    return xs, ys
+
+
+def _minmax_python(x, y, x0, x1, width):
+    start = max(0, bisect.bisect_left(x, x0) - 1)
+    stop = min(len(x), bisect.bisect_right(x, x1) + 1)
+    if stop - start <= 2 * width:
+        return list(x[start:stop]), list(y[start:stop])
+    scale = width / (x1 - x0)
+    xs, ys = [], []
+    current = None
+    for i in range(start, stop):
+        column = int((x[i] - x0) * scale)
+        value = y[i]
+        if column != current:
+            current = column
+            xs += (x[i], x[i])
+            ys += (value, value)
+        elif value < ys[-2]:
+            ys[-2] = value
+        elif value > ys[-1]:
+            ys[-1] = value
+    return xs, ys
+
+
+def nice_ticks(low, high, count=6):
+    """Round tick values (1, 2, 5 x 10^n steps) covering [low, high]."""
+    if high <= low:
+        return [low]
+    raw = (high - low) / max(1, count)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    first = math.ceil(low / step)
+    return [i * step for i in range(first, int(math.floor(high / step)) + 1)]
+
+
+def tick_label(value):
+    return f'{value:.6g}'
+
+
+class Plot:
+    """Zoomable line plot of one or more long series."""
+
+    def __init__(self, parent, bg='#34495E', fg='#95A5A6', grid='#2C3E50',
+                 line_colors=('#19B5FE', '#DADFE1', '#67809F'), font=None,
+                 tooltips=None, margin=(56, 10, 12, 22)):
+        import tkinter as tk
+
+        self.colors = {'bg': bg, 'fg': fg, 'grid': grid}
+        self.line_colors = line_colors
+        self.font = font
+        self.tooltips = tooltips
+        self.margin = margin  # left, top, right, bottom in pixels
+        self.series = []      # [name, x, y, line item]
+        self.view = None      # visible (x0, x1), None for all data
+        self.y_range = (0.0, 1.0)
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.canvas = tk.Canvas(self.frame, bg=bg, highlightthickness=0, bd=0)
+        self.canvas.pack(fill='both', expand=True)
+        self._ticks = {'x': [], 'y': []}  # pools of (grid line, label) items
+        # Bands over the left / right margins hide line ends outside the plot
+        self._covers = [self.canvas.create_rectangle(0, 0, 0, 0, fill=bg, width=0,
+                                                     tags='cover')
+                        for side in ('left', 'right')]
+        self._marker = self.canvas.create_oval(0, 0, 0, 0, outline=fg,
+                                               state='hidden', tags='marker')
+        self._drag_from = None
+        self._throttle = FrameThrottle(self.canvas, self.redraw)
+        self._pointer = FrameThrottle(self.canvas, self._show_value)
+
+        self.canvas.bind('<Configure>', lambda event: self._throttle.submit())
+        self.canvas.bind('<MouseWheel>', self._on_wheel)
+        self.canvas.bind('<Button-4>', lambda event: self.zoom(1 / 1.25, event.x))
+        self.canvas.bind('<Button-5>', lambda event: self.zoom(1.25, event.x))
+        self.canvas.bind('<ButtonPress-1>', self._on_press)
+        self.canvas.bind('<B1-Motion>', self._on_drag)
+        self.canvas.bind('<Double-Button-1>', lambda event: self.reset_view())
+        self.canvas.bind('<Motion>', lambda event: self._pointer.submit(event))
+        self.canvas.bind('<Leave>', self._on_leave)
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def plot(self, y, x=None, name=''):
+        """Add a series; x defaults to 0, 1, 2, ... and must be ascending."""
+        if x is None:
+            x = numpy.arange(len(y)) if numpy is not None else range(len(y))
+        if numpy is not None:
+            x, y = numpy.asarray(x), numpy.asarray(y)
+        color = self.line_colors[len(self.series) % len(self.line_colors)]
+        item = self.canvas.create_line(0, 0, 0, 0, fill=color, tags='series')
+        self.canvas.tag_lower(item, self._covers[0])
+        self.series.append([name, x, y, item])
+        self._throttle.submit()
+
+    # View manager hooks (views.py)
+
+    def activate(self):
+        self._throttle.submit()
+
+    def deactivate(self):
+        self._throttle.cancel()
+        self._on_leave(None)
+
+    def destroy(self):
+        self.deactivate()
+        self.series = []
+
+    def memory(self):
+        """Bytes held by the series data."""
+        total = 0
+        for name, x, y, item in self.series:
+            for values in (x, y):
+                if hasattr(values, 'nbytes'):
+                    total += values.nbytes
+                elif isinstance(values, list):
+                    total += 32 * len(values)  # pointer and float object
+        return total
+
+    def set_colors(self, bg=None, fg=None, grid=None, line_colors=None):
+        """Restyle in place."""
+        self.colors.update({key: value for key, value in
+                            (('bg', bg), ('fg', fg), ('grid', grid)) if value})
+        if line_colors:
+            self.line_colors = line_colors
+        self.frame.config(bg=self.colors['bg'])
+        self.canvas.config(bg=self.colors['bg'])
+        self.canvas.itemconfigure('cover', fill=self.colors['bg'])
+        self.canvas.itemconfigure('grid', fill=self.colors['grid'])
+        self.canvas.itemconfigure('label', fill=self.colors['fg'])
+        self.canvas.itemconfigure(self._marker, outline=self.colors['fg'])
+        for number, (name, x, y, item) in enumerate(self.series):
+            self.canvas.itemconfigure(item, fill=self.line_colors[number % len(self.line_colors)])
+
+    def clear(self):
+        for name, x, y, item in self.series:
+            self.canvas.delete(item)
+        self.series = []
+        self.view = None
+        self._throttle.submit()
+
+    def data_range(self):
+        if not self.series:
+            return 0.0, 1.0
+        return (min(s[1][0] for s in self.series if len(s[1])),
+                max(s[1][-1] for s in self.series if len(s[1])))
+
+    def set_view(self, x0, x1):
+        low, high = self.data_range()
+        span = min(x1 - x0, high - low)
+        x0 = max(low, min(x0, high - span))
+        self.view = (x0, x0 + span)
+        self._throttle.submit()
+
+    def reset_view(self):
+        self.view = None
+        self._throttle.submit()
+
+    def zoom(self, factor, px):
+        """Scale the visible x span by factor, keeping pixel px in place."""
+        x0, x1 = self.view or self.data_range()
+        at = self._to_x(px)
+        self.set_view(at - (at - x0) * factor, at + (x1 - at) * factor)
+
+    def redraw(self):
+        """Re-decimate every series for the current view and size."""
+        left, top, right, bottom = self._plot_area()
+        width = max(1, right - left)
+        x0, x1 = self.view or self.data_range()
+        if x1 <= x0:
+            x1 = x0 + 1
+
+        reduced = []
+        y_low, y_high = math.inf, -math.inf
+        for name, x, y, item in self.series:
+            xs, ys = minmax(x, y, x0, x1, width)
+            if len(ys):
+                y_low, y_high = min(y_low, float(min(ys))), max(y_high, float(max(ys)))
+            reduced.append((item, xs, ys))
+        if y_low > y_high:
+            y_low, y_high = 0.0, 1.0
+        elif y_low == y_high:
+            y_low, y_high = y_low - 1, y_high + 1
+        self.y_range = (y_low, y_high)
+
+        sx = width / (x1 - x0)
+        sy = (bottom - top) / (y_high - y_low)
+        for item, xs, ys in reduced:
+            if len(xs) < 2:
+                self.canvas.coords(item, 0, 0, 0, 0)
+                continue
+            if numpy is not None and isinstance(xs, numpy.ndarray):
+                points = numpy.empty(2 * len(xs))
+                points[0::2] = left + (xs - x0) * sx
+                points[1::2] = bottom - (ys - y_low) * sy
+                points = points.tolist()
+            else:
+                points = []
+                for px, py in zip(xs, ys):
+                    points += (left + (px - x0) * sx, bottom - (py - y_low) * sy)
+            self.canvas.coords(item, points)
+        self._draw_axes(x0, x1, left, top, right, bottom)
+
+    # Internals
+
+    def _plot_area(self):
+        margin_left, margin_top, margin_right, margin_bottom = self.margin
+        return (margin_left, margin_top,
+                self.canvas.winfo_width() - margin_right,
+                self.canvas.winfo_height() - margin_bottom)
+
+    def _to_x(self, px):
+        left, top, right, bottom = self._plot_area()
+        x0, x1 = self.view or self.data_range()
+        return x0 + (px - left) * (x1 - x0) / max(1, right - left)
+
+    def _tick_items(self, axis, count):
+        pool = self._ticks[axis]
+        while len(pool) < count:
+            line = self.canvas.create_line(0, 0, 0, 0, fill=self.colors['grid'], tags='grid')
+            label = self.canvas.create_text(0, 0, fill=self.colors['fg'], font=self.font,
+                                            anchor='n' if axis == 'x' else 'e', tags='label')
+            self.canvas.tag_lower(line)
+            pool.append((line, label))
+        for line, label in pool[count:]:
+            self.canvas.itemconfigure(line, state='hidden')
+            self.canvas.itemconfigure(label, state='hidden')
+        return pool[:count]
+
+    def _draw_axes(self, x0, x1, left, top, right, bottom):
+        y_low, y_high = self.y_range
+        height = self.canvas.winfo_height()
+        self.canvas.coords(self._covers[0], 0, 0, left, height)
+        self.canvas.coords(self._covers[1], right, 0, self.canvas.winfo_width(), height)
+        values = nice_ticks(x0, x1, max(2, (right - left) // 90))
+        for value, (line, label) in zip(values, self._tick_items('x', len(values))):
+            px = left + (value - x0) * (right - left) / (x1 - x0)
+            self.canvas.coords(line, px, top, px, bottom)
+            self.canvas.coords(label, px, bottom + 3)
+            self.canvas.itemconfigure(line, state='normal')
+            self.canvas.itemconfigure(label, state='normal', text=tick_label(value))
+        values = nice_ticks(y_low, y_high, max(2, (bottom - top) // 40))
+        for value, (line, label) in zip(values, self._tick_items('y', len(values))):
+            py = bottom - (value - y_low) * (bottom - top) / (y_high - y_low)
+            self.canvas.coords(line, left, py, right, py)
+            self.canvas.coords(label, left - 4, py)
+            self.canvas.itemconfigure(line, state='normal')
+            self.canvas.itemconfigure(label, state='normal', text=tick_label(value))
+
+    def _nearest(self, x, at):
+        if numpy is not None and isinstance(x, numpy.ndarray):
+            i = int(numpy.searchsorted(x, at))
+        else:
+            i = bisect.bisect_left(x, at)
+        if i > 0 and (i == len(x) or at - x[i - 1] < x[i] - at):
+            i -= 1
+        return i
+
+    def _show_value(self, event):
+        """Mark the nearest point of each series and show the values in a tooltip."""
+        if not self.series:
+            return
+        left, top, right, bottom = self._plot_area()
+        if not left <= event.x <= right:
+            self._on_leave(event)
+            return
+        at = self._to_x(event.x)
+        lines = []
+        for number, (name, x, y, item) in enumerate(self.series):
+            if not len(x):
+                continue
+            i = self._nearest(x, at)
+            lines.append(f'{name or "series"}: x={tick_label(x[i])}  y={tick_label(y[i])}')
+            if number == 0:
+                y_low, y_high = self.y_range
+                x0, x1 = self.view or self.data_range()
+                px = left + (x[i] - x0) * (right - left) / (x1 - x0)
+                py = bottom - (y[i] - y_low) * (bottom - top) / (y_high - y_low)
+                self.canvas.coords(self._marker, px - 3, py - 3, px + 3, py + 3)
+                self.canvas.itemconfigure(self._marker, state='normal')
+        if self.tooltips is not None and lines:
+            self.tooltips.show_text('\n'.join(lines), event.x_root, event.y_root)
+
+    def _on_leave(self, event):
+        self._pointer.cancel()
+        self.canvas.itemconfigure(self._marker, state='hidden')
+        if self.tooltips is not None:
+            self.tooltips.hide()
+
+    def _on_wheel(self, event):
+        self.zoom(1 / 1.25 if event.delta > 0 else 1.25, event.x)
+
+    def _on_press(self, event):
+        self._drag_from = (event.x, self.view or self.data_range())
+
+    def _on_drag(self, event):
+        if self._drag_from is None:
+            return
+        px, (x0, x1) = self._drag_from
+        left, top, right, bottom = self._plot_area()
+        shift = (px - event.x) * (x1 - x0) / max(1, right - left)
+        self.set_view(x0 + shift, x1 + shift)
+
+
+def sample_series(length, seed=0):
+    """Noisy damped oscillation standing in for analysis output."""
+    if numpy is not None:
+        rng = numpy.random.default_rng(seed)
+        t = numpy.linspace(0, 100, length)
+        return numpy.exp(-t / 60) * numpy.sin(t * 2.1) + rng.normal(0, 0.08, length)
+    import random
+    rng = random.Random(seed)
+    return [math.exp(-i / length * 100 / 60) * math.sin(i / length * 210)
+            + rng.gauss(0, 0.08) for i in range(length)]
@@ -0,0 +1,161 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Resizing for windows without a window manager frame (overrideredirect).
+#
+# Thin grip frames are placed along the edges and corners of the window.
+# Dragging one changes the window geometry at most once per display frame
+# (drag.FrameThrottle). While the drag lasts the content frame is taken out
+# of pack and placed at its current size, so its children are not laid out
+# again on every step; on release it is packed back and laid out once at
+# the final size.
+
+from drag import FrameThrottle
+
+# Grip name -> (x edge, y edge) it moves: -1 left / top, 1 right / bottom
+EDGES = {
+    'n': (0, -1), 's': (0, 1), 'w': (-1, 0), 'e': (1, 0),
+    'nw': (-1, -1), 'ne': (1, -1), 'sw': (-1, 1), 'se': (1, 1)
+}
+CURSORS = {
+    'n': 'top_side', 's': 'bottom_side', 'w': 'left_side', 'e': 'right_side',
+    'nw': 'top_left_corner', 'ne': 'top_right_corner',
+    'sw': 'bottom_left_corner', 'se': 'bottom_right_corner'
+}
+
+
+class ResizeEngine:
+    """Edge and corner grips plus maximize / restore for a toplevel."""
+
+    def __init__(self, window, content=None, border=4, bg=None, fps=60):
+        import tkinter as tk
+
+        self.window = window
+        self.content = content
+        self.border = border
+        self.maximized = False
+        self.stats = {'events': 0, 'geometry': 0, 'relayouts': 0}
+        self.grips = {}
+        self._places = {}      # grip name -> place options
+        self._start = None     # (x, y, width, height, pointer x, pointer y, edges)
+        self._restore = None   # geometry before maximize
+        self._pack_info = None
+        self._throttle = FrameThrottle(window, self._resize, fps)
+
+        corner = 3 * border
+        places = {
+            'n': {'x': corner, 'y': 0, 'relwidth': 1, 'width': -2 * corner, 'height': border},
+            's': {'x': corner, 'rely': 1, 'y': -border, 'relwidth': 1, 'width': -2 * corner,
+                  'height': border},
+            'w': {'x': 0, 'y': corner, 'relheight': 1, 'height': -2 * corner, 'width': border},
+            'e': {'relx': 1, 'x': -border, 'y': corner, 'relheight': 1, 'height': -2 * corner,
+                  'width': border},
+            'nw': {'x': 0, 'y': 0},
+            'ne': {'relx': 1, 'x': -corner, 'y': 0},
+            'sw': {'x': 0, 'rely': 1, 'y': -corner},
+            'se': {'relx': 1, 'x': -corner, 'rely': 1, 'y': -corner}
+        }
+        for name, place in places.items():
+            grip = tk.Frame(window, bg=bg, cursor=CURSORS[name], bd=0,
+                            highlightthickness=0)
+            if len(name) == 2:
+                place = dict(place, width=corner, height=corner)
+            grip.place(**place)
+            self._places[name] = place
+            grip.bind('<ButtonPress-1>', lambda event, name=name: self._on_press(event, name))
+            grip.bind('<B1-Motion>', self._on_motion)
+            grip.bind('<ButtonRelease-1>', self._on_release)
+            self.grips[name] = grip
+        self.lift()
+
+    def lift(self):
+        """Keep the grips above widgets created after them."""
+        for grip in self.grips.values():
+            grip.lift()
+
+    def toggle_maximize(self):
+        """Fill the screen, or go back to the previous geometry. Returns maximized."""
+        if self.maximized:
+            self.window.geometry(self._restore)
+            self.maximized = False
+        else:
+            self._restore = self.window.geometry()
+            width = self.window.winfo_screenwidth()
+            height = self.window.winfo_screenheight()
+            self.window.geometry(f'{width}x{height}+0+0')
+            self.maximized = True
+        for name, grip in self.grips.items():
+            if self.maximized:
+                grip.place_forget()
+            else:
+                grip.place(**self._places[name])
+        self.stats['geometry'] += 1
+        return self.maximized
+
+    def reset_stats(self):
+        self.stats = {'events': 0, 'geometry': 0, 'relayouts': 0}
+
+    # Internals
+
+    def _on_press(self, event, name):
+        if self.maximized:
+            return
+        window = self.window
+        self._start = (window.winfo_x(), window.winfo_y(),
+                       window.winfo_width(), window.winfo_height(),
+                       event.x_root, event.y_root, EDGES[name])
+        self._freeze()
+
+    def _on_motion(self, event):
+        if self._start is None:
+            return
+        self.stats['events'] += 1
+        self._throttle.submit(event.x_root, event.y_root)
+
+    def _on_release(self, event):
+        if self._start is None:
+            return
+        self._throttle.flush()
+        self._start = None
+        self._thaw()
+
+    def _resize(self, x_root, y_root):
+        if self._start is None:
+            return
+        x, y, width, height, px, py, (ex, ey) = self._start
+        min_width, min_height = self.window.wm_minsize()
+        dx, dy = x_root - px, y_root - py
+        if ex > 0:
+            width = max(min_width, width + dx)
+        elif ex < 0:
+            new_width = max(min_width, width - dx)
+            x += width - new_width
+            width = new_width
+        if ey > 0:
+            height = max(min_height, height + dy)
+        elif ey < 0:
+            new_height = max(min_height, height - dy)
+            y += height - new_height
+            height = new_height
+        self.window.geometry(f'{width}x{height}+{x}+{y}')
+        self.stats['geometry'] += 1
+
+    def _freeze(self):
+        """Hold the content at its current size for the drag."""
+        if self.content is None or self.content.winfo_manager() != 'pack':
+            return
+        self._pack_info = self.content.pack_info()
+        width, height = self.content.winfo_width(), self.content.winfo_height()
+        x, y = self.content.winfo_x(), self.content.winfo_y()
+        self.content.pack_forget()
+        self.content.place(x=x, y=y, width=width, height=height)
+        self.lift()
+
+    def _thaw(self):
+        """Pack the content back: one relayout at the final size."""
+        if self._pack_info is None:
+            return
+        self.content.place_forget()
+        self.content.pack(**self._pack_info)
+        self._pack_info = None
+        self.stats['relayouts'] += 1
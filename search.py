@@ -0,0 +1,244 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Incremental search over library data.
+#
+# SearchIndex keeps an inverted index from the bigrams and trigrams of every
+# word to arrays of row numbers (4 bytes a posting). It is filled in chunks on a
+# background task, so it can answer queries over the rows indexed so far
+# while the rest is still loading. A query intersects the posting lists of
+# its grams, shortest first, and only verifies the rows that survive (a one
+# letter query verifies every row, there is nothing to narrow it by); when
+# that finds little, rows sharing most of the query's trigrams are added as
+# fuzzy matches. SearchBox wires it to an Entry: keystrokes are debounced,
+# each query runs as a task that the next keystroke cancels, and results are
+# streamed into a VirtualTable as they are found.
+
+import re
+import time
+from array import array
+from collections import Counter
+
+from table import DataSource
+from tasks import current_task
+
+_words = re.compile(r'\w+')
+
+
+def grams(text):
+    """Index keys of text: all bigrams and trigrams of each word."""
+    keys = set()
+    for word in _words.findall(text.lower()):
+        for i in range(len(word) - 1):
+            keys.add(word[i:i + 2])
+            keys.add(word[i:i + 3])
+    return keys
+
+
+def query_grams(word):
+    """Keys every row containing word has; none for a single letter."""
+    word = word.lower()
+    if len(word) < 3:
+        return {word} if len(word) == 2 else set()
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class SearchIndex:
+    """Inverted trigram index over the text columns of a DataSource."""
+
+    def __init__(self, source, columns=(0,), batch=500):
+        self.source = source
+        self.columns = columns
+        self.batch = batch
+        self.postings = {}  # gram -> array of row numbers, ascending
+        self.size = 0       # rows [0, size) are indexed
+
+    def text(self, row):
+        values = self.source.row(row)
+        return ' '.join(str(values[column]) for column in self.columns).lower()
+
+    def add_rows(self, stop):
+        """Index rows up to stop. Rows are only ever appended, so posting
+        lists stay sorted and queries may run while this is in progress."""
+        postings = self.postings
+        for row in range(self.size, stop):
+            for gram in grams(self.text(row)):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array('I')
+                posting.append(row)
+        self.size = max(self.size, stop)
+
+    def build(self, chunk=20000):
+        """Index the whole source in chunks. Run as a task it reports
+        progress and stops when cancelled."""
+        task = current_task()
+        total = len(self.source)
+        while self.size < total:
+            if task is not None:
+                task.check()
+            self.add_rows(min(total, self.size + chunk))
+            if task is not None:
+                task.report(self.size / total, f'{self.size} of {total} indexed')
+        return self.size
+
+    def search(self, query, fuzzy_min=20, check=None):
+        """Yield batches of matching row numbers: substring matches of every
+        query word in row order, then fuzzy matches best first.
+
+        check() is called between batches; it raises to abandon a stale query.
+        """
+        words = _words.findall(query.lower())
+        if not words:
+            return
+        postings = self.postings
+        keys = set().union(*(query_grams(word) for word in words))
+        lists = sorted((postings.get(key, ()) for key in keys), key=len)
+        found = 0
+        if not lists:
+            # Single letters only
+            verify = True
+            rows = iter(range(self.size))
+        elif len(lists) == 1:
+            # A single gram that equals the query word needs no verification
+            posting = lists[0]
+            verify = len(keys) != len(words) or any(len(word) > 3 for word in words)
+            rows = iter(posting[:len(posting)])
+        else:
+            verify = True
+            candidates = set(lists[0])
+            for posting in lists[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    break
+            rows = iter(sorted(candidates))
+        batch = []
+        for row in rows:
+            if verify:
+                text = self.text(row)
+                if not all(word in text for word in words):
+                    continue
+            batch.append(row)
+            if len(batch) >= self.batch:
+                if check is not None:
+                    check()
+                found += len(batch)
+                yield batch
+                batch = []
+        if batch:
+            found += len(batch)
+            yield batch
+        if found >= fuzzy_min:
+            return
+        if check is not None:
+            check()
+        yield from self._fuzzy(words, fuzzy_min - found)
+
+    def _fuzzy(self, words, limit):
+        trigrams = set().union(*(query_grams(word) for word in words if len(word) >= 3))
+        if len(trigrams) < 2:
+            return
+        hits = Counter()
+        for gram in trigrams:
+            hits.update(self.postings.get(gram, ()))
+        # A typo changes up to three trigrams of a word
+        needed = max(2, len(trigrams) - 3)
+        rows = []
+        for row, count in hits.most_common():
+            if count < needed or len(rows) >= limit:
+                break
+            text = self.text(row)
+            if not all(word in text for word in words):
+                rows.append(row)
+        if rows:
+            yield rows
+
+
+class ResultSource(DataSource):
+    """Rows of source listed in rows (grows while results stream in)."""
+
+    def __init__(self, source, rows=None):
+        super().__init__()
+        self.source = source
+        self.columns = source.columns
+        self.rows = rows if rows is not None else []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row(self, index):
+        return self.source.row(self.rows[index])
+
+
+class SearchBox:
+    """Debounced search Entry that streams results of an index.
+
+    on_results(rows) gets a new (growing) list of row numbers when a query
+    starts, or None when the query is cleared; on_update(count) is called
+    as more rows arrive, at most every `update` seconds.
+    """
+
+    def __init__(self, entry, tasks, on_results, on_update, delay=150, update=0.05):
+        self.entry = entry
+        self.tasks = tasks
+        self.on_results = on_results
+        self.on_update = on_update
+        self.delay = delay
+        self.update = update
+        self.index = None
+        self.query = ''
+        self._after_id = None
+        self._task = None
+        self._generation = 0
+        entry.bind('<KeyRelease>', self._on_key, add='+')
+        entry.bind('<Return>', lambda event: self.run(), add='+')
+
+    def set_index(self, index):
+        """Search another index, re-running the current query on it."""
+        self.index = index
+        self.run()
+
+    def run(self):
+        """Start the query in the entry now, cancelling the previous one."""
+        if self._after_id is not None:
+            self.entry.after_cancel(self._after_id)
+            self._after_id = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.query = self.entry.get().strip()
+        if not self.query or self.index is None:
+            self.on_results(None)
+            return
+        rows = []
+        self.on_results(rows)
+        # A fresh key per query: the cancelled one may still be winding down
+        self._generation += 1
+        self._task = self.tasks.submit(self._search, self.index, self.query, rows,
+                                       key=('search', self._generation),
+                                       name=f'Searching "{self.query}"',
+                                       on_progress=self._on_progress,
+                                       on_done=self.on_update)
+
+    # Internals
+
+    def _search(self, index, query, rows):
+        task = current_task()
+        last = 0.0
+        for batch in index.search(query, check=task.check):
+            rows.extend(batch)
+            now = time.monotonic()
+            if now - last >= self.update:
+                last = now
+                task.report(len(rows))
+        return len(rows)
+
+    def _on_progress(self, count, message):
+        self.on_update(count)
+
+    def _on_key(self, event):
+        if self.entry.get().strip() == self.query:
+            return  # cursor keys, modifiers
+        if self._after_id is not None:
+            self.entry.after_cancel(self._after_id)
+        self._after_id = self.entry.after(self.delay, self.run)
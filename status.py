@@ -0,0 +1,151 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+"""Server status service.
+
+Keeps one pooled connection per backend, sends a heartbeat line and waits
+for any reply line. Failures back off exponentially; unexpected errors are
+logged and count as OFFLINE too, so the service never dies silently.
+Listeners are told (on the Tk thread, through AsyncBridge) only when the
+state changes.
+
+A stand-in server for local testing:
+    python status.py --serve 127.0.0.1 8765
+"""
+import asyncio
+import logging
+import random
+import sys
+
+ONLINE = 'ONLINE'
+OFFLINE = 'OFFLINE'
+
+log = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """Open (reader, writer) pairs keyed by (host, port), used by the asyncio loop."""
+
+    def __init__(self):
+        self._connections = {}
+
+    async def acquire(self, host, port, timeout):
+        connection = self._connections.get((host, port))
+        if connection is None or connection[1].is_closing():
+            connection = await asyncio.wait_for(asyncio.open_connection(host, port),
+                                                timeout)
+            self._connections[(host, port)] = connection
+        return connection
+
+    def discard(self, host, port):
+        connection = self._connections.pop((host, port), None)
+        if connection is not None:
+            connection[1].close()
+
+    def close(self):
+        for host, port in list(self._connections):
+            self.discard(host, port)
+
+
+class StatusService:
+    """Heartbeats one backend and reports ONLINE / OFFLINE changes."""
+
+    def __init__(self, bridge, host, port, on_change, pool=None, interval=5.0,
+                 timeout=3.0, backoff=(1.0, 60.0), heartbeat=b'PING\n'):
+        self.bridge = bridge
+        self.host = host
+        self.port = port
+        self.on_change = on_change
+        self.pool = pool or ConnectionPool()
+        self.interval = interval
+        self.timeout = timeout
+        self.backoff = backoff
+        self.heartbeat = heartbeat
+        self.state = None
+        self._future = None
+
+    def start(self):
+        if self._future is None:
+            self._future = self.bridge.submit(self._run(), on_error=self._on_error)
+
+    def stop(self):
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    # Internals
+
+    async def _beat(self):
+        reader, writer = await self.pool.acquire(self.host, self.port, self.timeout)
+        writer.write(self.heartbeat)
+        await asyncio.wait_for(writer.drain(), self.timeout)
+        reply = await asyncio.wait_for(reader.readline(), self.timeout)
+        if not reply:
+            raise ConnectionError('connection closed by server')
+
+    async def _run(self):
+        delay = self.backoff[0]
+        try:
+            while True:
+                try:
+                    await self._beat()
+                except Exception as error:
+                    if not isinstance(error, (OSError, asyncio.TimeoutError)):
+                        log.exception('status check of %s:%s failed', self.host, self.port)
+                    self.pool.discard(self.host, self.port)
+                    self._set(OFFLINE, str(error) or type(error).__name__)
+                    # Full jitter keeps many clients from reconnecting in step
+                    await asyncio.sleep(random.uniform(0.5, 1.0) * delay)
+                    delay = min(delay * 2, self.backoff[1])
+                else:
+                    self._set(ONLINE, f'{self.host}:{self.port}')
+                    delay = self.backoff[0]
+                    await asyncio.sleep(self.interval)
+        finally:
+            self.pool.discard(self.host, self.port)
+
+    def _on_error(self, error):
+        # The loop itself failed (Tk thread): show it instead of a stale state
+        log.error('status service of %s:%s stopped', self.host, self.port,
+                  exc_info=error)
+        self._future = None
+        self.state = OFFLINE
+        self.on_change(OFFLINE, f'status service stopped: {error}')
+
+    def _set(self, state, detail):
+        if state != self.state:
+            self.state = state
+            self.bridge.call_in_tk(self.on_change, state, detail)
+
+
+async def serve_heartbeats(host, port):
+    """Minimal stand-in backend: answers every line with PONG. Cancelling it
+    drops the open connections too, like a backend going down."""
+    writers = set()
+
+    async def handle(reader, writer):
+        writers.add(writer)
+        try:
+            while await reader.readline():
+                writer.write(b'PONG\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writers.discard(writer)
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for writer in list(writers):
+            writer.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--serve':
+        asyncio.run(serve_heartbeats(sys.argv[2], int(sys.argv[3])))
+    else:
+        sys.exit('usage: python status.py --serve HOST PORT')
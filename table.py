@@ -0,0 +1,377 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Virtualized table for the working frame.
+#
+# Only as many canvas rows as fit in the viewport exist. Scrolling by a few
+# rows moves the whole row tag once and refills just the slots that wrapped
+# around; larger jumps refill every slot. Rows are pulled from a DataSource
+# on demand, and sorting goes through per column index arrays that are
+# built once and reused.
+
+from array import array
+from collections import deque
+
+from tasks import current_task
+
+
+class DataSource:
+    """Row provider for VirtualTable. Subclasses implement __len__ and row()."""
+
+    columns = ()
+
+    def __init__(self):
+        self._indexes = {}  # column -> array of row numbers in sorted order
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def row(self, index):
+        """Tuple of column values of row index."""
+        raise NotImplementedError
+
+    def sort_key(self, index, column):
+        return self.row(index)[column]
+
+    @property
+    def sortable(self):
+        """Whether the rows are final, so a sort index can be built."""
+        return True
+
+    def sort_index(self, column):
+        """Row numbers ordered by column, computed once. Safe to call from
+        a worker thread to have it ready before the user clicks; as a task
+        it stops when cancelled."""
+        index = self._indexes.get(column)
+        if index is None:
+            task = current_task()
+
+            def key(row):
+                if task is not None and not row % 4096:
+                    task.check()
+                return self.sort_key(row, column)
+
+            typecode = 'I' if len(self) < 2 ** 32 else 'Q'
+            index = array(typecode, sorted(range(len(self)), key=key))
+            self._indexes[column] = index
+        return index
+
+    def has_index(self, column):
+        return column in self._indexes
+
+    def index_bytes(self):
+        return sum(len(index) * index.itemsize for index in self._indexes.values())
+
+    def invalidate(self):
+        """Forget sort indexes after the rows changed."""
+        self._indexes = {}
+
+
+class ListSource(DataSource):
+    """DataSource over a list of row tuples."""
+
+    def __init__(self, columns, rows):
+        super().__init__()
+        self.columns = tuple(columns)
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row(self, index):
+        return self.rows[index]
+
+
+class VirtualTable:
+    """Scrollable table that keeps a fixed number of row items alive."""
+
+    def __init__(self, parent, source, row_height=20, widths=None,
+                 bg='#34495E', alt_bg='#2C3E50', fg='#DADFE1',
+                 header_bg='#22313F', header_fg='#95A5A6', font=None,
+                 on_sort=None, fonts=None, font_role=None):
+        import tkinter as tk
+        import tkinter.font as tkfont
+
+        self.source = source
+        self.row_height = row_height
+        self.widths = widths
+        self.colors = {'bg': bg, 'alt_bg': alt_bg, 'fg': fg,
+                       'header_bg': header_bg, 'header_fg': header_fg}
+        # With a FontSet (fontset.py) the font is its font_role and sizes
+        # come from the set's caches
+        self.fonts = fonts
+        self.font_role = font_role
+        self.font = fonts[font_role] if fonts is not None else font
+        # Called with the column on header clicks instead of sorting
+        # directly, e.g. to build a missing sort index in the background
+        self.on_sort = on_sort
+        self.first = 0         # first visible view row
+        self.order = None      # sort index of the current sort column
+        self.sort_column = None
+        self.reverse = False
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.header = tk.Canvas(self.frame, height=row_height, bg=header_bg,
+                                highlightthickness=0, bd=0)
+        self.scrollbar = tk.Scrollbar(self.frame, orient='vertical',
+                                      command=self._on_scrollbar)
+        self.canvas = tk.Canvas(self.frame, bg=bg, highlightthickness=0, bd=0)
+        self.header.pack(side='top', fill='x')
+        self.scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        if fonts is not None:
+            self._measure_font = None
+        elif isinstance(font, tkfont.Font):
+            self._measure_font = font
+        else:
+            self._measure_font = tkfont.Font(font=font) if font else tkfont.nametofont('TkDefaultFont')
+        self._min_row_height = row_height
+        self._char_width = max(1, self._measure('0'))
+        self._slots = deque()  # [rect id, [text ids], shown view row] top to bottom
+        self._texts = {}       # text id -> text shown, to skip unchanged updates
+        self._x = []           # column x offsets
+        self._redraw_id = None
+
+        self.canvas.bind('<Configure>', self._on_resize)
+        self.canvas.bind('<MouseWheel>', self._on_wheel)
+        self.canvas.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.canvas.bind('<Button-5>', lambda event: self.scroll(3))
+        self.header.bind('<Button-1>', self._on_header_click)
+        self._layout_columns()
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def set_source(self, source):
+        self.source = source
+        self.order = None
+        self.sort_column = None
+        self.first = 0
+        self._layout_columns()
+        self._fill_all()
+
+    def set_colors(self, **colors):
+        """Restyle in place; takes the colour keywords of the constructor."""
+        self.colors.update(colors)
+        self.frame.config(bg=self.colors['bg'])
+        self.canvas.config(bg=self.colors['bg'])
+        self.header.config(bg=self.colors['header_bg'])
+        self.canvas.itemconfigure('cell', fill=self.colors['fg'])
+        self._draw_header()
+        for view_row, slot in enumerate(self._slots, self.first):
+            self.canvas.itemconfigure(slot[0], fill=self.colors['alt_bg' if view_row % 2 else 'bg'])
+
+    def memory(self):
+        """Bytes held by the sort indexes of the source, for views.py."""
+        return self.source.index_bytes()
+
+    def remeasure(self):
+        """Fit row height and cell truncation to the font after it changed size."""
+        self._char_width = max(1, self._measure('0'))
+        self.row_height = max(self._min_row_height, self._linespace() + 6)
+        self.header.config(height=self.row_height)
+        self._relayout()
+
+    def sort(self, column, reverse=None):
+        """Sort the view by column; clicking the same column flips order.
+        Does nothing while the source is not sortable."""
+        if not self.source.sortable:
+            return
+        order = self.source.sort_index(column)
+        if len(order) != len(self.source):
+            # Built before the rows changed
+            self.source.invalidate()
+            return
+        if reverse is None:
+            reverse = not self.reverse if column == self.sort_column else False
+        self.order = order
+        self.sort_column = column
+        self.reverse = reverse
+        self._draw_header()
+        self._fill_all()
+
+    def source_row(self, view_row):
+        """Source row number shown at view_row."""
+        if self.order is None:
+            return view_row
+        if self.reverse:
+            return self.order[len(self.order) - 1 - view_row]
+        return self.order[view_row]
+
+    def scroll(self, rows):
+        self.scroll_to(self.first + rows)
+
+    def scroll_to(self, row):
+        row = max(0, min(row, len(self.source) - self._visible_rows() + 1))
+        delta = row - self.first
+        if delta == 0:
+            return
+        self.first = row
+        if abs(delta) >= len(self._slots):
+            self._fill_all()
+        else:
+            self._shift(delta)
+        self._update_scrollbar()
+
+    def refresh(self):
+        """Redraw after the source changed (e.g. rows were appended)."""
+        if self.order is not None and len(self.order) != len(self.source):
+            # The sort index no longer covers the rows
+            self.source.invalidate()
+            self.order = None
+            self.sort_column = None
+            self._draw_header()
+        self._fill_all()
+
+    # Internals
+
+    def _measure(self, text):
+        if self.fonts is not None:
+            return self.fonts.measure(self.font_role, text)
+        return self._measure_font.measure(text)
+
+    def _linespace(self):
+        if self.fonts is not None:
+            return self.fonts.metrics(self.font_role, 'linespace')
+        return self._measure_font.metrics('linespace')
+
+    def _visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height + 1)
+
+    def _layout_columns(self):
+        columns = self.source.columns
+        width = max(1, self.canvas.winfo_width())
+        widths = self.widths or [width // max(1, len(columns))] * len(columns)
+        self._x = [sum(widths[:i]) for i in range(len(columns))]
+        self._chars = [max(1, (w - 8) // self._char_width) for w in widths]
+        self._draw_header()
+        # Column count changed - rebuild the slots
+        if self._slots and len(self._slots[0][1]) != len(columns):
+            self.canvas.delete('row')
+            self._slots.clear()
+            self._texts.clear()
+        for rect, texts, view_row in self._slots:
+            for text, x in zip(texts, self._x):
+                self.canvas.coords(text, x + 4, self.canvas.coords(text)[1])
+
+    def _draw_header(self):
+        self.header.delete('all')
+        for column, (name, x) in enumerate(zip(self.source.columns, self._x)):
+            if column == self.sort_column:
+                name += ' ▼' if self.reverse else ' ▲'
+            self.header.create_text(x + 4, self.row_height // 2, anchor='w',
+                                    text=name, fill=self.colors['header_fg'],
+                                    font=self.font)
+
+    def _ensure_slots(self):
+        """Create or drop row slots so they cover the viewport."""
+        needed = self._visible_rows()
+        width = 10000  # stripes wider than any window; the canvas clips them
+        while len(self._slots) < needed:
+            y = len(self._slots) * self.row_height
+            rect = self.canvas.create_rectangle(0, y, width, y + self.row_height,
+                                                width=0, tags='row')
+            texts = [self.canvas.create_text(x + 4, y + self.row_height // 2,
+                                             anchor='w', fill=self.colors['fg'],
+                                             font=self.font, tags=('row', 'cell'))
+                     for x in self._x]
+            self._slots.append([rect, texts, None])
+        while len(self._slots) > needed:
+            rect, texts, view_row = self._slots.pop()
+            self.canvas.delete(rect, *texts)
+            for text in texts:
+                self._texts.pop(text, None)
+
+    def _fill(self, slot, view_row):
+        rect, texts, shown = slot
+        slot[2] = view_row
+        if view_row >= len(self.source):
+            self.canvas.itemconfigure(rect, state='hidden')
+            for text in texts:
+                self._set_text(text, '')
+            return
+        self.canvas.itemconfigure(rect, state='normal',
+                                  fill=self.colors['alt_bg' if view_row % 2 else 'bg'])
+        values = self.source.row(self.source_row(view_row))
+        for text, value, chars in zip(texts, values, self._chars):
+            value = str(value)
+            if len(value) > chars:
+                value = value[:max(1, chars - 1)] + '…'
+            self._set_text(text, value)
+
+    def _set_text(self, item, value):
+        if self._texts.get(item) != value:
+            self._texts[item] = value
+            self.canvas.itemconfigure(item, text=value)
+
+    def _fill_all(self):
+        self._ensure_slots()
+        for offset, slot in enumerate(self._slots):
+            self._fill(slot, self.first + offset)
+        self._update_scrollbar()
+
+    def _shift(self, delta):
+        """Scroll by delta rows, recycling the slots that left the viewport."""
+        count = len(self._slots)
+        height = self.row_height
+        self.canvas.move('row', 0, -delta * height)
+        if delta > 0:
+            for _ in range(delta):
+                slot = self._slots.popleft()
+                self._move_slot(slot, count * height)
+                self._slots.append(slot)
+            recycled = range(count - delta, count)
+        else:
+            for _ in range(-delta):
+                slot = self._slots.pop()
+                self._move_slot(slot, -count * height)
+                self._slots.appendleft(slot)
+            recycled = range(0, -delta)
+        for offset in recycled:
+            self._fill(self._slots[offset], self.first + offset)
+
+    def _move_slot(self, slot, dy):
+        rect, texts, view_row = slot
+        for item in (rect, *texts):
+            self.canvas.move(item, 0, dy)
+
+    def _update_scrollbar(self):
+        total = max(1, len(self.source))
+        visible = self._visible_rows() - 1
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+
+    def _on_resize(self, event):
+        # Resizes arrive in bursts; relayout once per idle cycle
+        if self._redraw_id is None:
+            self._redraw_id = self.canvas.after_idle(self._relayout)
+
+    def _relayout(self):
+        self._redraw_id = None
+        self._layout_columns()
+        self.first = max(0, min(self.first, len(self.source) - self._visible_rows() + 1))
+        # Slot positions are rebuilt from scratch after a resize
+        self.canvas.delete('row')
+        self._slots.clear()
+        self._texts.clear()
+        self._fill_all()
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, action, *args):
+        if action == 'moveto':
+            self.scroll_to(int(float(args[0]) * len(self.source)))
+        elif action == 'scroll':
+            amount, unit = int(args[0]), args[1]
+            step = self._visible_rows() - 1 if unit == 'pages' else 1
+            self.scroll(amount * step)
+
+    def _on_header_click(self, event):
+        for column in range(len(self._x) - 1, -1, -1):
+            if event.x >= self._x[column]:
+                if self.on_sort is not None:
+                    self.on_sort(column)
+                else:
+                    self.sort(column)
+                return
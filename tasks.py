@@ -0,0 +1,202 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Background execution of menu and toolbar commands.
+#
+# Commands run on a thread pool (or a process pool for CPU bound work).
+# Workers never touch Tk: progress and results are put on a thread safe
+# queue that an after() poller drains on the Tk thread, where the
+# on_progress / on_done / on_error callbacks run. The poller only runs
+# while tasks are pending.
+
+import queue
+import sys
+import threading
+
+_local = threading.local()
+
+
+class TaskCancelled(Exception):
+    """Raised by Task.check() in a worker whose task was cancelled."""
+
+
+def current_task():
+    """Task running in this worker thread (None outside thread pool tasks)."""
+    return getattr(_local, 'task', None)
+
+
+class Task:
+    """Handle of a submitted command."""
+
+    def __init__(self, executor, key, name, on_done, on_error, on_progress):
+        self.executor = executor
+        self.key = key
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future = None
+        self.progress = None
+        self.message = ''
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Request cancellation. Queued tasks never start; running thread
+        tasks see it through cancelled / check()."""
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check(self):
+        """Raise TaskCancelled in the worker if cancellation was requested."""
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def report(self, progress=None, message=''):
+        """Send progress (e.g. 0..1) and a message to the Tk thread."""
+        self.executor._queue.put(('progress', self, (progress, message)))
+
+
+class TaskExecutor:
+    """Runs commands off the Tk thread and marshals results back to it."""
+
+    def __init__(self, root, workers=4, processes=None, poll=50):
+        self.root = root
+        self.workers = workers
+        self.processes = processes
+        self.poll = poll
+        self.active = {}  # key -> Task
+        self.busy_listeners = []
+        self._queue = queue.SimpleQueue()
+        self._threads = None
+        self._process_pool = None
+        self._poll_id = None
+
+    def submit(self, func, *args, key=None, name=None, pool='thread',
+               on_done=None, on_error=None, on_progress=None):
+        """Run func(*args) in the background and return its Task.
+
+        While a task with the same key (func by default) is still running,
+        the running Task is returned instead of starting another one, so
+        repeated clicks do not pile up work.
+        """
+        key = func if key is None else key
+        running = self.active.get(key)
+        if running is not None:
+            return running
+
+        task = Task(self, key, name or getattr(func, '__name__', str(key)),
+                    on_done, on_error, on_progress)
+        if pool == 'process':
+            task.future = self._get_process_pool().submit(func, *args)
+        else:
+            task.future = self._get_threads().submit(self._run, task, func, args)
+        self.active[key] = task
+        task.future.add_done_callback(lambda future: self._queue.put(('done', task, future)))
+        self._notify_busy()
+        self._ensure_polling()
+        return task
+
+    def command(self, func, *args, **options):
+        """A zero argument callable for Tk command= that submits func."""
+        return lambda: self.submit(func, *args, **options)
+
+    def cancel(self, key):
+        task = self.active.get(key)
+        if task is not None:
+            task.cancel()
+
+    def cancel_all(self):
+        for task in list(self.active.values()):
+            task.cancel()
+
+    def shutdown(self):
+        """Cancel everything and stop the pools without waiting."""
+        self.cancel_all()
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    # Internals
+
+    def _get_threads(self):
+        if self._threads is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._threads = ThreadPoolExecutor(max_workers=self.workers,
+                                               thread_name_prefix='task')
+        return self._threads
+
+    def _get_process_pool(self):
+        if self._process_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+        return self._process_pool
+
+    @staticmethod
+    def _run(task, func, args):
+        task.check()
+        _local.task = task
+        try:
+            return func(*args)
+        finally:
+            _local.task = None
+
+    def _ensure_polling(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll, self._drain)
+
+    def _drain(self):
+        self._poll_id = None
+        try:
+            while True:
+                try:
+                    kind, task, payload = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == 'progress':
+                    task.progress, task.message = payload
+                    if task.on_progress is not None and not task.cancelled:
+                        self._call(task.on_progress, *payload)
+                else:
+                    self._finish(task, payload)
+        finally:
+            # A failing callback must not stop the results of other tasks
+            if self.active or not self._queue.empty():
+                self._ensure_polling()
+
+    def _finish(self, task, future):
+        if self.active.get(task.key) is task:
+            del self.active[task.key]
+        self._notify_busy()
+        if task.cancelled or future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            if task.on_done is not None:
+                self._call(task.on_done, future.result())
+        elif isinstance(error, TaskCancelled):
+            return
+        elif task.on_error is not None:
+            self._call(task.on_error, error)
+        else:
+            self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+    def _call(self, callback, *args):
+        # Errors go where Tk reports errors of its own callbacks
+        try:
+            callback(*args)
+        except Exception:
+            self.root.report_callback_exception(*sys.exc_info())
+
+    def _notify_busy(self):
+        tasks = list(self.active.values())
+        for listener in self.busy_listeners:
+            self._call(listener, tasks)
@@ -0,0 +1,81 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Command palette ranking over the app's own command titles, and key chord
+# parsing. No Tk needed.
+#
+#     python -m unittest discover tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from commands import ALT, CONTROL, SHIFT, CommandIndex, parse_chord, parse_keys  # noqa: E402
+from main import app_commands  # noqa: E402
+
+
+class CommandIndexTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = CommandIndex()
+        cls.titles = [title for title, keys in app_commands.values()]
+        for title in cls.titles:
+            cls.index.add(title)
+
+    def matches(self, query):
+        return [self.titles[row] for row in self.index.matches(query)]
+
+    def test_title_prefix_first(self):
+        self.assertEqual(self.matches('view: d')[0], 'View: Dark theme')
+        self.assertEqual(self.matches('go to')[0], 'Go to: Result')
+
+    def test_initials(self):
+        self.assertEqual(self.matches('vdt')[0], 'View: Dark theme')
+        self.assertEqual(self.matches('dt')[0], 'View: Dark theme')
+        self.assertEqual(self.matches('of')[0], 'File: Open File...')
+        self.assertEqual(self.matches('hct')[0], 'View: High contrast theme')
+
+    def test_word_start_before_inside_word(self):
+        self.assertEqual(self.matches('open'), ['File: Open File...'])
+        self.assertEqual(self.matches('theme'),
+                         ['View: Dark theme', 'View: Light theme',
+                          'View: High contrast theme'])
+        self.assertEqual(self.matches('tings'), ['Go to: Settings'])
+
+    def test_words_in_any_order(self):
+        self.assertEqual(self.matches('file open'), ['File: Open File...'])
+
+    def test_typos(self):
+        themes = ['View: Dark theme', 'View: Light theme', 'View: High contrast theme']
+        self.assertEqual(self.matches('thme'), themes)      # missing letter
+        self.assertEqual(self.matches('theem'), themes)     # swapped letters
+        self.assertEqual(self.matches('thema'), themes)     # wrong letter
+        self.assertEqual(self.matches('consle'), ['View: Console'])
+        self.assertEqual(self.matches('dark thme'), ['View: Dark theme'])
+        self.assertEqual(self.matches('opn fil'), ['File: Open File...'])
+
+    def test_no_match(self):
+        self.assertEqual(self.matches('xyz'), [])
+        self.assertEqual(self.matches('thmxx'), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.index.matches('', limit=5)), 5)
+        self.assertEqual(len(self.index.matches('view', limit=3)), 3)
+
+
+class ChordTest(unittest.TestCase):
+
+    def test_parse_chord(self):
+        self.assertEqual(parse_chord('Ctrl+Shift+P'), (CONTROL | SHIFT, 'p'))
+        self.assertEqual(parse_chord('Alt+F4'), (ALT, 'F4'))
+        self.assertEqual(parse_chord('Ctrl++'), (CONTROL, 'plus'))
+        self.assertEqual(parse_keys('Ctrl+K Ctrl+D'), ((CONTROL, 'k'), (CONTROL, 'd')))
+        with self.assertRaises(ValueError):
+            parse_chord('Hyper+X')
+
+
+if __name__ == '__main__':
+    unittest.main()
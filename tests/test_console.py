@@ -0,0 +1,80 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Console ring buffer and the insert arguments of the console panel.
+# Neither needs a display.
+#
+#     python -m unittest discover tests
+
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from console import Console, ConsoleBuffer  # noqa: E402
+
+
+class ConsoleBufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = ConsoleBuffer(capacity=5)
+
+    def test_since_returns_only_new_lines(self):
+        self.buffer.write(logging.INFO, 'a\nb')
+        written, lines = self.buffer.since(0)
+        self.assertEqual(written, 2)
+        self.assertEqual(lines, [(logging.INFO, 'a'), (logging.INFO, 'b')])
+        self.buffer.write(logging.WARNING, 'c')
+        self.assertEqual(self.buffer.since(written), (3, [(logging.WARNING, 'c')]))
+        self.assertEqual(self.buffer.since(3), (3, []))
+
+    def test_since_after_lines_were_dropped(self):
+        for number in range(8):
+            self.buffer.write(logging.INFO, str(number))
+        written, lines = self.buffer.since(0)
+        self.assertEqual(written, 8)
+        self.assertEqual([line for _, line in lines], ['3', '4', '5', '6', '7'])
+        self.assertEqual(len(self.buffer), 5)
+
+    def test_since_level_and_limit(self):
+        self.buffer.write(logging.DEBUG, 'debug')
+        self.buffer.write(logging.ERROR, 'error 1')
+        self.buffer.write(logging.INFO, 'info')
+        self.buffer.write(logging.ERROR, 'error 2')
+        _, lines = self.buffer.since(0, level=logging.WARNING)
+        self.assertEqual([line for _, line in lines], ['error 1', 'error 2'])
+        _, lines = self.buffer.since(0, limit=2)
+        self.assertEqual([line for _, line in lines], ['info', 'error 2'])
+
+    def test_empty_text_is_one_line(self):
+        self.buffer.write(logging.INFO, '')
+        self.assertEqual(self.buffer.since(0), (1, [(logging.INFO, '')]))
+
+    def test_clear_keeps_sequence(self):
+        self.buffer.write(logging.INFO, 'a')
+        self.buffer.clear()
+        self.assertEqual(self.buffer.since(0), (1, []))
+        self.buffer.write(logging.INFO, 'b')
+        self.assertEqual(self.buffer.since(1), (2, [(logging.INFO, 'b')]))
+
+
+class ChunksTest(unittest.TestCase):
+
+    def test_runs_of_one_level_are_joined(self):
+        lines = [(logging.INFO, 'a'), (logging.INFO, 'b'), (logging.ERROR, 'c'),
+                 (logging.DEBUG, 'd'), (logging.DEBUG, 'e')]
+        self.assertEqual(Console._chunks(lines),
+                         ['a\nb\n', 'info', 'c\n', 'error', 'd\ne\n', 'debug'])
+
+    def test_levels_sharing_a_tag_are_one_run(self):
+        lines = [(logging.ERROR, 'a'), (logging.CRITICAL, 'b')]
+        self.assertEqual(Console._chunks(lines), ['a\nb\n', 'error'])
+
+    def test_no_lines(self):
+        self.assertEqual(Console._chunks([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# HoverStyles bookkeeping with stand-in widgets (no Tk needed).
+#
+#     python -m unittest discover tests
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hover import HOVER, NORMAL, HoverStyles  # noqa: E402
+
+
+class FakeRoot:
+
+    def __init__(self):
+        self.classes = {}
+        self.idle = []
+
+    def bind_class(self, tag, sequence, func):
+        self.classes[tag, sequence] = func
+
+    def after_idle(self, func):
+        self.idle.append(func)
+        return len(self.idle)
+
+    def after_cancel(self, job):
+        pass
+
+
+class FakeWidget:
+
+    def __init__(self, path):
+        self.path = path
+        self.tags = (path, 'Button', '.', 'all')
+        self.options = {}
+
+    def __str__(self):
+        return self.path
+
+    def bindtags(self, tags=None):
+        if tags is None:
+            return self.tags
+        self.tags = tuple(tags)
+
+    def config(self, **options):
+        self.options.update(options)
+
+
+class HoverStylesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = FakeRoot()
+        self.hover = HoverStyles(self.root)
+        self.hover.define('window', bg='#000', hover_bg='#111')
+        self.destroy = self.root.classes[HoverStyles.state_tag, '<Destroy>']
+
+    def test_images_dropped_when_destroyed_before_hover(self):
+        widget = FakeWidget('.b1')
+        self.hover.attach(widget, 'window', 'img', 'img_hover')
+        self.assertIn(HoverStyles.state_tag, widget.tags)
+        self.destroy(SimpleNamespace(widget=widget))
+        self.assertNotIn('.b1', self.hover.images)
+
+    def test_state_tag_added_once(self):
+        widget = FakeWidget('.b2')
+        self.hover.attach(widget, 'window', 'img', 'img_hover')
+        self.hover.set_images(widget, 'other', 'other_hover')
+        self.hover.request(widget, bg='#111')
+        self.hover.flush()
+        self.hover.forget(widget)
+        self.hover.request(widget, bg='#000')
+        self.hover.flush()
+        self.assertEqual(widget.tags.count(HoverStyles.state_tag), 1)
+
+    def test_flush_skips_what_is_shown(self):
+        widget = FakeWidget('.b3')
+        self.hover.attach(widget, 'window', 'img', 'img_hover')
+        for state in (HOVER, NORMAL, HOVER):
+            self.hover.request(widget, **self.hover.state(widget, 'window', state))
+        self.hover.flush()
+        self.assertEqual(widget.options, {'bg': '#111', 'image': 'img_hover'})
+        self.hover.request(widget, bg='#111')
+        self.hover.flush()
+        self.assertEqual(self.hover.stats['configured'], 1)
+        self.assertEqual(self.hover.stats['skipped'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
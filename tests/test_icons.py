@@ -0,0 +1,52 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# IconRegistry decoding and scaling, without creating Tk images.
+#
+#     python -m unittest discover tests
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+from icons import IconRegistry  # noqa: E402
+
+
+class IconRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        Image.new('RGBA', (16, 8), (255, 0, 0, 255)).save(
+            os.path.join(directory.name, 'box.png'))
+        self.icons = IconRegistry(directory.name, use_atlas=False)
+        self.addCleanup(self.icons.close)
+
+    def derived(self, *key):
+        return self.icons._derived_future(self.icons._key(*key)).result(timeout=5)
+
+    def test_variants(self):
+        self.assertEqual(self.derived('box', 'hover').size, (16, 8))
+        self.assertEqual(self.derived('box', 'normal').getpixel((0, 0))[3], 128)
+        self.assertEqual(self.derived('box', 'normal', 2).size, (32, 16))
+
+    def test_rescale_drops_decodes_for_the_old_scale(self):
+        self.icons.prefetch([('box', 'normal'), ('box', 'hover', 1)])
+        self.icons.rescale(2)
+        self.assertEqual(self.derived('box', 'normal').size, (32, 16))
+        # A fixed scale is not affected
+        self.assertEqual(self.derived('box', 'hover', 1).size, (16, 8))
+
+    def test_rescale_rounds_to_quarters(self):
+        self.icons.rescale(1.6)
+        self.assertEqual(self.icons.scale, 1.5)
+        self.assertEqual(self.derived('box', 'hover').size, (24, 12))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# FileSource (loader.py) over small files in a temporary directory.
+#
+#     python -m unittest discover tests
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tasks  # noqa: E402
+from loader import FileSource  # noqa: E402
+from table import DataSource  # noqa: E402
+
+
+class FakeTask:
+    """Stands in for the running Task: after `after` chunks it either asks
+    the source to stop or cancels."""
+
+    def __init__(self, source, after, cancel):
+        self.source = source
+        self.after = after
+        self.cancel = cancel
+        self.chunks = 0
+        self.reports = []
+
+    def check(self):
+        if self.cancel and self.chunks >= self.after:
+            raise tasks.TaskCancelled()
+
+    def report(self, progress=None, message=''):
+        self.reports.append(progress)
+        self.chunks += 1
+        if not self.cancel and self.chunks >= self.after:
+            self.source.stop()
+
+
+class FileSourceTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def open(self, data, name='data.csv'):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        source = FileSource(path)
+        self.addCleanup(source.close)
+        return source
+
+    def rows(self, source):
+        return [source.row(index) for index in range(len(source))]
+
+    def scan_as_task(self, source, after, cancel, chunk=16):
+        task = FakeTask(source, after, cancel)
+        tasks._local.task = task
+        try:
+            return source.scan(chunk=chunk)
+        finally:
+            tasks._local.task = None
+
+    def test_crlf(self):
+        source = self.open(b'a,b\r\n1,2\r\n3,4\r\n')
+        self.assertEqual(source.scan(), 2)
+        self.assertEqual(source.columns, ('a', 'b'))
+        self.assertEqual(self.rows(source), [('1', '2'), ('3', '4')])
+
+    def test_missing_final_newline(self):
+        source = self.open(b'a;b\n1;2\n3;4')
+        self.assertEqual(source.scan(chunk=3), 2)
+        self.assertEqual(source.delimiter, ';')
+        self.assertEqual(self.rows(source), [('1', '2'), ('3', '4')])
+        self.assertTrue(source.complete)
+
+    def test_empty_file(self):
+        source = self.open(b'')
+        self.assertEqual(source.scan(), 0)
+        self.assertEqual(source.columns, ('Column 1',))
+        self.assertTrue(source.complete)
+        self.assertEqual(list(source.sort_index(0)), [])
+
+    def test_header_only(self):
+        source = self.open(b'a,b\n')
+        self.assertEqual(source.scan(), 0)
+        self.assertEqual(source.columns, ('a', 'b'))
+
+    def test_lines_fitted_to_header(self):
+        source = self.open(b'a,b,c\n1\n1,2,3,4\n"x,y",2,3\n')
+        source.scan()
+        self.assertEqual(self.rows(source),
+                         [('1', '', ''), ('1', '2', '3'), ('x,y', '2', '3')])
+
+    def test_stop_keeps_records_found(self):
+        lines = b''.join(b'%d,%d\n' % (n, n * 2) for n in range(100))
+        source = self.open(b'a,b\n' + lines)
+        count = self.scan_as_task(source, after=2, cancel=False)
+        self.assertFalse(source.complete)
+        self.assertTrue(0 < count < 100)
+        self.assertEqual(source.row(count - 1), (str(count - 1), str((count - 1) * 2)))
+        self.assertTrue(source.sortable)
+        self.assertEqual(len(source.sort_index(1)), count)
+
+    def test_cancel(self):
+        lines = b''.join(b'%d\n' % n for n in range(100))
+        source = self.open(b'n\n' + lines)
+        with self.assertRaises(tasks.TaskCancelled):
+            self.scan_as_task(source, after=3, cancel=True)
+        self.assertFalse(source.scanning)
+        self.assertFalse(source.complete)
+        self.assertTrue(source.sortable)
+        self.assertEqual([int(value) for value, in self.rows(source)],
+                         list(range(len(source))))
+
+    def test_not_sortable_before_scan_or_after_close(self):
+        source = self.open(b'a\n1\n')
+        self.assertFalse(source.sortable)
+        source.scan()
+        self.assertTrue(source.sortable)
+        source.close()
+        self.assertFalse(source.sortable)
+        with self.assertRaises(ValueError):
+            source.sort_index(0)
+
+    def test_sort_index_matches_sort_key_order(self):
+        values = ['10', 'b', '-2.5', 'a', '3', 'b', '1e3', '', 'nan x', '3']
+        source = self.open(('v\n' + '\n'.join(values) + '\n').encode())
+        source.scan()
+        expected = sorted(range(len(values)), key=lambda row: source.sort_key(row, 0))
+        self.assertEqual(list(source.sort_index(0)), expected)
+        source.invalidate()
+        self.assertEqual(list(DataSource.sort_index(source, 0)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Callback profiling in monitor.py. Runs without a display: a Tcl
+# interpreter is enough to register and call Python callbacks.
+#
+#     python -m unittest discover tests
+
+import os
+import sys
+import tkinter
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import monitor  # noqa: E402
+
+
+def callback():
+    return 'called'
+
+
+class FakeLabel:
+    """Stands in for the status bar label: keeps the last text."""
+
+    def __init__(self):
+        self.text = None
+
+    def winfo_exists(self):
+        return True
+
+    def config(self, text):
+        self.text = text
+
+
+class MonitorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.original = tkinter.CallWrapper.__call__
+        monitor.install()
+        self.addCleanup(monitor.uninstall)
+        self.root = tkinter.Tcl()
+        self.name = self.root.register(callback)
+        self.monitor = monitor.Monitor(self.root)
+        self.addCleanup(self.monitor.stop)
+
+    def count(self):
+        return self.monitor.calls.get(monitor.callback_name(callback), [0])[0]
+
+    def test_callback_registered_before_start_is_profiled(self):
+        self.monitor.start()
+        self.assertEqual(self.root.tk.call(self.name), 'called')
+        self.assertEqual(self.count(), 1)
+
+    def test_stop_ends_profiling(self):
+        self.monitor.start()
+        self.root.tk.call(self.name)
+        self.monitor.stop()
+        self.assertEqual(self.root.tk.call(self.name), 'called')
+        self.assertEqual(self.count(), 1)
+        self.assertIs(tkinter.CallWrapper.__call__, self.original)
+
+    def test_not_profiled_before_start(self):
+        self.root.tk.call(self.name)
+        self.assertEqual(self.count(), 0)
+
+    def pending(self):
+        return self.root.tk.splitlist(self.root.tk.call('after', 'info'))
+
+    def test_label_refresh_stops_with_the_monitor(self):
+        label = FakeLabel()
+        self.monitor.start()
+        self.monitor.show_in(label, every=60000)
+        self.assertTrue(label.text.startswith('lag p50'))
+        self.assertIn(self.monitor._label_id, self.pending())
+        self.monitor.stop()
+        self.assertIsNone(self.monitor._label_id)
+        self.assertEqual(self.pending(), ())
+
+    def test_label_not_rescheduled_when_not_running(self):
+        label = FakeLabel()
+        self.monitor.show_in(label, every=60000)
+        self.assertIsNotNone(label.text)
+        self.assertEqual(self.pending(), ())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Min / max decimation of plot.py, with NumPy arrays and with plain lists.
+#
+#     python -m unittest discover tests
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plot import minmax  # noqa: E402
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def series(count):
+    x = list(range(count))
+    y = [math.sin(i / 50) * 100 + (i * 7919 % 13) for i in x]
+    return x, y
+
+
+class MinmaxTest(unittest.TestCase):
+
+    def variants(self, x, y):
+        """(label, x, y) for the plain Python path and, if installed, NumPy."""
+        yield 'python', x, y
+        if numpy is not None:
+            yield 'numpy', numpy.array(x), numpy.array(y)
+
+    def test_short_series_is_unchanged(self):
+        x, y = series(50)
+        for label, xv, yv in self.variants(x, y):
+            with self.subTest(label):
+                xs, ys = minmax(xv, yv, 0, 49, 100)
+                self.assertEqual(list(xs), x)
+                self.assertEqual(list(ys), y)
+
+    def test_long_series_is_reduced_per_column(self):
+        x, y = series(100000)
+        width = 200
+        for label, xv, yv in self.variants(x, y):
+            with self.subTest(label):
+                xs, ys = minmax(xv, yv, 0, 99999, width)
+                self.assertEqual(len(xs), len(ys))
+                self.assertLessEqual(len(xs), 2 * (width + 2))
+                self.assertEqual(list(xs), sorted(xs))
+                self.assertEqual(max(ys), max(y))
+                self.assertEqual(min(ys), min(y))
+
+    def test_spike_survives(self):
+        x, y = series(100000)
+        y[54321] = 10000
+        y[12345] = -10000
+        for label, xv, yv in self.variants(x, y):
+            with self.subTest(label):
+                _, ys = minmax(xv, yv, 0, 99999, 100)
+                self.assertIn(10000, list(ys))
+                self.assertIn(-10000, list(ys))
+
+    def test_view_keeps_one_point_of_margin(self):
+        x, y = series(100000)
+        for label, xv, yv in self.variants(x, y):
+            with self.subTest(label):
+                xs, ys = minmax(xv, yv, 1000.5, 60000.5, 100)
+                self.assertEqual(xs[0], 1000)
+                self.assertLessEqual(60001, xs[-1])
+                self.assertEqual(max(ys), max(y[1000:60002]))
+                self.assertEqual(min(ys), min(y[1000:60002]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# SearchIndex (search.py) against a brute force substring scan of the
+# library catalogues.
+#
+#     python -m unittest discover tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library import MaterialLibrary, ProfileLibrary  # noqa: E402
+from search import SearchIndex, _words  # noqa: E402
+from table import ListSource  # noqa: E402
+
+
+def brute_force(index, query):
+    words = _words.findall(query.lower())
+    return [row for row in range(index.size)
+            if all(word in index.text(row) for word in words)]
+
+
+def exact(index, query):
+    """Rows of search() before the fuzzy batch."""
+    rows = []
+    expected = set(brute_force(index, query))
+    for batch in index.search(query, fuzzy_min=0):
+        rows.extend(batch)
+    assert set(rows) <= expected
+    return rows
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.profiles = SearchIndex(ProfileLibrary(3000))
+        cls.profiles.build()
+        cls.materials = SearchIndex(MaterialLibrary(3000))
+        cls.materials.build()
+
+    def assertMatchesScan(self, index, query):
+        self.assertEqual(exact(index, query), brute_force(index, query), query)
+
+    def test_profiles(self):
+        for query in ('hea', 'hea 12', '12', 'x1', '1', 'e', 'ipe 200x', 'hea12',
+                      '120x', 'shs 9 x', 'rhs-1', 'zz', 'l 80'):
+            self.assertMatchesScan(self.profiles, query)
+
+    def test_materials(self):
+        for query in ('steel', 's355', '35', '5', 'ti 2', 'aluminium s2', 'eh36/1',
+                      'copper', 'dh', 'xyz'):
+            self.assertMatchesScan(self.materials, query)
+
+    def test_short_words_match_inside_words(self):
+        index = SearchIndex(ListSource(('Name',), [('HEA 112x50',), ('HEA 120x50',),
+                                                   ('IPE 80x12',)]))
+        index.build()
+        self.assertEqual(exact(index, '12'), [0, 1, 2])
+        self.assertEqual(exact(index, '2x'), [0])
+        self.assertEqual(exact(index, 'hea 1'), [0, 1])
+
+    def test_rows_added_later_are_found(self):
+        source = ListSource(('Name',), [('alpha',), ('beta',)])
+        index = SearchIndex(source)
+        index.add_rows(2)
+        source.rows.append(('alphabet',))
+        index.add_rows(3)
+        self.assertEqual(exact(index, 'lph'), [0, 2])
+        self.assertEqual(exact(index, 'et'), [1, 2])
+
+    def test_fuzzy_after_exact(self):
+        index = SearchIndex(ListSource(('Name',), [('aluminium',), ('alumnium',), ('steel',)]))
+        index.build()
+        batches = list(index.search('aluminium', fuzzy_min=5))
+        self.assertEqual(batches, [[0], [1]])
+
+    def test_postings_are_four_bytes(self):
+        self.assertEqual(self.profiles.postings['he'].itemsize, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# StatusService against the stand-in server (status.serve_heartbeats) on
+# localhost. A small bridge runs the asyncio loop in a thread and calls
+# "Tk thread" callbacks right away, so no Tk is needed.
+#
+#     python -m unittest discover tests
+
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from status import OFFLINE, ONLINE, ConnectionPool, StatusService, serve_heartbeats  # noqa: E402
+
+
+class LoopBridge:
+    """What StatusService needs of aiobridge.AsyncBridge, without Tk."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, coro, on_done=None, on_error=None):
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if on_error is not None:
+            future.add_done_callback(
+                lambda f: f.cancelled() or f.exception() is None or on_error(f.exception()))
+        return future
+
+    def call_in_tk(self, func, *args):
+        func(*args)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=2)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class FailingPool(ConnectionPool):
+    """Raises an unexpected error on the first acquire."""
+
+    failed = False
+
+    async def acquire(self, host, port, timeout):
+        if not self.failed:
+            self.failed = True
+            raise ValueError('Separator is found, but chunk is longer than limit')
+        return await super().acquire(host, port, timeout)
+
+
+class StatusServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.bridge = LoopBridge()
+        self.addCleanup(self.bridge.close)
+        self.port = free_port()
+        self.changes = []
+        self.server = None
+
+    def serve(self):
+        self.server = self.bridge.submit(serve_heartbeats('127.0.0.1', self.port))
+        self.addCleanup(self.server.cancel)
+        end = time.monotonic() + 5
+        while time.monotonic() < end:
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.01)
+
+    def service(self, **options):
+        service = StatusService(self.bridge, '127.0.0.1', self.port,
+                                lambda state, detail: self.changes.append(state),
+                                interval=0.02, timeout=0.5, backoff=(0.02, 0.05),
+                                **options)
+        service.start()
+        self.addCleanup(service.stop)
+        return service
+
+    def wait_for(self, states, timeout=5):
+        end = time.monotonic() + timeout
+        while self.changes != states and time.monotonic() < end:
+            time.sleep(0.01)
+        self.assertEqual(self.changes, states)
+
+    def test_online_offline_online(self):
+        self.serve()
+        self.service()
+        self.wait_for([ONLINE])
+        time.sleep(0.1)  # several more heartbeats, no repeated change
+        self.assertEqual(self.changes, [ONLINE])
+
+        self.server.cancel()
+        self.wait_for([ONLINE, OFFLINE])
+        time.sleep(0.1)  # retries keep failing, still one change
+        self.assertEqual(self.changes, [ONLINE, OFFLINE])
+
+        self.serve()
+        self.wait_for([ONLINE, OFFLINE, ONLINE])
+
+    def test_unexpected_error_goes_offline_and_recovers(self):
+        self.serve()
+        with self.assertLogs('status', 'ERROR'):
+            self.service(pool=FailingPool())
+            self.wait_for([OFFLINE, ONLINE])
+
+    def test_service_failure_is_reported(self):
+        service = StatusService(self.bridge, '127.0.0.1', self.port,
+                                lambda state, detail: self.changes.append(detail))
+
+        async def broken():
+            raise RuntimeError('loop broke')
+
+        service._run = broken
+        with self.assertLogs('status', 'ERROR'):
+            service.start()
+            self.wait_for(['status service stopped: loop broke'])
+        self.assertEqual(service.state, OFFLINE)
+
+
+if __name__ == '__main__':
+    unittest.main()
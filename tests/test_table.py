@@ -0,0 +1,69 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Sort indexes of the table data sources. No display needed: only the
+# VirtualTable widget touches Tk.
+#
+#     python -m unittest discover tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tasks  # noqa: E402
+from table import ListSource  # noqa: E402
+from tasks import TaskCancelled  # noqa: E402
+
+
+class CancelledTask:
+    """Stands in for a Task cancelled before it ran."""
+
+    def check(self):
+        raise TaskCancelled()
+
+
+class ListSourceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [('c', 3), ('a', 1), ('b', 3), ('a', 2), ('d', 0)]
+        self.source = ListSource(('name', 'value'), self.rows)
+
+    def test_sort_index_orders_rows(self):
+        self.assertEqual(list(self.source.sort_index(0)), [1, 3, 2, 0, 4])
+        # Equal keys keep their row order
+        self.assertEqual(list(self.source.sort_index(1)), [4, 1, 3, 0, 2])
+
+    def test_sort_index_is_built_once(self):
+        self.assertFalse(self.source.has_index(0))
+        index = self.source.sort_index(0)
+        self.assertTrue(self.source.has_index(0))
+        self.assertIs(self.source.sort_index(0), index)
+        self.assertEqual(index.typecode, 'I')
+        self.assertEqual(self.source.index_bytes(), len(self.rows) * index.itemsize)
+
+    def test_invalidate_after_rows_changed(self):
+        self.source.sort_index(0)
+        self.rows.append(('0', 9))
+        self.source.invalidate()
+        self.assertFalse(self.source.has_index(0))
+        self.assertEqual(self.source.sort_index(0)[0], 5)
+
+    def test_cancelled_task_leaves_no_index(self):
+        tasks._local.task = CancelledTask()
+        try:
+            with self.assertRaises(TaskCancelled):
+                self.source.sort_index(0)
+        finally:
+            tasks._local.task = None
+        self.assertFalse(self.source.has_index(0))
+
+    def test_empty(self):
+        source = ListSource(('name',), [])
+        self.assertEqual(list(source.sort_index(0)), [])
+        self.assertTrue(source.sortable)
+
+
+if __name__ == '__main__':
+    unittest.main()
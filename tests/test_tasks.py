@@ -0,0 +1,120 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# TaskExecutor with a stand-in root whose after() queue is run by hand.
+#
+#     python -m unittest discover tests
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tasks import TaskExecutor, current_task  # noqa: E402
+
+
+class FakeRoot:
+    """after() / after_cancel() without Tk; run() fires the due jobs."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.errors = []
+        self._ids = 0
+
+    def after(self, ms, func):
+        self._ids += 1
+        self.jobs[self._ids] = func
+        return self._ids
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run(self):
+        jobs, self.jobs = self.jobs, {}
+        for func in jobs.values():
+            func()
+
+    def report_callback_exception(self, kind, value, traceback):
+        self.errors.append(value)
+
+
+class TaskExecutorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = FakeRoot()
+        self.executor = TaskExecutor(self.root, workers=2)
+        self.addCleanup(self.executor.shutdown)
+
+    def settle(self, *tasks):
+        for task in tasks:
+            if not task.future.cancelled():
+                task.future.exception(timeout=5)
+        while self.root.jobs:
+            self.root.run()
+
+    def test_result_reaches_on_done(self):
+        results = []
+        task = self.executor.submit(sum, [1, 2, 3], on_done=results.append)
+        self.settle(task)
+        self.assertEqual(results, [6])
+        self.assertEqual(self.executor.active, {})
+
+    def test_same_key_returns_running_task(self):
+        gate = threading.Event()
+        first = self.executor.submit(gate.wait, 5, key='job')
+        second = self.executor.submit(gate.wait, 5, key='job')
+        self.assertIs(first, second)
+        gate.set()
+        self.settle(first)
+        third = self.executor.submit(gate.wait, 5, key='job')
+        self.assertIsNot(third, first)
+        self.settle(third)
+
+    def test_cancelled_task_does_not_report(self):
+        started, gate = threading.Event(), threading.Event()
+        results = []
+
+        def work():
+            started.set()
+            gate.wait(5)
+            current_task().check()
+            return 'finished'
+
+        task = self.executor.submit(work, on_done=results.append,
+                                    on_error=results.append)
+        started.wait(5)
+        self.executor.cancel(work)
+        gate.set()
+        self.settle(task)
+        self.assertTrue(task.cancelled)
+        self.assertEqual(results, [])
+        self.assertEqual(self.root.errors, [])
+
+    def test_failing_callback_keeps_polling(self):
+        gate = threading.Event()
+        results = []
+
+        def fail(result):
+            raise ValueError('broken callback')
+
+        first = self.executor.submit(int, '1', key='first', on_done=fail)
+        first.future.result(timeout=5)
+        second = self.executor.submit(gate.wait, 5, key='second', on_done=results.append)
+        self.root.run()
+        self.assertEqual([type(error) for error in self.root.errors], [ValueError])
+        gate.set()
+        self.settle(second)
+        self.assertEqual(results, [True])
+        self.assertEqual(self.executor.active, {})
+
+    def test_worker_error_goes_to_on_error(self):
+        errors = []
+        task = self.executor.submit(int, 'x', on_error=errors.append)
+        self.settle(task)
+        self.assertIsInstance(errors[0], ValueError)
+
+
+if __name__ == '__main__':
+    unittest.main()
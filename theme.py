@@ -0,0 +1,102 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Live theme switching.
+#
+# The builder records, per widget, which colour option uses which palette
+# key (its role). Switching themes compares the palettes, looks up only the
+# widgets that use a changed key and queues just those options through the
+# hover engine, so the whole swap is applied in one idle pass and the hover
+# state cache stays right. Hover styles are redefined from their keys, so
+# <Enter>/<Leave> pick up the new colours. Components that draw their own
+# items (tables, plots, tooltips) register a listener.
+
+import weakref
+
+_registries = weakref.WeakKeyDictionary()  # Tk root -> ThemeRegistry
+
+
+class ThemeRegistry:
+    """Palette keys used by every themed widget of one Tk interpreter."""
+
+    tag = 'Themed'
+
+    def __init__(self, root, colors, hover=None):
+        self.root = root
+        self.colors = colors  # the live palette, updated in place by apply()
+        self.hover = hover
+        self.roles = {}         # widget path -> (widget, {option: palette key})
+        self.users = {}         # palette key -> set of widget paths
+        self.hover_styles = {}  # hover style -> (bg key, hover bg key)
+        self.listeners = []     # callables(colors) run after a theme change
+        root.bind_class(self.tag, '<Destroy>', self._on_destroy)
+
+    def bind(self, widget, roles):
+        """Record that widget's options take their colour from palette keys,
+        e.g. {'bg': 'menu_bg', 'fg': 'infobox_fb'}."""
+        if not roles:
+            return
+        path = str(widget)
+        entry = self.roles.get(path)
+        if entry is None:
+            entry = self.roles[path] = (widget, {})
+            if widget is not self.root:
+                widget.bindtags(widget.bindtags() + (self.tag,))
+        entry[1].update(roles)
+        for key in roles.values():
+            self.users.setdefault(key, set()).add(path)
+
+    def bind_hover(self, style, bg, hover_bg):
+        """Record the palette keys of a hover style (None keeps the colour)."""
+        self.hover_styles[style] = (bg, hover_bg)
+
+    def apply(self, palette):
+        """Switch to palette, re-applying only the options whose colour changed.
+
+        Returns the number of widgets queued for an update.
+        """
+        changed = {key for key, value in palette.items() if self.colors.get(key) != value}
+        self.colors.update(palette)
+        if not changed:
+            return 0
+
+        updates = {}
+        for key in changed:
+            for path in self.users.get(key, ()):
+                widget, roles = self.roles[path]
+                options = updates.setdefault(path, (widget, {}))[1]
+                for option, role in roles.items():
+                    if role == key:
+                        options[option] = palette[key]
+        for widget, options in updates.values():
+            if self.hover is not None and widget is not self.root:
+                self.hover.request(widget, **options)
+            else:
+                widget.config(**options)
+
+        if self.hover is not None:
+            for style, (bg, hover_bg) in self.hover_styles.items():
+                if bg in changed or hover_bg in changed:
+                    self.hover.define(style,
+                                      self.colors.get(bg, bg) if bg else None,
+                                      self.colors.get(hover_bg, hover_bg) if hover_bg else None)
+        for listener in self.listeners:
+            listener(self.colors)
+        return len(updates)
+
+    # Internals
+
+    def _on_destroy(self, event):
+        entry = self.roles.pop(str(event.widget), None)
+        if entry is not None:
+            for key in entry[1].values():
+                self.users.get(key, set()).discard(str(event.widget))
+
+
+def shared(widget, colors, hover=None):
+    """Return the ThemeRegistry of widget's Tk interpreter, creating it once."""
+    root = widget._root()
+    registry = _registries.get(root)
+    if registry is None:
+        registry = _registries[root] = ThemeRegistry(root, colors, hover)
+    return registry
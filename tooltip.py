@@ -0,0 +1,135 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# One tooltip toplevel per Tk interpreter, shared by every widget.
+# Widgets join a bind tag instead of getting their own bindings, so
+# registering a widget costs one dict entry and no Tcl commands.
+
+import weakref
+
+_managers = weakref.WeakKeyDictionary()  # Tk root -> TooltipManager
+
+
+class TooltipManager:
+    """Pooled tooltip engine built on plain tkinter."""
+
+    tag = 'Tooltip'
+
+    def __init__(self, root, delay=500, bg='#22313F', fg='#95A5A6',
+                 font=None, offset=(12, 18), wraplength=300):
+        self.root = root
+        self.delay = delay
+        self.offset = offset
+        self.style = {'bg': bg, 'fg': fg, 'font': font,
+                      'wraplength': wraplength}
+        self.texts = {}  # widget path -> tooltip text
+        self._window = None
+        self._label = None
+        self._pending = None
+        self._current = None
+
+        root.bind_class(self.tag, '<Enter>', self._on_enter)
+        root.bind_class(self.tag, '<Leave>', self._on_leave)
+        root.bind_class(self.tag, '<ButtonPress>', self._on_leave)
+        root.bind_class(self.tag, '<Destroy>', self._on_destroy)
+
+    def register(self, widget, text):
+        """Attach (or replace) the tooltip text of widget."""
+        path = str(widget)
+        if path not in self.texts:
+            widget.bindtags(widget.bindtags() + (self.tag,))
+        self.texts[path] = text
+        if self._current == path and self._window is not None:
+            self._label.config(text=text)
+
+    def unregister(self, widget):
+        path = str(widget)
+        if self.texts.pop(path, None) is not None:
+            widget.bindtags(tuple(t for t in widget.bindtags() if t != self.tag))
+        if self._current == path:
+            self.hide()
+
+    def configure(self, **style):
+        """Restyle the shared toplevel (bg, fg, font, wraplength)."""
+        self.style.update(style)
+        if self._label is not None:
+            self._label.config(**self.style)
+            self._window.config(bg=self.style['bg'])
+
+    def show_text(self, text, x_root, y_root):
+        """Show text next to the screen point (x_root, y_root) right away,
+        e.g. for values under the pointer. hide() removes it."""
+        self._cancel()
+        self._current = None
+        if self._window is None:
+            self._build()
+        self._label.config(text=text)
+        self._place(x_root, y_root)
+
+    def hide(self):
+        self._cancel()
+        self._current = None
+        if self._window is not None:
+            self._window.withdraw()
+
+    # Internals
+
+    def _build(self):
+        import tkinter as tk
+        self._window = tk.Toplevel(self.root)
+        self._window.withdraw()
+        self._window.overrideredirect(True)
+        self._window.config(bg=self.style['bg'])
+        self._label = tk.Label(self._window, bd=0, padx=6, pady=3,
+                               justify='left', **self.style)
+        self._label.pack()
+
+    def _cancel(self):
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+
+    def _on_enter(self, event):
+        self._cancel()
+        self._current = str(event.widget)
+        self._pending = self.root.after(self.delay, self._show)
+
+    def _on_leave(self, event):
+        self.hide()
+
+    def _on_destroy(self, event):
+        path = str(event.widget)
+        self.texts.pop(path, None)
+        if self._current == path:
+            self.hide()
+
+    def _show(self):
+        self._pending = None
+        text = self.texts.get(self._current)
+        if text is None:
+            return
+        if self._window is None:
+            self._build()
+        self._label.config(text=text)
+        self._place(*self.root.winfo_pointerxy())
+
+    def _place(self, x, y):
+        x, y = x + self.offset[0], y + self.offset[1]
+        self._window.update_idletasks()
+        x = min(x, self.root.winfo_screenwidth() - self._window.winfo_reqwidth())
+        y = min(y, self.root.winfo_screenheight() - self._window.winfo_reqheight())
+        self._window.geometry(f'+{x}+{y}')
+        self._window.deiconify()
+        self._window.lift()
+
+
+def shared(widget, **style):
+    """Return the TooltipManager of widget's Tk interpreter, creating it once.
+
+    style is applied only when the manager is created.
+    """
+    root = widget._root()
+    manager = _managers.get(root)
+    if manager is None:
+        manager = _managers[root] = TooltipManager(root, **style)
+    return manager
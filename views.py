@@ -0,0 +1,120 @@
+# Copyright (c) 2021 Arkadiusz Choruży
+# License: MIT
+
+# Panels of the working frame.
+#
+# A panel is built by its factory on first use only. Panels that were used
+# recently stay alive (just unpacked) so switching back is instant; when
+# the number of panels, their widget count or their memory estimate goes
+# over budget, the least recently used ones are destroyed and built again
+# on their next use.
+#
+# A panel is any object with a .frame; it may also define:
+#     activate()    - shown again, e.g. restart timers
+#     deactivate()  - hidden, e.g. pause timers and animations
+#     memory()      - bytes it holds beyond its widgets, for the budget
+#     destroy()     - release resources; the frame is destroyed after it
+
+from collections import OrderedDict
+
+
+def count_widgets(widget):
+    """widget and all its descendants."""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+class ViewManager:
+    """Lazily built panels with LRU eviction, shown one at a time in parent."""
+
+    def __init__(self, parent, max_views=4, max_widgets=None, max_bytes=None,
+                 pack=None):
+        self.parent = parent
+        self.max_views = max_views
+        self.max_widgets = max_widgets
+        self.max_bytes = max_bytes
+        self.pack = pack or {'side': 'top', 'fill': 'both', 'expand': True}
+        self.factories = {}        # name -> factory(parent) returning a panel
+        self.views = OrderedDict()  # name -> panel, least recently used first
+        self.widget_counts = {}    # name -> widgets of the panel when built
+        self.current = None
+        self.stats = {'built': 0, 'evicted': 0, 'reused': 0}
+
+    def register(self, name, factory):
+        self.factories[name] = factory
+
+    def get(self, name):
+        """The live panel called name, or None if it is not built."""
+        return self.views.get(name)
+
+    def show(self, name):
+        """Show panel name in place of the current one, building it if needed."""
+        view = self.views.get(name)
+        if name == self.current and view is not None:
+            return view
+        if self.current is not None:
+            current = self.views.get(self.current)
+            if current is not None:
+                self._hook(current, 'deactivate')
+                current.frame.pack_forget()
+
+        if view is None:
+            view = self.factories[name](self.parent)
+            self.views[name] = view
+            self.widget_counts[name] = count_widgets(view.frame)
+            self.stats['built'] += 1
+        else:
+            self.stats['reused'] += 1
+        self.views.move_to_end(name)
+        self.current = name
+        view.frame.pack(**self.pack)
+        self._hook(view, 'activate')
+        self._evict()
+        return view
+
+    def evict(self, name):
+        """Destroy panel name now; it is rebuilt when shown again."""
+        view = self.views.pop(name, None)
+        if view is None:
+            return
+        self.widget_counts.pop(name, None)
+        if name == self.current:
+            self._hook(view, 'deactivate')
+            self.current = None
+        self._hook(view, 'destroy')
+        view.frame.destroy()
+        self.stats['evicted'] += 1
+
+    def usage(self):
+        """(panels, widgets, bytes) held by the live panels."""
+        memory = sum(view.memory() for view in self.views.values()
+                     if hasattr(view, 'memory'))
+        return len(self.views), sum(self.widget_counts.values()), memory
+
+    # Internals
+
+    @staticmethod
+    def _hook(view, name):
+        hook = getattr(view, name, None)
+        if hook is not None:
+            hook()
+
+    def _over_budget(self):
+        views, widgets, memory = self.usage()
+        return ((self.max_views is not None and views > self.max_views)
+                or (self.max_widgets is not None and widgets > self.max_widgets)
+                or (self.max_bytes is not None and memory > self.max_bytes))
+
+    def _evict(self):
+        # The shown panel is the most recent one and is never evicted
+        while len(self.views) > 1 and self._over_budget():
+            self.evict(next(iter(self.views)))
+
+
+class Placeholder:
+    """Panel with a title only, for sections that have no content yet."""
+
+    def __init__(self, parent, title, bg=None, fg=None, font=None):
+        import tkinter as tk
+        self.frame = tk.Frame(parent, bg=bg)
+        self.label = tk.Label(self.frame, text=title, bg=bg, fg=fg, font=font)
+        self.label.pack(side='top', anchor='w', padx=12, pady=12)